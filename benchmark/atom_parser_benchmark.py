@@ -0,0 +1,141 @@
+"""arXiv Atom 解析器性能对比：feedparser 与流式解析器
+
+用法:
+    # 先录制若干页真实的 arXiv 响应
+    python benchmark/atom_parser_benchmark.py --record 5 --query cat:cs.*
+    # 对录制的响应做对比
+    python benchmark/atom_parser_benchmark.py
+    python benchmark/atom_parser_benchmark.py path/to/feed1.xml path/to/feed2.xml
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+import feedparser
+import requests
+from utils.atomParser import AtomStreamParser, iter_atom_entries
+
+FEED_DIR = os.path.join(os.path.dirname(__file__), "feeds")
+ARXIV_API_URL = "http://export.arxiv.org/api/query?"
+
+
+def record_feeds(query, pages, batch_size=100):
+    """录制 arXiv API 响应到 FEED_DIR"""
+    os.makedirs(FEED_DIR, exist_ok=True)
+    for page in range(pages):
+        url = f"{ARXIV_API_URL}search_query={query}&start={page * batch_size}&max_results={batch_size}&sortBy=submittedDate&sortOrder=descending"
+        response = requests.get(url, timeout=60)
+        response.raise_for_status()
+        path = os.path.join(FEED_DIR, f"page_{page:03d}.xml")
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"已录制 {path} ({len(response.content)} 字节)")
+        time.sleep(3)
+
+
+def _feedparser_records(content):
+    """用 feedparser 解析并提取与流式解析器相同的字段"""
+    records = []
+    for entry in feedparser.parse(content).entries:
+        pdf_link = ""
+        web_link = ""
+        for link in entry.links:
+            if link.get("title", "") == "pdf":
+                pdf_link = link.href
+            elif link.get("rel", "") == "alternate" and link.get("type", "") == "text/html":
+                web_link = link.href
+        records.append((
+            entry.id,
+            " ".join(entry.title.split()),
+            [author.name for author in entry.authors],
+            [tag.get("term") for tag in entry.get("tags", [])],
+            pdf_link,
+            web_link,
+            entry.summary.strip(),
+        ))
+    return records
+
+
+def _stream_records(content, chunk_size):
+    """用流式解析器按 chunk_size 分块解析"""
+    chunks = (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    return [
+        (entry.id, entry.title, entry.authors, entry.tags, entry.pdf_link, entry.web_link, entry.summary)
+        for entry in iter_atom_entries(chunks)
+    ]
+
+
+def _time_to_first_entry(content, chunk_size):
+    """流式解析时得到第一个条目所需读取的字节数和时间"""
+    parser = AtomStreamParser()
+    started = time.perf_counter()
+    for offset in range(0, len(content), chunk_size):
+        if parser.feed(content[offset:offset + chunk_size]):
+            return offset + chunk_size, time.perf_counter() - started
+    return len(content), time.perf_counter() - started
+
+
+def _measure(func, *args, repeat=5):
+    """返回最短耗时（秒）和峰值内存（字节）"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def run_benchmark(paths, chunk_size, repeat):
+    total_feedparser = 0
+    total_stream = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+
+        expected, fp_time, fp_peak = _measure(_feedparser_records, content, repeat=repeat)
+        actual, st_time, st_peak = _measure(_stream_records, content, chunk_size, repeat=repeat)
+        first_bytes, first_time = _time_to_first_entry(content, chunk_size)
+        total_feedparser += fp_time
+        total_stream += st_time
+
+        status = "一致" if expected == actual else "不一致"
+        print(f"{os.path.basename(path)}: {len(actual)} 条, {len(content) / 1024:.0f} KB, 结果{status}")
+        print(f"  feedparser: {fp_time * 1000:.1f} ms, 峰值内存 {fp_peak / 1024:.0f} KB")
+        print(f"  流式解析:   {st_time * 1000:.1f} ms, 峰值内存 {st_peak / 1024:.0f} KB, "
+              f"读取 {first_bytes / 1024:.0f} KB ({first_time * 1000:.2f} ms) 后得到第一条")
+        if expected != actual:
+            for fp_record, st_record in zip(expected, actual):
+                if fp_record != st_record:
+                    print(f"  首个差异: {fp_record[0]}\n    feedparser: {fp_record}\n    流式解析:   {st_record}")
+                    break
+
+    if paths and total_stream:
+        print(f"合计: feedparser {total_feedparser * 1000:.1f} ms, 流式解析 {total_stream * 1000:.1f} ms, "
+              f"加速 {total_feedparser / total_stream:.1f} 倍")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="arXiv Atom 解析器性能对比")
+    parser.add_argument("files", nargs="*", help="录制的 arXiv 响应文件，默认使用 benchmark/feeds/*.xml")
+    parser.add_argument("--record", type=int, default=0, help="先从 arXiv 录制指定页数的响应")
+    parser.add_argument("--query", default="cat:cs.*", help="录制时使用的查询")
+    parser.add_argument("--chunk-size", type=int, default=16 * 1024, help="模拟网络读取的分块大小（字节）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个文件重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    if args.record:
+        record_feeds(args.query, args.record)
+
+    paths = args.files or sorted(glob.glob(os.path.join(FEED_DIR, "*.xml")))
+    if not paths:
+        print(f"没有找到录制的响应，请先运行 --record 或把响应文件放到 {FEED_DIR}")
+        sys.exit(1)
+    run_benchmark(paths, args.chunk_size, args.repeat)
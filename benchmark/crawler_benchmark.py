@@ -0,0 +1,397 @@
+"""crawler_arxiv_paper 离线端到端基准测试
+
+不访问网络：本地模拟 export.arxiv.org（返回录制或生成的 Atom 页面，PDF 来自固定目录），
+本地模拟 OpenAI 兼容接口（可配置延迟），使用临时 sqlite 数据库和临时缓存目录，
+运行 ArxivMonitor.search_papers 后报告论文吞吐、各阶段耗时分布和峰值内存。
+
+用法:
+    # 生成 300 篇论文的 Atom 页面和 20 个测试 PDF 到 benchmark/fixtures/
+    python benchmark/crawler_benchmark.py --make-fixtures 300
+    # 串行模式 / 流水线模式，模拟 LLM 每次调用 800 毫秒
+    python benchmark/crawler_benchmark.py --llm-latency 800
+    python benchmark/crawler_benchmark.py --pipeline --llm-latency 800 --output result.json
+    # 使用录制的 arXiv 响应（atom_parser_benchmark.py --record）和已缓存的真实 PDF
+    python benchmark/crawler_benchmark.py --feeds benchmark/feeds --pdfs cache/pdf
+    # 通过模拟的 OAI-PMH 接口采集（resumptionToken 分页，第二页先返回一次 503 + Retry-After）
+    python benchmark/crawler_benchmark.py --oai --pipeline
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import re
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+FEED_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title type="html">ArXiv Query</title>
+  <id>http://arxiv.org/api/benchmark</id>
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{count}</opensearch:itemsPerPage>
+"""
+FEED_FOOTER = "</feed>\n"
+
+OAI_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+  <responseDate>2024-01-02T00:00:00Z</responseDate>
+  <request verb="ListRecords">http://export.arxiv.org/oai2</request>
+"""
+OAI_FOOTER = "</OAI-PMH>\n"
+# 模拟 OAI-PMH 每页的记录数（arXiv 实际为 1000 条左右）
+OAI_PAGE_SIZE = 50
+OAI_DATESTAMP = "2024-01-01"
+ENTRY_PATTERN = re.compile(rb"<entry>.*?</entry>", re.DOTALL)
+PDF_LINK_PATTERN = re.compile(rb"https?://arxiv\.org/pdf/")
+
+FIXTURE_AUTHORS = [
+    ("Wei Zhang", "Department of Computer Science, Tsinghua University, Beijing, China", "zhangwei@tsinghua.edu.cn"),
+    ("Li Na", "School of Computer Science, Peking University, Beijing, China", "lina@pku.edu.cn"),
+    ("John Smith", "Department of Computer Science, Stanford University, USA", "jsmith@stanford.edu"),
+    ("Maria Garcia", "Max Planck Institute for Informatics, Germany", "garcia@mpi-inf.mpg.de"),
+]
+
+
+def _write_pdf(path, pages_text):
+    """写一个只含文本的最小 PDF"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages_text)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages_text)} >>")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, text in enumerate(pages_text):
+        lines = [re.sub(r"[()\\]", "", line) for line in text.split("\n")]
+        stream = "BT /F1 10 Tf 50 750 Td 12 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(content))
+        content += f"{i + 1} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    content += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def make_fixtures(paper_count, pdf_count=20, pages_per_pdf=12, chinese_ratio=0.5):
+    """生成 Atom 页面和测试 PDF，一半左右的 PDF 含中国机构"""
+    feed_dir = os.path.join(FIXTURE_DIR, "feeds")
+    pdf_dir = os.path.join(FIXTURE_DIR, "pdf")
+    for directory in (feed_dir, pdf_dir):
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+    for i in range(pdf_count):
+        chinese = i < pdf_count * chinese_ratio
+        authors = FIXTURE_AUTHORS[:2] if chinese else FIXTURE_AUTHORS[2:]
+        first_page = [f"Benchmark Paper {i}: Efficient Crawling of Scholarly Metadata"]
+        for name, affiliation, email in authors:
+            first_page += [name, affiliation, email]
+        first_page += ["Abstract", "We study the throughput of a scholarly crawler. " * 3]
+        body = [f"Section {p}\n" + "\n".join(f"Body text line {n} of page {p}. " * 2 for n in range(30))
+                for p in range(1, pages_per_pdf - 1)]
+        acknowledgement = ("Acknowledgements\nThis work was supported by the National Natural Science Foundation "
+                           "of China NSFC under Grant 62000000." if chinese else "Acknowledgements\nWe thank the reviewers.")
+        _write_pdf(os.path.join(pdf_dir, f"fixture_{i:03d}.pdf"), ["\n".join(first_page)] + body + [acknowledgement])
+
+    page_size = 100
+    for page_start in range(0, paper_count, page_size):
+        entries = []
+        for n in range(page_start, min(paper_count, page_start + page_size)):
+            arxiv_id = f"2401.{n:05d}v1"
+            names = FIXTURE_AUTHORS[n % 2 * 2: n % 2 * 2 + 2]
+            authors = "".join(f"    <author><name>{name}</name></author>\n" for name, _, _ in names)
+            entries.append(f"""  <entry>
+    <id>http://arxiv.org/abs/{arxiv_id}</id>
+    <updated>2024-01-01T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>Benchmark Paper {n}: Efficient Crawling of Scholarly Metadata</title>
+    <summary>We study the throughput of a scholarly crawler on paper {n}.</summary>
+{authors}    <link href="http://arxiv.org/abs/{arxiv_id}" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/{arxiv_id}" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.IR" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.IR" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+""")
+        content = FEED_HEADER.format(total=paper_count, start=page_start, count=len(entries)) + "".join(entries) + FEED_FOOTER
+        with open(os.path.join(feed_dir, f"page_{page_start // page_size:03d}.xml"), "w", encoding="utf-8") as f:
+            f.write(content)
+    print(f"已生成 {paper_count} 篇论文的 Atom 页面到 {feed_dir}，{pdf_count} 个 PDF 到 {pdf_dir}")
+
+
+def _fake_analysis(prompt):
+    """根据提示词中的作者列表生成模拟的分析结果"""
+    found = re.search(r"作者列表:\s*(.*)", prompt)
+    names = [name.strip() for name in found.group(1).split(",")] if found else []
+    return json.dumps({
+        "中文标题": "基准测试论文",
+        "作者信息": [
+            {"姓名": name, "位置": "第一作者" if i == 0 else "其他作者", "单位": "清华大学",
+             "邮箱": f"author{i}@tsinghua.edu.cn", "国家": "中国"}
+            for i, name in enumerate(names)
+        ],
+        "研究方向": "信息检索",
+        "主要内容": "基准测试",
+        "nsfc": True,
+    }, ensure_ascii=False)
+
+
+def _oai_record(entry):
+    """把 Atom 条目转换为 arXivRaw 格式的 OAI-PMH 记录"""
+    arxiv_id, version = re.match(r".*/abs/(.+?)(v\d+)?$", entry.id).groups()
+    authors = " and ".join(entry.authors)
+    categories = " ".join(entry.tags)
+    return f"""  <record>
+    <header><identifier>oai:arXiv.org:{arxiv_id}</identifier><datestamp>{OAI_DATESTAMP}</datestamp><setSpec>cs</setSpec></header>
+    <metadata>
+      <arXivRaw xmlns="http://arxiv.org/OAI/arXivRaw/">
+        <id>{escape(arxiv_id)}</id>
+        <version version="{version or 'v1'}"><date>Mon, 1 Jan 2024 00:00:00 GMT</date></version>
+        <title>{escape(entry.title)}</title>
+        <authors>{escape(authors)}</authors>
+        <categories>{escape(categories)}</categories>
+        <abstract>{escape(entry.summary)}</abstract>
+      </arXivRaw>
+    </metadata>
+  </record>
+"""
+
+
+def _oai_page(records, params, busy_tokens):
+    """ListRecords 的一页：(状态码, 响应头, 内容)
+
+    第一次请求按 from/until 过滤，之后用 resumptionToken（即下一页的位置）翻页；
+    busy_tokens 中的 token 第一次请求时返回 503 和 Retry-After，模拟 arXiv 的流量控制。
+    """
+    token = params.get("resumptionToken", [""])[0]
+    if token in busy_tokens:
+        busy_tokens.discard(token)
+        return 503, {"Retry-After": "1"}, b"Retry after 1 second"
+    if token:
+        start = int(token)
+    else:
+        start = 0
+        from_date = params.get("from", [""])[0]
+        until_date = params.get("until", [""])[0]
+        if params.get("set", [""])[0] != "cs" or (from_date and from_date > OAI_DATESTAMP) \
+                or (until_date and until_date < OAI_DATESTAMP):
+            records = []
+    if not records:
+        body = OAI_HEADER + '  <error code="noRecordsMatch">No records match</error>\n' + OAI_FOOTER
+        return 200, {}, body.encode("utf-8")
+    page = records[start:start + OAI_PAGE_SIZE]
+    next_start = start + len(page)
+    resumption = (f'    <resumptionToken cursor="{start}" completeListSize="{len(records)}">'
+                  f'{next_start if next_start < len(records) else ""}</resumptionToken>\n')
+    body = OAI_HEADER + "  <ListRecords>\n" + "".join(page) + resumption + "  </ListRecords>\n" + OAI_FOOTER
+    return 200, {}, body.encode("utf-8")
+
+
+def serve(feed_dir, pdf_dir, llm_latency, arxiv_latency, port_queue):
+    """在子进程中运行模拟的 arXiv API、OAI-PMH、PDF 下载和 OpenAI 接口"""
+    entries = []
+    for path in sorted(glob.glob(os.path.join(feed_dir, "*.xml"))):
+        with open(path, "rb") as f:
+            entries.extend(ENTRY_PATTERN.findall(f.read()))
+    pdfs = sorted(glob.glob(os.path.join(pdf_dir, "**", "*.pdf"), recursive=True))
+    from utils.atomParser import AtomStreamParser
+    parser = AtomStreamParser()
+    parsed = parser.feed(FEED_HEADER.format(total=len(entries), start=0, count=len(entries)).encode() + b"".join(entries)
+                         + FEED_FOOTER.encode()) + parser.close()
+    oai_records = [_oai_record(entry) for entry in parsed]
+    # 第二页第一次请求时返回 503
+    oai_busy_tokens = {str(OAI_PAGE_SIZE)}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body, content_type, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.endswith("/api/query"):
+                time.sleep(arxiv_latency / 1000)
+                params = parse_qs(url.query)
+                start = int(params.get("start", ["0"])[0])
+                max_results = int(params.get("max_results", ["10"])[0])
+                page = entries[start:start + max_results]
+                base = f"http://127.0.0.1:{self.server.server_port}/pdf/".encode()
+                body = FEED_HEADER.format(total=len(entries), start=start, count=len(page)).encode()
+                body += b"".join(PDF_LINK_PATTERN.sub(base, entry) + b"\n" for entry in page)
+                body += FEED_FOOTER.encode()
+                self._send(200, body, "application/atom+xml")
+            elif url.path.endswith("/oai2"):
+                time.sleep(arxiv_latency / 1000)
+                status, headers, body = _oai_page(oai_records, parse_qs(url.query), oai_busy_tokens)
+                self._send(status, body, "text/xml" if status == 200 else "text/plain", headers)
+            elif url.path.startswith("/pdf/") and pdfs:
+                with open(pdfs[zlib.crc32(url.path.encode()) % len(pdfs)], "rb") as f:
+                    self._send(200, f.read(), "application/pdf")
+            else:
+                self._send(404, b"not found", "text/plain")
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.endswith("/chat/completions"):
+                self._send(404, b"not found", "text/plain")
+                return
+            time.sleep(llm_latency / 1000)
+            prompt = request["messages"][-1]["content"]
+            body = json.dumps({
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "benchmark"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": _fake_analysis(prompt)},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 100, "total_tokens": len(prompt) // 4 + 100},
+            }, ensure_ascii=False).encode("utf-8")
+            self._send(200, body, "application/json")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port_queue.put((server.server_port, len(entries), len(pdfs)))
+    server.serve_forever()
+
+
+def _peak_rss_mb(who):
+    """峰值常驻内存（MB），Linux 上 ru_maxrss 单位为 KB"""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(args):
+    work_dir = tempfile.mkdtemp(prefix="arxiv_benchmark_")
+    context = multiprocessing.get_context("spawn")
+    port_queue = context.Queue()
+    server = context.Process(target=serve, args=(args.feeds, args.pdfs, args.llm_latency, args.arxiv_latency, port_queue),
+                             daemon=True)
+    server.start()
+    port, entry_count, pdf_count = port_queue.get(timeout=30)
+    if not entry_count or not pdf_count:
+        server.terminate()
+        print(f"模拟服务器没有数据: {entry_count} 个条目, {pdf_count} 个 PDF，请先运行 --make-fixtures 或指定 --feeds/--pdfs")
+        sys.exit(1)
+
+    # 导入爬虫之前设置环境变量，缓存目录和数据库都指向临时目录
+    os.environ.update({
+        "ARXIV_API_URL": f"http://127.0.0.1:{port}/api/query?",
+        "ARXIV_OAI_URL": f"http://127.0.0.1:{port}/oai2",
+        "ARXIV_PDF_URL": f"http://127.0.0.1:{port}/pdf/",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{port}/v1",
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_API_MODEL": "benchmark",
+        "DB_URL": f"sqlite:///{os.path.join(work_dir, 'benchmark.db')}",
+        "CACHE_DIR": os.path.join(work_dir, "cache"),
+        "ARXIV_RESUME": "0",
+    })
+    if not args.keep_rate_limits:
+        for name in ("ARXIV", "ARXIV_OAI", "PDF", "LLM"):
+            os.environ[f"RATE_LIMIT_{name}"] = "1000"
+            os.environ[f"RATE_LIMIT_{name}_MAX"] = "1000"
+
+    from model.database import Base
+    from crawler_arxiv_paper import ArxivMonitor
+    from db_manager import DBManager
+
+    Base.metadata.create_all(DBManager().engine)
+    monitor = ArxivMonitor(use_pipeline=args.pipeline)
+
+    print(f"模拟服务器端口 {port}，{entry_count} 篇论文，{pdf_count} 个 PDF，{'OAI-PMH 采集，' if args.oai else ''}"
+          f"{'流水线' if args.pipeline else '串行'}模式，LLM 延迟 {args.llm_latency} 毫秒")
+    started = time.perf_counter()
+    if args.oai:
+        results = monitor.harvest_papers(from_date=OAI_DATESTAMP, until_date=OAI_DATESTAMP, max_results=args.max_results)
+    else:
+        results = monitor.search_papers(query="cat:cs.*", max_results=args.max_results, resume=False)
+    elapsed = time.perf_counter() - started
+    throttled = monitor.oai_harvester.limiter.stats().get("throttled", 0)
+
+    summary = monitor.metrics.summary()
+    monitor.close()
+    report = {
+        "mode": "pipeline" if args.pipeline else "serial",
+        "source": "oai" if args.oai else "api",
+        "llm_latency_ms": args.llm_latency,
+        "arxiv_latency_ms": args.arxiv_latency,
+        "papers": entry_count,
+        "saved": len(results),
+        "elapsed": round(elapsed, 3),
+        "papers_per_sec": round(summary["counters"].get("queued", 0) / elapsed, 3) if elapsed else 0,
+        "saved_per_sec": round(len(results) / elapsed, 3) if elapsed else 0,
+        "peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_SELF), 1),
+        "peak_rss_children_mb": round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        "counters": summary["counters"],
+        "stages": summary["stages"],
+    }
+    server.terminate()
+    if args.keep:
+        print(f"临时目录已保留: {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"处理 {report['counters'].get('queued', 0)} 篇，保存 {report['saved']} 篇，耗时 {report['elapsed']:.2f} 秒，"
+          f"{report['papers_per_sec']:.2f} 篇/秒（保存 {report['saved_per_sec']:.2f} 篇/秒）")
+    print(f"峰值内存: 主进程 {report['peak_rss_mb']} MB，提取子进程 {report['peak_rss_children_mb']} MB")
+    print(f"计数: {report['counters']}")
+    if args.oai:
+        complete = report["counters"].get("queued", 0) + report["counters"].get("known", 0) == min(entry_count, args.max_results)
+        print(f"OAI-PMH: 采集 {report['counters'].get('queued', 0)}/{entry_count} 篇（每页 {OAI_PAGE_SIZE} 条），"
+              f"503 重试 {throttled} 次，{'完整' if complete else '不完整'}")
+    print(f"{'阶段':<16}{'次数':>6}{'合计(s)':>10}{'p50(s)':>9}{'p95(s)':>9}{'p99(s)':>9}{'最大(s)':>9}")
+    for stage, stats in sorted(report["stages"].items(), key=lambda item: -item[1]["total"]):
+        print(f"{stage:<16}{stats['count']:>6}{stats['total']:>10.2f}{stats['p50']:>9.3f}"
+              f"{stats['p95']:>9.3f}{stats['p99']:>9.3f}{stats['max']:>9.3f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="crawler_arxiv_paper 离线端到端基准测试")
+    parser.add_argument("--make-fixtures", type=int, default=0, metavar="N", help="生成 N 篇论文的测试数据后退出")
+    parser.add_argument("--feeds", default=os.path.join(FIXTURE_DIR, "feeds"), help="Atom 页面目录")
+    parser.add_argument("--pdfs", default=os.path.join(FIXTURE_DIR, "pdf"), help="测试 PDF 目录")
+    parser.add_argument("--pipeline", action="store_true", help="使用流水线模式")
+    parser.add_argument("--oai", action="store_true", help="通过模拟的 OAI-PMH 接口采集，而不是分页查询 API")
+    parser.add_argument("--llm-latency", type=int, default=500, help="模拟 LLM 每次调用的延迟（毫秒）")
+    parser.add_argument("--arxiv-latency", type=int, default=200, help="模拟 arXiv 每页查询的延迟（毫秒）")
+    parser.add_argument("--max-results", type=int, default=10000, help="最多处理的论文数")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="保留真实的限速配置（默认放开限速）")
+    parser.add_argument("--keep", action="store_true", help="保留临时数据库和缓存目录")
+    parser.add_argument("--output", help="把结果保存为 JSON")
+    args = parser.parse_args()
+
+    if args.make_fixtures:
+        make_fixtures(args.make_fixtures)
+    else:
+        run_benchmark(args)
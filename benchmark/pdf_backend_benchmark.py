@@ -0,0 +1,103 @@
+"""PDF 文本提取后端对比：速度和作者信息块的提取质量
+
+对目录中的每个 PDF，用每个已安装的后端提取全部页面，报告每秒页数，以及第一页作者信息块中
+能找到邮箱、单位行和中国机构的 PDF 比例、全文能找到 NSFC 的比例，用于选择仍能找到作者单位的最快后端。
+结果写入 PDF_EXTRACT_BACKEND 即可切换。
+
+用法:
+    # 使用 crawler_benchmark.py --make-fixtures 生成的测试 PDF
+    python benchmark/pdf_backend_benchmark.py
+    # 使用已缓存的真实 PDF，最多 200 个
+    python benchmark/pdf_backend_benchmark.py --pdfs cache/pdf --max-files 200 --output backends.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.pdfBackends import BACKENDS, available_backends, extract_pages
+from utils.promptBuilder import find_author_block
+from utils.authorExtractor import extract_emails, INSTITUTION_PATTERN, NSFC_PATTERN
+from utils.affiliationFilter import ChineseAffiliationFilter
+
+FIXTURE_PDF_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "pdf")
+
+
+def _author_block_quality(first_page, chinese_filter):
+    """作者信息块的质量：(是否有邮箱, 是否有单位行, 是否匹配中国机构)"""
+    block = find_author_block(first_page)
+    has_email = bool(extract_emails(block))
+    has_institution = any(INSTITUTION_PATTERN.search(line) for line in block.splitlines())
+    has_chinese = chinese_filter.match(block)[0]
+    return has_email, has_institution, has_chinese
+
+
+def run_backend(name, paths, chinese_filter):
+    """用一个后端提取所有 PDF 的全部页面，返回统计结果"""
+    report = {"backend": name, "files": len(paths), "pages": 0, "seconds": 0.0, "errors": 0,
+              "with_email": 0, "with_institution": 0, "with_chinese": 0, "with_nsfc": 0, "chars": 0}
+    for path in paths:
+        started = time.perf_counter()
+        try:
+            result = extract_pages(path, lambda page_count: range(page_count), backends=(name,))
+        except Exception:
+            report["errors"] += 1
+            continue
+        finally:
+            report["seconds"] += time.perf_counter() - started
+        pages = dict(result["pages"])
+        report["pages"] += len(pages)
+        report["chars"] += sum(len(text) for text in pages.values())
+        has_email, has_institution, has_chinese = _author_block_quality(pages.get(0, ""), chinese_filter)
+        report["with_email"] += has_email
+        report["with_institution"] += has_institution
+        report["with_chinese"] += has_chinese
+        report["with_nsfc"] += bool(NSFC_PATTERN.search("\n".join(pages.values())))
+    report["seconds"] = round(report["seconds"], 3)
+    report["pages_per_sec"] = round(report["pages"] / report["seconds"], 1) if report["seconds"] else 0
+    return report
+
+
+def run_benchmark(args):
+    paths = sorted(glob.glob(os.path.join(args.pdfs, "**", "*.pdf"), recursive=True))[:args.max_files or None]
+    if not paths:
+        print(f"{args.pdfs} 中没有 PDF，请先运行 python benchmark/crawler_benchmark.py --make-fixtures 300 或指定 --pdfs")
+        sys.exit(1)
+    installed = available_backends()
+    names = [name.strip() for name in args.backends.split(",")] if args.backends else installed
+    missing = [name for name in BACKENDS if name not in installed]
+    names = [name for name in names if name in installed]
+    print(f"{len(paths)} 个 PDF，对比后端: {', '.join(names)}" + (f"（未安装: {', '.join(missing)}）" if missing else ""))
+
+    chinese_filter = ChineseAffiliationFilter()
+    reports = [run_backend(name, paths, chinese_filter) for name in names]
+
+    print(f"{'后端':<12}{'页数':>7}{'耗时(s)':>10}{'页/秒':>9}{'出错':>6}{'有邮箱':>8}{'有单位':>8}{'中国机构':>8}{'NSFC':>6}{'字符数':>10}")
+    for report in reports:
+        print(f"{report['backend']:<12}{report['pages']:>7}{report['seconds']:>10.2f}{report['pages_per_sec']:>9.1f}"
+              f"{report['errors']:>6}{report['with_email']:>8}{report['with_institution']:>8}{report['with_chinese']:>8}"
+              f"{report['with_nsfc']:>6}{report['chars']:>10}")
+
+    # 出错不多于 PyPDF2、找到作者单位不少于 PyPDF2 的后端中最快的一个
+    baseline = next((report for report in reports if report["backend"] == "pypdf2"), None)
+    candidates = [report for report in reports if baseline is None
+                  or (report["errors"] <= baseline["errors"] and report["with_institution"] >= baseline["with_institution"])]
+    if candidates:
+        best = max(candidates, key=lambda report: report["pages_per_sec"])
+        print(f"推荐: PDF_EXTRACT_BACKEND={best['backend']}" + ("" if best["backend"] == "pypdf2" else ",pypdf2"))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.output}")
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF 文本提取后端对比")
+    parser.add_argument("--pdfs", default=FIXTURE_PDF_DIR, help="PDF 目录")
+    parser.add_argument("--max-files", type=int, default=0, help="最多使用的 PDF 数，0 表示全部")
+    parser.add_argument("--backends", help="要对比的后端（逗号分隔），默认全部已安装的后端")
+    parser.add_argument("--output", help="把结果保存为 JSON")
+    run_benchmark(parser.parse_args())
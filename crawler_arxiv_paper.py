@@ -1,5 +1,10 @@
-import requests
-import feedparser
+import argparse
+import itertools
+import functools
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import signal
+import threading
 import time
 from datetime import datetime, timedelta
 import json
@@ -10,13 +15,57 @@ import schedule
 from db_manager import DBManager
 from model.paper import Paper
 from utils.logger_settings import api_logger
-from utils.pdfUtils import _get_xvid_from_pdf_url, _download_pdf, _extract_text_from_pdf
+from utils.pdfUtils import CACHE_DIR, _get_xvid_from_pdf_url, _download_pdf_path, get_pdf_cache, get_pdf_downloader, close_pdf_cache, \
+    _head_then_reverse_tail_indexes
+from utils.pdfExtractPool import get_pdf_extract_pool
+from utils.pageTextStore import get_page_text_store, close_page_text_store
+from utils.promptBuilder import build_paper_context, estimate_tokens, find_acknowledgement, author_block_hash, \
+    is_acknowledgement_page
+from utils.arxivId import split_arxiv_id
+from utils.pipeline import Stage, StagedPipeline
+from utils.oaiHarvester import OAIHarvester
+from utils.llmCache import LLMCache
+from utils.affiliationFilter import ChineseAffiliationFilter
+from utils.crawlCursor import CrawlCursor, STATUS_DONE, STATUS_FAILED, STATUS_SKIPPED, STATUS_EXPORTED
+from utils.backfillPlanner import plan_date_shards, split_shard, submitted_datetime_range
+from utils.rateLimiter import get_rate_limiter
+from utils.httpSession import get_http_session, close_http_sessions
+from utils.atomParser import AtomStreamParser, iter_atom_entries
+from utils.runMetrics import RunMetrics
+from utils.categoryFanout import CategoryFanout, CategoryLag, parse_categories
+from utils.arxivSnapshot import iter_snapshot_stubs
+from utils.authorExtractor import AuthorExtractor, merge_extracted_authors, research_direction
 
 PUBDATEKEY = "发布日期"
+# 提示词模板版本，修改提示词后需要递增，使旧的缓存结果失效
+PROMPT_VERSION = "2"
+
+# 流式读取 arXiv 响应时每次读取的字节数
+FEED_CHUNK_BYTES = 16 * 1024
+
+# 批处理模式默认的请求文件
+BATCH_REQUESTS_FILE = os.path.join(CACHE_DIR, "batch", "requests.jsonl")
+
+# 处理快照导入的待处理论文时记录上次处理到的论文ID，下次从这里继续，到末尾后从头开始
+PENDING_POSITION_FILE = os.path.join(CACHE_DIR, "queue", "pending_position")
+
+
+def _batch_meta_path(batch_file):
+    """批处理请求文件对应的论文信息文件路径"""
+    root, ext = os.path.splitext(batch_file)
+    return f"{root}.meta{ext or '.jsonl'}"
+
+
+def _submitted_date_range(start_date, end_date):
+    """构建 arXiv submittedDate 日期范围查询"""
+    return f"submittedDate:[{start_date.strftime('%Y%m%d')}000000+TO+{end_date.strftime('%Y%m%d')}235959]"
+
 
 class ArxivMonitor:
-    def __init__(self):
-        self.base_url = "http://export.arxiv.org/api/query?"
+    def __init__(self, use_pipeline=None):
+        # ARXIV_API_URL 可指向本地模拟服务器
+        self.base_url = os.getenv('ARXIV_API_URL', "http://export.arxiv.org/api/query?")
+        self.oai_harvester = OAIHarvester()
 
         # # 初始化数据库
         # self.engine = get_engine()
@@ -25,232 +74,1087 @@ class ArxivMonitor:
         
         # 初始化数据库管理器
         self.db_manager = DBManager()
+        self.db_manager.warm_known_papers()
         
         # 设置 OpenAI API 密钥
         # base_url=os.getenv('OPENAI_BASE_URL')
         self.openAiClient = OpenAI(base_url=os.getenv('OPENAI_BASE_URL'), api_key=os.getenv('OPENAI_API_KEY'))
-        
+        # LLM 分析结果缓存
+        self.llm_cache = LLMCache()
+
+        # 提示词中论文内容的 token 预算，包含作者信息块的前几页，以及为查找致谢段落最多提取的末尾页数
+        self.prompt_token_budget = int(os.getenv('ARXIV_PROMPT_TOKEN_BUDGET', 1500))
+        self.head_pages = int(os.getenv('ARXIV_HEAD_PAGES', 2))
+        self.tail_pages = int(os.getenv('ARXIV_TAIL_PAGES', 3))
+        # 先提取前几页，再从最后一页往前逐页提取，找到致谢段落后不再解析剩余的页
+        self.page_order = functools.partial(_head_then_reverse_tail_indexes, head_pages=self.head_pages,
+                                            tail_pages=self.tail_pages)
+        self.page_stop = functools.partial(is_acknowledgement_page, first_index=self.head_pages)
+        # PDF 文本提取在进程池中执行，与 search_nsfc 共用同一实现
+        self.pdf_pool = get_pdf_extract_pool()
+
+        # 中国机构预过滤器，ARXIV_PREFILTER=0 时关闭
+        universities = self.db_manager.get_universities()
+        self.affiliation_filter = None
+        if os.getenv('ARXIV_PREFILTER', '1') == '1':
+            self.affiliation_filter = ChineseAffiliationFilter(universities)
+
+        # 作者邮箱和单位先用规则提取，ARXIV_LOCAL_EXTRACT：residual（默认，提取可信时 LLM 只生成中文标题、
+        # 研究方向和主要内容）、skip（提取可信时不调用 LLM）、off（全部交给 LLM）
+        self.local_extract = os.getenv('ARXIV_LOCAL_EXTRACT', 'residual')
+        self.author_extractor = AuthorExtractor(universities, self.db_manager.get_university_linker(),
+                                                self.affiliation_filter or ChineseAffiliationFilter(universities))
+
+        # 流水线模式配置：下载、提取、分析、保存各阶段的线程数和队列长度
+        self.use_pipeline = os.getenv('ARXIV_PIPELINE', '0') == '1' if use_pipeline is None else use_pipeline
+        self.download_workers = int(os.getenv('ARXIV_DOWNLOAD_WORKERS', 4))
+        # 提取阶段的线程只负责把 PDF 交给进程池并等待结果，默认与进程数相同
+        self.extract_workers = int(os.getenv('ARXIV_EXTRACT_WORKERS', self.pdf_pool.workers))
+        self.analyze_workers = int(os.getenv('ARXIV_ANALYZE_WORKERS', 4))
+        self.persist_workers = int(os.getenv('ARXIV_PERSIST_WORKERS', 1))
+        self.queue_size = int(os.getenv('ARXIV_PIPELINE_QUEUE_SIZE', 16))
+
+        # 是否使用持久化游标断点续爬，ARXIV_RESUME=0 时关闭
+        self.resume = os.getenv('ARXIV_RESUME', '1') == '1'
+        self._active_cursors = {}
+
+        # 所有线程共享的自适应限速器
+        self.arxiv_limiter = get_rate_limiter("arxiv")
+        # arXiv 请求复用 keep-alive 连接
+        self.http = get_http_session("arxiv")
+        # 边下载边解析 arXiv 响应，每解析出这么多条目就交给后续处理
+        self.feed_chunk_size = int(os.getenv('ARXIV_FEED_CHUNK', 10))
+        self.llm_limiter = get_rate_limiter("llm")
+
+        # 按 cs 子分类分别查询：ARXIV_FANOUT=0 时关闭，ARXIV_CATEGORIES 指定分类（逗号分隔，默认全部 cs 子分类），
+        # ARXIV_FANOUT_WORKERS 为同时取页的分类数
+        self.fanout = os.getenv('ARXIV_FANOUT', '1') == '1'
+        self.categories = parse_categories(os.getenv('ARXIV_CATEGORIES'))
+        self.fanout_workers = int(os.getenv('ARXIV_FANOUT_WORKERS', 4))
+        self.category_lag = CategoryLag()
+
+        # 快照导入每批插入的论文数，以及每次定时运行顺带处理的待处理论文数（0 表示不处理）
+        self.snapshot_batch_size = int(os.getenv('ARXIV_SNAPSHOT_BATCH', 1000))
+        self.pending_per_run = int(os.getenv('ARXIV_PENDING_PER_RUN', 0))
+
+        # 本次运行的分阶段耗时和计数
+        self.metrics = RunMetrics("arxiv")
+
+        # 回填配置：窗口超过 backfill_min_days 天时按日期分片并行处理
+        self.backfill_min_days = int(os.getenv('ARXIV_BACKFILL_MIN_DAYS', 7))
+        self.backfill_workers = int(os.getenv('ARXIV_BACKFILL_WORKERS', 4))
+        self.backfill_shard_days = int(os.getenv('ARXIV_BACKFILL_SHARD_DAYS', 1))
+        # 自适应分片：分片内论文数超过上限时继续拆分，避免 start 偏移过深，0 表示关闭
+        self.backfill_shard_max_results = int(os.getenv('ARXIV_BACKFILL_SHARD_MAX_RESULTS', 0))
     
-    def _analyze_paper_with_openai(self, paper_text, paper_title, paper_authors, summary):
+    def _parse_json_result(self, result):
+        """解析模型返回的 JSON，失败返回 None"""
+        # 尝试解析 JSON 结果
+        try:
+            return json.loads(result)
+        except json.JSONDecodeError:
+            # 如果无法解析为 JSON，尝试提取 JSON 部分
+            json_start = result.find("{")
+            json_end = result.rfind("}") + 1
+            if json_start >= 0 and json_end > json_start:
+                try:
+                    return json.loads(result[json_start:json_end])
+                except:
+                    pass
+        return None
 
+    def _parse_analysis_content(self, content):
+        """解析模型返回的分析内容，去掉思考过程后解析 JSON"""
+        content = re.sub(r'<think>.*?</think>', '', content or "", flags=re.DOTALL)
+        return self._parse_json_result(content)
+
+    def _build_analysis_request(self, paper_text, paper_title, paper_authors, summary, paper_pages=None):
+        """构建论文分析请求，返回 (缓存key, 模型名, messages)
+
+        只发送第一页的作者单位信息和致谢/基金段落，总长度受 prompt_token_budget 限制。
+        """
+        # 清理文本，移除或替换不兼容的Unicode字符
+        def clean_text(text):
+            if not text:
+                return ""
+            # 替换或移除可能导致编码问题的字符
+            return text.encode('utf-8', errors='ignore').decode('utf-8')
+        
+        paper_context = build_paper_context(paper_pages or [(0, paper_text)], self.prompt_token_budget)
+        cleaned_paper_text = clean_text(paper_context)
+        cleaned_paper_title = clean_text(paper_title)
+        cleaned_summary = clean_text(summary)
+        cleaned_authors = [clean_text(author) for author in paper_authors]
+
+        model = os.getenv('OPENAI_API_MODEL')
+        cache_key = LLMCache.make_key(model, PROMPT_VERSION, cleaned_paper_title, cleaned_summary,
+                                      cleaned_authors, cleaned_paper_text)
+
+        prompt = f"""
+        请分析以下学术论文信息，并提取以下内容（用中文回答）：
+        1. 所有作者的姓名和所属机构，如果机构隶属于中国，要翻译成中文
+        2. 每位作者的位置（第一作者、第二作者，其他作者，通讯作者等）
+        3. 作者的邮箱地址
+        4. 论文的主要研究方向
+        5. 论文的主要内容和贡献
+        
+        论文标题: {cleaned_paper_title}
+        论文摘要: {cleaned_summary}
+        作者列表: {', '.join(cleaned_authors)}
+        
+        论文中的作者单位和致谢信息:
+        {cleaned_paper_text}
+        
+        请以 JSON 格式返回结果，格式如下, 不要做任何解释，只返回json:
+        {{
+            "中文标题": "论文中文标题",
+            "作者信息": [
+                {{
+                    "姓名": "作者姓名，直接使用原文里的名字，不要翻译",
+                    "位置": "作者位置，第一作者、第二作者，其他作者，通讯作者等",
+                    "单位": "作者单位，如果是中国大学或者中国公司，使用中文描述（不要带数字标记）, 否则还是用英文",
+                    "邮箱": "作者邮箱",
+                    "国家": "作者国家，翻译成中文"
+                }}
+            ],
+            "研究方向": "论文研究方向, 中文描述",
+            "主要内容": "论文主要内容和贡献，中文描述"
+            "nsfc": false "bool类型， 国家自然科学基金(nsfc)是否资助, 默认false"
+        }}
+        """
+
+        messages = [
+            {
+                "role": "system",
+                "content": "你是一个专业的学术论文分析助手，擅长从论文中提取关键信息。",
+            },
+            {"role": "user", "content": prompt},
+        ]
+        api_logger.info(f"论文 '{paper_title}' 提示词约 {estimate_tokens(prompt)} tokens"
+                        f"（论文内容 {estimate_tokens(cleaned_paper_text)} tokens，"
+                        f"原文 {estimate_tokens(paper_text)} tokens）")
+        return cache_key, model, messages
+
+    def _build_residual_request(self, paper_title, summary):
+        """作者信息已由规则提取时的分析请求，只根据标题和摘要生成中文标题、研究方向和主要内容"""
+        cleaned_paper_title = paper_title.encode('utf-8', errors='ignore').decode('utf-8')
+        cleaned_summary = (summary or "").encode('utf-8', errors='ignore').decode('utf-8')
+
+        model = os.getenv('OPENAI_API_MODEL')
+        cache_key = LLMCache.make_key(model, f"{PROMPT_VERSION}-residual", cleaned_paper_title, cleaned_summary)
+
+        prompt = f"""
+        请根据以下学术论文的标题和摘要，提取以下内容（用中文回答）：
+        1. 论文的中文标题
+        2. 论文的主要研究方向
+        3. 论文的主要内容和贡献
+
+        论文标题: {cleaned_paper_title}
+        论文摘要: {cleaned_summary}
+
+        请以 JSON 格式返回结果，格式如下, 不要做任何解释，只返回json:
+        {{
+            "中文标题": "论文中文标题",
+            "研究方向": "论文研究方向, 中文描述",
+            "主要内容": "论文主要内容和贡献，中文描述"
+        }}
+        """
+
+        messages = [
+            {
+                "role": "system",
+                "content": "你是一个专业的学术论文分析助手，擅长从论文中提取关键信息。",
+            },
+            {"role": "user", "content": prompt},
+        ]
+        api_logger.info(f"论文 '{paper_title}' 作者信息已提取，提示词约 {estimate_tokens(prompt)} tokens")
+        return cache_key, model, messages
+
+    def _complete_analysis(self, cache_key, model, messages, paper_title):
+        """调用 LLM 并解析返回的 JSON，先查缓存，失败返回 None"""
         try:
-            # 清理文本，移除或替换不兼容的Unicode字符
-            def clean_text(text):
-                if not text:
-                    return ""
-                # 替换或移除可能导致编码问题的字符
-                return text.encode('utf-8', errors='ignore').decode('utf-8')
-            
-            cleaned_paper_text = clean_text(paper_text)
-            cleaned_paper_title = clean_text(paper_title)
-            cleaned_summary = clean_text(summary)
-            cleaned_authors = [clean_text(author) for author in paper_authors]
-            
-            prompt = f"""
-            请分析以下学术论文信息，并提取以下内容（用中文回答）：
-            1. 所有作者的姓名和所属机构，如果机构隶属于中国，要翻译成中文
-            2. 每位作者的位置（第一作者、第二作者，其他作者，通讯作者等）
-            3. 作者的邮箱地址
-            4. 论文的主要研究方向
-            5. 论文的主要内容和贡献
-            
-            论文标题: {cleaned_paper_title}
-            论文摘要: {cleaned_summary}
-            作者列表: {', '.join(cleaned_authors)}
-            
-            论文内容, 只提取前4000个字符:
-            {cleaned_paper_text[:4000]}  
-            
-            请以 JSON 格式返回结果，格式如下, 不要做任何解释，只返回json:
-            {{
-                "中文标题": "论文中文标题",
-                "作者信息": [
-                    {{
-                        "姓名": "作者姓名，直接使用原文里的名字，不要翻译",
-                        "位置": "作者位置，第一作者、第二作者，其他作者，通讯作者等",
-                        "单位": "作者单位，如果是中国大学或者中国公司，使用中文描述（不要带数字标记）, 否则还是用英文",
-                        "邮箱": "作者邮箱",
-                        "国家": "作者国家，翻译成中文"
-                    }}
-                ],
-                "研究方向": "论文研究方向, 中文描述",
-                "主要内容": "论文主要内容和贡献，中文描述"
-                "nsfc": false "bool类型， 国家自然科学基金(nsfc)是否资助, 默认false"
-            }}
-            """
-
-            # 记录日志，帮助调试
-            api_logger.debug(f"发送到OpenAI的提示长度: {len(prompt)}")
-            
-            response = self.openAiClient.chat.completions.create(
-                model=os.getenv('OPENAI_API_MODEL'),
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "你是一个专业的学术论文分析助手，擅长从论文中提取关键信息。",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-            )
+            # 先查缓存，重复处理同一篇论文时不再调用 OpenAI
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                api_logger.debug(f"使用缓存的分析结果: {paper_title}")
+                self.metrics.incr("llm_cache_hits")
+                return cached
 
-            result = response.choices[0].message.content
-            result = re.sub(r'<think>.*?</think>', '', result, flags=re.DOTALL)
-
-            # 尝试解析 JSON 结果
-            try:
-                return json.loads(result)
-            except json.JSONDecodeError:
-                # 如果无法解析为 JSON，尝试提取 JSON 部分
-                json_start = result.find("{")
-                json_end = result.rfind("}") + 1
-                if json_start >= 0 and json_end > json_start:
-                    try:
-                        return json.loads(result[json_start:json_end])
-                    except:
-                        pass
+            self.metrics.incr("llm_calls")
+            with self.metrics.timer("llm"):
+                response = self.llm_limiter.call(
+                    self.openAiClient.chat.completions.create,
+                    model=model,
+                    messages=messages,
+                )
 
+            paper_info = self._parse_analysis_content(response.choices[0].message.content)
+            if paper_info is None:
                 api_logger.info("无法解析 OpenAI 返回的结果为 JSON 格式")
                 return None
 
+            self.llm_cache.put(cache_key, paper_info)
+            return paper_info
+
         except Exception as e:
             api_logger.info(f"OpenAI 分析失败: {e}")
             api_logger.debug(f"错误详情: {str(e)}")  # 添加更详细的错误日志
             return None
 
-    # 在 search_papers 方法中
-    def search_papers(self, query="cat:cs.*", max_results=10000, date_range=None):
-        """搜索arXiv论文并下载PDF"""
-        results = []
-        start_index = 0
+    def _analyze_paper_with_openai(self, paper_text, paper_title, paper_authors, summary, paper_pages=None,
+                                   categories=None):
+        """分析论文：先用规则提取作者信息，可信时只让 LLM 生成其余字段（或不调用 LLM），否则完整分析后补全"""
+        pages = paper_pages or [(0, paper_text)]
+        extraction = None
+        if self.local_extract != "off":
+            with self.metrics.timer("extract_authors"):
+                extraction = self.author_extractor.extract(pages, paper_authors, paper_title)
+            self.metrics.incr("authors_extracted" if extraction["confident"] else "authors_partial")
+            if not extraction["confident"]:
+                api_logger.debug(f"论文 '{paper_title}' 以下作者的单位或国家未能提取: {extraction['missing']}")
+
+        if extraction and extraction["confident"]:
+            if self.local_extract == "skip":
+                self.metrics.incr("llm_skipped")
+                return {
+                    "中文标题": "",
+                    "作者信息": extraction["authors"],
+                    "研究方向": research_direction(categories),
+                    "主要内容": "",
+                    "nsfc": extraction["nsfc"],
+                }
+            request = self._build_residual_request(paper_title, summary)
+        else:
+            request = self._build_analysis_request(paper_text, paper_title, paper_authors, summary, pages)
+
+        paper_info = self._complete_analysis(*request, paper_title)
+        if paper_info is None or extraction is None:
+            return paper_info
+        # 缓存中的结果可能被其他线程共用，复制后再修改
+        paper_info = dict(paper_info)
+        if extraction["confident"]:
+            paper_info["作者信息"] = extraction["authors"]
+            paper_info["nsfc"] = extraction["nsfc"]
+            paper_info["研究方向"] = paper_info.get("研究方向") or research_direction(categories)
+        else:
+            paper_info["作者信息"] = merge_extracted_authors(paper_info.get("作者信息"), extraction)
+        return paper_info
+
+    def _entry_to_task(self, entry):
+        """从 feed 条目中提取处理论文所需的基本信息"""
+        # 获取基本信息
+        title = entry.title
+        authors = entry.authors
+        # 论文唯一标识符不带版本号，版本号单独保存
+        paper_id, version = split_arxiv_id(entry.id)
+
+        # 获取论文分类信息
+        categories = [term for term in entry.tags if term.startswith("cs.")]
+
+        # 获取PDF链接和网页链接
+        pdf_link = entry.pdf_link
+        web_link = entry.web_link
+
+        if not pdf_link:
+            api_logger.info(f"论文 '{title}' 没有PDF链接，跳过")
+            return None
+
+        # 如果没有找到网页链接，可以从 entry.id 或 PDF 链接构造
+        if not web_link and entry.id:
+            web_link = entry.id
+        elif not web_link and pdf_link:
+            # 从 PDF 链接构造网页链接
+            arxiv_id = _get_xvid_from_pdf_url(pdf_link)
+            web_link = f"https://arxiv.org/abs/{arxiv_id}"
+
+        return {
+            "paper_id": paper_id,
+            "version": version,
+            "title": title,
+            "authors": authors,
+            "categories": categories,
+            "pdf_link": pdf_link,
+            "web_link": web_link,
+            "summary": entry.summary,
+            "published": entry.published,
+        }
+
+    def _stream_feed(self, query_url, parser):
+        """流式下载并解析一页 arXiv 结果，边下载边返回条目"""
+        self.arxiv_limiter.acquire()
+        self.metrics.incr("arxiv_requests")
+        with self.metrics.timer("arxiv_request"):
+            response = self.http.get(query_url, timeout=30, stream=True)
+        self.arxiv_limiter.observe_response(response)
+        try:
+            response.raise_for_status()
+            yield from iter_atom_entries(response.iter_content(chunk_size=FEED_CHUNK_BYTES), parser)
+        finally:
+            response.close()
+
+    def _iter_feed_pages(self, query, date_range=None, start_index=0, progress=None, sort_order="descending"):
+        """分页查询arXiv，从 start_index 开始边下载边解析，每解析出 feed_chunk_size 个条目返回一批
+
+        progress 不为空时记录结果总数 total_results 和下一条的位置 start_index。
+        """
         batch_size = 100  # 每次请求100篇论文
 
         # 构建日期范围查询
         if date_range:
             query = f"{query}+AND+{date_range}"
 
-        while len(results) < max_results:
-            current_batch = min(batch_size, max_results - len(results))
-
+        while True:
+            received = 0
+            total_results = None
             tryMaxAttempts = 5
             for i in range(tryMaxAttempts):
-                # 构建查询
-                query_url = f"{self.base_url}search_query={query}&start={start_index}&max_results={current_batch}&sortBy=submittedDate&sortOrder=descending"
+                # 构建查询，中途出错时从已收到的位置继续
+                query_url = f"{self.base_url}search_query={query}&start={start_index}&max_results={batch_size}&sortBy=submittedDate&sortOrder={sort_order}"
                 api_logger.info(f"正在查询: {query_url}")
-                response = requests.get(query_url, timeout=30)
-                response.raise_for_status()
+                parser = AtomStreamParser()
+                entries = []
+                try:
+                    for entry in self._stream_feed(query_url, parser):
+                        entries.append(entry)
+                        if len(entries) >= self.feed_chunk_size:
+                            received += len(entries)
+                            start_index += len(entries)
+                            if progress is not None:
+                                progress.update(total_results=parser.total_results, start_index=start_index)
+                            yield entries
+                            entries = []
+                except Exception as e:
+                    self.arxiv_limiter.observe_exception(e)
+                    api_logger.info(f"查询出错: {e}")
+                if entries:
+                    received += len(entries)
+                    start_index += len(entries)
+                    yield entries
+                total_results = parser.total_results
+                if progress is not None:
+                    progress.update(total_results=total_results, start_index=start_index)
 
-                feed = feedparser.parse(response.content)
-                if feed and len(feed.entries) > 0:
-                    api_logger.info(f"找到 {len(feed.entries)} 篇论文")
+                if received > 0:
+                    api_logger.info(f"找到 {received} 篇论文")
                     break
-                else:
-                    api_logger.info(f"尝试 {i+1}/{tryMaxAttempts} 次，等待 10 秒后重试...")
-                    time.sleep(10)
-                
-            try:
-                for entry in feed.entries:
-                    # 获取基本信息
-                    title = entry.title
-                    authors = [author.name for author in entry.authors]
-                    # 生成论文唯一标识符
-                    paper_id = entry.id
-
-                    # 检查是否已处理过该论文
-                    existing_paper = self.db_manager.get_paper(paper_id)
-                    if existing_paper:
-                        api_logger.debug(f"论文 '{title}' 已处理过，跳过")
-                        continue
+                if total_results is not None and start_index >= total_results:
+                    break
+                # arXiv 过载时常返回空结果，降速后重试
+                api_logger.info(f"尝试 {i+1}/{tryMaxAttempts} 次，降低请求速率后重试...")
+                self.arxiv_limiter.on_throttle()
+
+            if received == 0 or (total_results is not None and start_index >= total_results):
+                api_logger.info("没有更多论文，结束查询")
+                return
+
+    def _count_results(self, query, date_range):
+        """查询某个日期范围内的论文总数，失败返回 None"""
+        query_url = f"{self.base_url}search_query={query}+AND+{date_range}&start=0&max_results=0"
+        try:
+            parser = AtomStreamParser()
+            for _ in self._stream_feed(query_url, parser):
+                pass
+            return parser.total_results
+        except Exception as e:
+            self.arxiv_limiter.observe_exception(e)
+            api_logger.info(f"查询论文总数出错: {e}")
+            return None
+
+    def _entry_at(self, query, date_range, index, sort_order):
+        """查询某个位置上的论文条目，出错返回 None"""
+        if date_range:
+            query = f"{query}+AND+{date_range}"
+        query_url = f"{self.base_url}search_query={query}&start={index}&max_results=1&sortBy=submittedDate&sortOrder={sort_order}"
+        try:
+            return next(self._stream_feed(query_url, AtomStreamParser()), None)
+        except Exception as e:
+            self.arxiv_limiter.observe_exception(e)
+            api_logger.info(f"查询游标位置出错: {e}")
+            return None
+
+    def _resume_index(self, query, date_range, cursor):
+        """游标的继续位置：确认上次最后看到的论文仍在该位置之前，否则从头查询"""
+        if not cursor.start_index or not cursor.last_entry_id:
+            return 0
+        entry = self._entry_at(query, date_range, cursor.start_index - 1, "ascending")
+        if entry is None:
+            api_logger.info(f"无法确认游标位置，仍从 {cursor.start_index} 继续查询")
+            return cursor.start_index
+        if split_arxiv_id(entry.id)[0] != split_arxiv_id(cursor.last_entry_id)[0]:
+            api_logger.info(f"游标位置 {cursor.start_index} 之前的论文已变化（{cursor.last_entry_id} -> {entry.id}），从头查询")
+            return 0
+        api_logger.info(f"从游标位置 {cursor.start_index} 继续查询")
+        return cursor.start_index
+
+    def _iter_feed_tasks(self, query, date_range=None, cursor=None, progress=None):
+        """分页查询arXiv，逐页返回论文任务列表；有游标时从游标位置继续并记录进度
+
+        有游标时按提交时间升序查询：新提交的论文排在窗口末尾，不会改变已查询过的论文的位置，
+        继续查询前再确认上次最后看到的论文仍在游标位置之前。
+        """
+        start_index = self._resume_index(query, date_range, cursor) if cursor else 0
+        sort_order = "ascending" if cursor else "descending"
+
+        for entries in self._iter_feed_pages(query, date_range, start_index, progress, sort_order):
+            start_index += len(entries)
+            tasks = []
+            for entry in entries:
+                try:
+                    task = self._entry_to_task(entry)
+                    if task:
+                        tasks.append(task)
+                except Exception as e:
+                    api_logger.info(f"解析论文条目出错: {e}")
+
+            if cursor:
+                for task in tasks:
+                    task["cursor_key"] = cursor.key
+            yield tasks
+            # 消费方取下一页时，本页的论文已经在游标中登记为 pending，这时再推进位置，
+            # 两者之间进程被终止时只会重新查询这一页，不会丢失论文
+            if cursor:
+                cursor.advance(start_index, entries[-1].id)
+
+        if cursor:
+            cursor.finish()
+
+    def _iter_oai_tasks(self, from_date=None, until_date=None, batch_size=100):
+        """通过 OAI-PMH 采集论文，每 batch_size 条作为一批返回"""
+        batch = []
+        for task in self.oai_harvester.iter_records(from_date, until_date):
+            batch.append(task)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _iter_pending_tasks(self, task_batches):
+        """逐条返回尚未处理过的论文任务"""
+        for tasks in task_batches:
+            # 一次批量检查整批论文是否已处理过
+            for task in tasks:
+                # 旧游标中保存的论文ID带有版本号
+                if "version" not in task:
+                    task["paper_id"], task["version"] = split_arxiv_id(task["paper_id"])
+
+            with self.metrics.timer("db_filter"):
+                new_papers = self.db_manager.filter_new_papers([(task["paper_id"], task["version"]) for task in tasks])
+            api_logger.info(f"本批 {len(tasks)} 篇论文中有 {len(new_papers)} 篇未处理或有新版本")
+            self.metrics.incr("known", len(tasks) - len(new_papers))
+            self.metrics.incr("queued", len(new_papers))
+            for task in tasks:
+                if task.get("fanout_category"):
+                    self.metrics.incr("queued" if task["paper_id"] in new_papers else "known", group=task["fanout_category"])
+                    if task["paper_id"] in new_papers:
+                        self.category_lag.queued(task["fanout_category"], task["paper_id"], task.get("published"))
+
+            pending_tasks = []
+            for task in tasks:
+                if task["paper_id"] not in new_papers:
+                    api_logger.debug(f"论文 '{task['title']}' 已处理过，跳过")
+                    # 游标中中断前未登记完成的论文，数据库里已有则视为完成
+                    self._mark_task(task, STATUS_DONE)
+                    continue
+                task["known_version"] = new_papers[task["paper_id"]]
+                pending_tasks.append(task)
+
+            # 先在游标中登记，中断后可以重试
+            for cursor_key in {task.get("cursor_key") for task in pending_tasks}:
+                cursor = self._active_cursors.get(cursor_key)
+                if cursor:
+                    cursor.mark_pending([task for task in pending_tasks if task.get("cursor_key") == cursor_key])
+
+            for task in pending_tasks:
+                task["queued_at"] = time.perf_counter()
+                yield task
+
+    def _mark_task(self, task, status):
+        """更新论文在所属游标中的状态，并记录处理结果和从入队到结束的总耗时"""
+        queued_at = task.pop("queued_at", None)
+        if queued_at is not None:
+            self.metrics.incr(status)
+            self.metrics.set_status(task["paper_id"], status)
+            self.metrics.record("paper_total", time.perf_counter() - queued_at)
+            if task.get("fanout_category"):
+                self.metrics.incr(status, group=task["fanout_category"])
+                self.category_lag.finished(task["fanout_category"], task["paper_id"])
+        cursor = self._active_cursors.get(task.get("cursor_key"))
+        if cursor:
+            cursor.mark(task["paper_id"], status)
+
+    def _stage_download(self, task):
+        """流水线阶段：下载PDF"""
+        cached = get_pdf_cache().contains(_get_xvid_from_pdf_url(task["pdf_link"]) or "")
+        pdf_path = _download_pdf_path(task["pdf_link"])
+        if pdf_path:
+            self.metrics.incr("cached" if cached else "downloaded")
+        if not pdf_path:
+            api_logger.info(f"论文 '{task['title']}' PDF下载失败，跳过")
+            self._mark_task(task, STATUS_FAILED)
+            return None
+        task["pdf_path"] = pdf_path
+        return task
+
+    def _stage_extract(self, task):
+        """流水线阶段：提取PDF文本"""
+        # 前几页包含作者单位，最后几页包含致谢和基金信息，找到致谢段落后不再往前解析
+        result = self.pdf_pool.extract_until(task.pop("pdf_path"), self.page_order, self.page_stop)
+        pages = result["pages"]
+        for _, seconds in result["page_times"]:
+            self.metrics.record("pdf_page", seconds)
+        self.metrics.incr("pdf_pages_parsed", len(result["page_times"]))
+        if result.get("stopped"):
+            self.metrics.incr("pdf_early_stops")
+        if result.get("cached_pages"):
+            self.metrics.incr("pdf_pages_stored", result["cached_pages"])
+        if result.get("backend_errors"):
+            self.metrics.incr("pdf_backend_fallbacks")
+
+        paper_text = "".join(text + "\n" for index, text in pages if index < self.head_pages)
+        if not paper_text.strip():
+            api_logger.info(f"论文 '{task['title']}' PDF文本提取失败，跳过")
+            self._mark_task(task, STATUS_FAILED)
+            return None
+        task["paper_text"] = paper_text
+        task["pages"] = pages
+        task["author_block_hash"] = author_block_hash(next((text for index, text in pages if index == 0), ""))
+        return task
+
+    def _stage_revision(self, task):
+        """流水线阶段：已处理过旧版本的论文，作者信息块没有变化时只更新版本号，不再调用 LLM"""
+        known_version = task.get("known_version")
+        if not known_version:
+            return task
+
+        stored_hash = self.db_manager.get_author_block_hash(task["paper_id"]) or self._cached_author_block_hash(task, known_version)
+        if stored_hash != task["author_block_hash"]:
+            api_logger.info(f"论文 '{task['title']}' v{task['version']} 的作者信息与 v{known_version} 不同，重新分析")
+            self.metrics.incr("revision_changed")
+            return task
+
+        api_logger.info(f"论文 '{task['title']}' v{task['version']} 的作者信息与 v{known_version} 相同，复用已有结果")
+        if self.db_manager.update_paper_version(task["paper_id"], task["version"], task["pdf_link"], task["web_link"],
+                                                stored_hash):
+            self.metrics.incr("revision_unchanged")
+            self._mark_task(task, STATUS_DONE)
+        else:
+            self._mark_task(task, STATUS_FAILED)
+        return None
+
+    def _cached_author_block_hash(self, task, version):
+        """数据库中没有旧版本的作者信息哈希时（升级前保存的论文），从缓存的旧版本 PDF 计算"""
+        old_pdf_path = get_pdf_cache().get(f"{task['paper_id'].split('/abs/')[-1]}v{version}")
+        if not old_pdf_path:
+            return None
+        pages = self.pdf_pool.extract(old_pdf_path, head_pages=1)["pages"]
+        return author_block_hash(pages[0][1]) if pages else None
+
+    def _stage_prefilter(self, task):
+        """流水线阶段：用关键词预过滤，没有中国机构的论文不再调用 LLM"""
+        if not self.affiliation_filter:
+            return task
+
+        # 只扫描前几页和致谢段落，参考文献中的会议地点容易误判
+        tail_text = "\n".join(text for index, text in task.get("pages", []) if index >= self.head_pages)
+        matched, reason = self.affiliation_filter.match(task["paper_text"] + "\n" + find_acknowledgement(tail_text))
+        if matched:
+            api_logger.debug(f"论文 '{task['title']}' 通过预过滤，{reason}")
+            return task
+
+        api_logger.info(f"论文 '{task['title']}' 未通过预过滤，跳过: {reason}")
+        self._record_skipped(task, reason)
+        self._mark_task(task, STATUS_SKIPPED)
+        return None
+
+    def _record_skipped(self, task, reason):
+        """保存跳过的论文，避免下次重复处理"""
+        paper = Paper(
+            paper_id=task["paper_id"],
+            title=task["title"],
+            pdf_link=task["pdf_link"],
+            web_link=task["web_link"],
+            categories=task["categories"],
+            publish_date=task.get("publish_date", ""),
+            version=task.get("version", 1),
+            author_block_hash=task.get("author_block_hash"),
+            status="skipped",
+            skip_reason=reason[:255],
+        )
+        return self.db_manager.save_paper(paper)
+
+    def _stage_analyze(self, task):
+        """流水线阶段：使用OpenAI分析"""
+        title = task["title"]
+        api_logger.debug(f"使用OpenAI分析论文: {title}")
+        paper_info = self._analyze_paper_with_openai(task["paper_text"], title, task["authors"], task["summary"],
+                                                     task.get("pages"), task.get("categories"))
+        if not paper_info:
+            api_logger.info(f"论文 '{title}' OpenAI分析失败，跳过")
+            self._mark_task(task, STATUS_FAILED)
+            return None
+        else:
+            api_logger.info(f"论文返回json:{paper_info}")
+        self.metrics.incr("analyzed")
+        task["paper_info"] = paper_info
+        return task
+
+    def _stage_persist(self, task):
+        """流水线阶段：保存到数据库"""
+        paper_info = task["paper_info"]
+        paper_info["title"] = task["title"]
+        paper_info["paper_id"] = task["paper_id"]
+        paper_info["pdf_link"] = task["pdf_link"]
+        paper_info["web_link"] = task["web_link"]
+        paper_info["categories"] = task["categories"]
+        paper_info["version"] = task.get("version", 1)
+        paper_info["author_block_hash"] = task.get("author_block_hash")
+        if task.get("publish_date"):
+            paper_info["publish_date"] = task["publish_date"]
+        paper_info["has_chinese_author"] = False
+        paper_info["has_chinese_email"] = False
+        # 直接创建 Paper 对象
+        paper = Paper.from_dict(paper_info)
 
-                    # 获取论文分类信息
-                    categories = []
-                    if hasattr(entry, "tags"):
-                        for tag in entry.tags:
-                            if tag.get("term") and tag.get("term").startswith("cs."):
-                                categories.append(tag.get("term"))
-
-                    # 获取PDF链接和网页链接
-                    pdf_link = ""
-                    web_link = ""
-                    for link in entry.links:
-                        if link.get("title", "") == "pdf":
-                            pdf_link = link.href
-                        elif (link.get("rel", "") == "alternate" and link.get("type", "") == "text/html"):
-                            web_link = link.href
-
-                    if not pdf_link:
-                        api_logger.info(f"论文 '{title}' 没有PDF链接，跳过")
+        # 将论文和作者信息保存到数据库
+        api_logger.info(f"添加论文: {task['title']}")
+        if not self.db_manager.save_paper_with_authors(paper, replace_authors=bool(task.get("known_version"))):
+            api_logger.info(f"论文 '{task['title']}' 保存失败")
+            self._mark_task(task, STATUS_FAILED)
+            return None
+        self._mark_task(task, STATUS_DONE)
+        return paper
+
+    def _stage_prepare_batch(self, task):
+        """批处理导出阶段：构建分析请求，缓存命中时直接带上分析结果"""
+        cache_key, model, messages = self._build_analysis_request(
+            task.pop("paper_text"), task["title"], task["authors"], task["summary"], task.pop("pages", None))
+        cached = self.llm_cache.get(cache_key)
+        if cached is not None:
+            task["paper_info"] = cached
+            return task
+
+        task["cache_key"] = cache_key
+        task["batch_request"] = {
+            "custom_id": task["paper_id"],
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": model, "messages": messages},
+        }
+        return task
+
+    def _timed_stage(self, name, func):
+        """包装阶段函数，记录每篇论文在该阶段的耗时和出错次数"""
+        def timed(task):
+            with self.metrics.timer(name, task.get("paper_id")):
+                try:
+                    return func(task)
+                except Exception:
+                    self.metrics.incr(f"{name}_errors")
+                    raise
+        return timed
+
+    def _run_stages(self, task, stages):
+        """串行执行各阶段处理一篇论文"""
+        for stage in stages:
+            task = self._timed_stage(stage.__name__.replace("_stage_", ""), stage)(task)
+            if task is None:
+                return None
+        return task
+
+    def _process_task(self, task):
+        """串行执行所有阶段处理一篇论文"""
+        return self._run_stages(task, (self._stage_download, self._stage_extract, self._stage_revision,
+                                       self._stage_prefilter, self._stage_analyze, self._stage_persist))
+
+    def _build_pipeline(self, analyze_stage=None, persist_stage=None):
+        """构建 下载 -> 提取 -> 分析 -> 保存 的并发流水线"""
+        stages = [
+            Stage("download", self._stage_download, self.download_workers),
+            Stage("extract", self._stage_extract, self.extract_workers),
+            Stage("revision", self._stage_revision, 1),
+            Stage("prefilter", self._stage_prefilter, 1),
+            analyze_stage or Stage("analyze", self._stage_analyze, self.analyze_workers),
+        ]
+        if persist_stage is not False:
+            stages.append(persist_stage or Stage("persist", self._stage_persist, self.persist_workers))
+        for stage in stages:
+            stage.func = self._timed_stage(stage.name, stage.func)
+        return StagedPipeline(
+            stages=stages,
+            queue_size=self.queue_size,
+            key_func=lambda task: task["paper_id"],
+        )
+
+    def _process_tasks(self, tasks, max_results=10000, use_pipeline=None):
+        """处理论文任务（串行或流水线），返回保存成功的论文"""
+        if use_pipeline is None:
+            use_pipeline = self.use_pipeline
+
+        results = []
+        if use_pipeline:
+            api_logger.info(f"使用流水线模式处理论文，下载/提取/分析/保存线程数: "
+                            f"{self.download_workers}/{self.extract_workers}/{self.analyze_workers}/{self.persist_workers}")
+            papers = self._build_pipeline().run(tasks)
+        else:
+            papers = (self._process_task(task) for task in tasks)
+
+        try:
+            for paper in papers:
+                if not paper:
+                    continue
+                # 添加到结果列表
+                results.append(paper)
+
+                # 如果已经找到足够的论文，提前结束
+                if len(results) >= max_results:
+                    break
+        finally:
+            papers.close()
+
+        return results
+
+    def search_papers(self, query="cat:cs.*", max_results=10000, date_range=None, use_pipeline=None, resume=None):
+        """搜索arXiv论文并下载PDF
+
+        resume 为真时使用持久化游标：从上次中断的页继续，并先重试中断或失败的论文。
+        """
+        if resume is None:
+            resume = self.resume
+        if not resume:
+            tasks = self._iter_pending_tasks(self._iter_feed_tasks(query, date_range))
+            return self._process_tasks(tasks, max_results=max_results, use_pipeline=use_pipeline)
+
+        cursor = self._open_cursor(query, date_range)
+        try:
+            batches = self._iter_feed_tasks(query, date_range, cursor)
+            retry_tasks = cursor.retry_tasks()
+            if retry_tasks:
+                api_logger.info(f"游标中有 {len(retry_tasks)} 篇论文需要重试")
+                for task in retry_tasks:
+                    task["cursor_key"] = cursor.key
+                batches = itertools.chain([retry_tasks], batches)
+
+            tasks = self._iter_pending_tasks(batches)
+            return self._process_tasks(tasks, max_results=max_results, use_pipeline=use_pipeline)
+        finally:
+            cursor.save(force=True)
+            api_logger.info(f"游标 {cursor.key} 状态统计: {cursor.summary()}")
+            self._active_cursors.pop(cursor.key, None)
+            self._cleanup_cursor(cursor)
+
+    def _open_cursor(self, query, date_range):
+        """打开查询窗口的游标；窗口已查询完但还有需要重试的论文时，从头重新查询，只保留重试列表"""
+        cursor = CrawlCursor(query, date_range)
+        if cursor.finished:
+            api_logger.info(f"游标 {cursor.key} 的窗口已查询完，从头重新查询，保留 {len(cursor.retry_tasks())} 篇需要重试的论文")
+            cursor.reopen()
+        self._active_cursors[cursor.key] = cursor
+        return cursor
+
+    def _category_queries(self):
+        """各 cs 子分类的查询"""
+        return [f"cat:{category}" for category in self.categories]
+
+    def _iter_category_tasks(self, category, date_range, cursor):
+        """查询一个分类，逐页返回论文任务；结束时记录该分类尚未取到的论文数 remaining"""
+        progress = {}
+        batches = self._iter_feed_tasks(f"cat:{category}", date_range, cursor, progress)
+        if cursor:
+            retry_tasks = cursor.retry_tasks()
+            if retry_tasks:
+                api_logger.info(f"分类 {category} 的游标中有 {len(retry_tasks)} 篇论文需要重试")
+                for task in retry_tasks:
+                    task["cursor_key"] = cursor.key
+                batches = itertools.chain([retry_tasks], batches)
+        try:
+            for tasks in batches:
+                for task in tasks:
+                    task["fanout_category"] = category
+                self.category_lag.fetched(category, [task.get("published") for task in tasks])
+                yield tasks
+        finally:
+            if progress.get("total_results") is not None:
+                self.metrics.set_value("total", progress["total_results"], group=category)
+                self.metrics.set_value("remaining", max(0, progress["total_results"] - progress["start_index"]), group=category)
+
+    def search_categories(self, date_range, categories=None, max_results=10000, use_pipeline=None, resume=None):
+        """按 cs 子分类分别查询同一日期窗口
+
+        每个分类有自己的游标，多个分类并行取页并轮流交给同一个处理流程，
+        跨分类重复的论文只处理一次；按分类统计取到、重复、新增、完成的论文数、剩余未取的论文数
+        和处理滞后（当前时间减去最早的未处理论文的提交时间）。
+        """
+        if resume is None:
+            resume = self.resume
+        categories = categories or self.categories
+        self.category_lag = CategoryLag()
+        api_logger.info(f"按 {len(categories)} 个分类并行查询 {date_range}，同时取页的分类数: {self.fanout_workers}")
+
+        cursors = {}
+        tasks = None
+        if resume:
+            for category in categories:
+                cursors[category] = self._open_cursor(f"cat:{category}", date_range)
+        try:
+            fanout = CategoryFanout(
+                {category: self._iter_category_tasks(category, date_range, cursors.get(category)) for category in categories},
+                workers=self.fanout_workers,
+                metrics=self.metrics,
+            )
+            tasks = self._iter_pending_tasks(fanout)
+            return self._process_tasks(tasks, max_results=max_results, use_pipeline=use_pipeline)
+        finally:
+            # 提前结束时先关闭各分类的迭代器，记下剩余论文数后再保存游标、输出统计
+            if tasks is not None:
+                tasks.close()
+            for cursor in cursors.values():
+                cursor.save(force=True)
+                self._active_cursors.pop(cursor.key, None)
+                self._cleanup_cursor(cursor)
+            self._log_category_stats(categories)
+
+    def _log_category_stats(self, categories):
+        """输出各分类的论文数、剩余未取的论文数和处理滞后，论文多的分类在前"""
+        groups = self.metrics.summary()["groups"]
+        for category in categories:
+            if category in groups:
+                lag = self.category_lag.lag_seconds(category, drained="drained_after" in groups[category])
+                self.metrics.set_value("lag_seconds", lag, group=category)
+                groups[category]["lag_seconds"] = lag
+        rows = sorted(((category, groups.get(category, {})) for category in categories),
+                      key=lambda row: -row[1].get("fetched", 0))
+        for category, stats in rows:
+            if not stats:
+                continue
+            api_logger.info(f"分类 {category}: 取到 {stats.get('fetched', 0)} 篇，重复 {stats.get('duplicates', 0)} 篇，"
+                            f"新增 {stats.get('queued', 0)} 篇，完成 {stats.get(STATUS_DONE, 0)} 篇，"
+                            f"剩余 {stats.get('remaining', '-')} 篇，取完用时 {stats.get('drained_after', '-')} 秒，"
+                            f"滞后 {stats.get('lag_seconds', 0) / 3600:.1f} 小时")
+
+    def _cleanup_cursor(self, cursor):
+        """窗口已完成且没有需要重试的论文时删除游标"""
+        if not cursor.is_complete():
+            return
+        failed = cursor.abandoned()
+        if failed:
+            api_logger.info(f"以下论文尝试 {CrawlCursor.MAX_ATTEMPTS} 次后仍失败或未完成，放弃: {failed}")
+        cursor.remove()
+
+    def retry_failed_papers(self, query="cat:cs.*", use_pipeline=None):
+        """重试已查询完的窗口中失败的论文"""
+        results = []
+        for cursor in CrawlCursor.list_for_query(query):
+            if not cursor.finished:
+                continue
+            retry_tasks = cursor.retry_tasks()
+            if retry_tasks:
+                api_logger.info(f"重试游标 {cursor.key} 中的 {len(retry_tasks)} 篇论文")
+                self._active_cursors[cursor.key] = cursor
+                try:
+                    for task in retry_tasks:
+                        task["cursor_key"] = cursor.key
+                    tasks = self._iter_pending_tasks([retry_tasks])
+                    results.extend(self._process_tasks(tasks, use_pipeline=use_pipeline))
+                finally:
+                    cursor.save(force=True)
+                    self._active_cursors.pop(cursor.key, None)
+            self._cleanup_cursor(cursor)
+        return results
+
+    def harvest_papers(self, from_date=None, until_date=None, max_results=10000, use_pipeline=None):
+        """通过 OAI-PMH 按日期范围采集 cs 论文并处理，日期格式 YYYY-MM-DD"""
+        api_logger.info(f"开始 OAI-PMH 采集，日期范围: {from_date or '-'} 到 {until_date or '-'}")
+        tasks = self._iter_pending_tasks(self._iter_oai_tasks(from_date, until_date))
+        results = self._process_tasks(tasks, max_results=max_results, use_pipeline=use_pipeline)
+        api_logger.info(f"OAI-PMH 采集完成，处理了 {len(results)} 篇论文")
+        api_logger.info(f"LLM 缓存统计: {self.llm_cache.stats()}")
+        return results
+
+    def import_snapshot(self, snapshot_file, from_date=None, until_date=None):
+        """从本地 arXiv 元数据快照（JSON lines，可为 .gz）导入 cs 论文，保存为待处理论文
+
+        逐行读取，内存占用固定；from_date / until_date 为 date，按第一个版本的提交日期过滤。
+        已存在的论文跳过。导入后由 process_pending 下载 PDF 并分析。
+        """
+        api_logger.info(f"开始导入元数据快照 {snapshot_file}，日期范围: {from_date or '-'} 到 {until_date or '-'}")
+        started = time.perf_counter()
+        matched = 0
+        inserted = 0
+        batch = []
+        for stub in iter_snapshot_stubs(snapshot_file, from_date, until_date):
+            submitted = stub.pop("submitted")
+            stub["publish_date"] = datetime.combine(submitted, datetime.min.time()) if submitted else None
+            batch.append(stub)
+            if len(batch) >= self.snapshot_batch_size:
+                matched += len(batch)
+                inserted += self.db_manager.insert_paper_stubs(batch)
+                batch = []
+                api_logger.info(f"快照导入进度: 符合条件 {matched} 篇，新插入 {inserted} 篇")
+        if batch:
+            matched += len(batch)
+            inserted += self.db_manager.insert_paper_stubs(batch)
+        self.metrics.incr("snapshot_matched", matched)
+        self.metrics.incr("snapshot_inserted", inserted)
+        api_logger.info(f"快照导入完成，符合条件 {matched} 篇，新插入 {inserted} 篇，"
+                        f"耗时 {time.perf_counter() - started:.1f} 秒")
+        return inserted
+
+    def _stub_to_task(self, paper):
+        """把待处理论文转换为论文任务"""
+        return {
+            "paper_id": paper.paper_id,
+            "version": paper.version or 1,
+            "title": paper.title,
+            "authors": paper.get_author_names(),
+            "categories": paper.get_categories(),
+            "pdf_link": paper.pdf_link,
+            "web_link": paper.web_link,
+            "summary": paper.summary or "",
+            "publish_date": paper.publish_date.strftime("%Y-%m-%d") if paper.publish_date else "",
+        }
+
+    def _iter_stub_tasks(self, limit=None, batch_size=100):
+        """从上次的位置开始按论文ID顺序逐批读取待处理论文，到末尾后从头开始，最多 limit 篇"""
+        position = None
+        if os.path.exists(PENDING_POSITION_FILE):
+            with open(PENDING_POSITION_FILE, "r", encoding="utf-8") as f:
+                position = f.read().strip() or None
+        start_position = position
+        wrapped = False
+        count = 0
+        while limit is None or count < limit:
+            size = batch_size if limit is None else min(batch_size, limit - count)
+            papers = self.db_manager.get_pending_papers(size, after_id=position)
+            if wrapped and start_position:
+                papers = [paper for paper in papers if paper.paper_id <= start_position]
+            if not papers:
+                if wrapped or not start_position:
+                    return
+                # 到达末尾，从头处理上次位置之前的论文（包括以前失败的）
+                wrapped = True
+                position = None
+                continue
+            position = papers[-1].paper_id
+            os.makedirs(os.path.dirname(PENDING_POSITION_FILE), exist_ok=True)
+            with open(PENDING_POSITION_FILE, "w", encoding="utf-8") as f:
+                f.write(position)
+            count += len(papers)
+            yield [self._stub_to_task(paper) for paper in papers]
+            if wrapped and start_position and position >= start_position:
+                return
+
+    def process_pending(self, limit=None, use_pipeline=None):
+        """下载并分析快照导入的待处理论文，最多处理 limit 篇"""
+        api_logger.info(f"待处理论文共 {self.db_manager.count_pending_papers()} 篇，本次最多处理 {limit or '全部'} 篇")
+        tasks = self._iter_pending_tasks(self._iter_stub_tasks(limit))
+        results = self._process_tasks(tasks, use_pipeline=use_pipeline)
+        api_logger.info(f"待处理论文处理完成，保存了 {len(results)} 篇论文，剩余 {self.db_manager.count_pending_papers()} 篇")
+        return results
+
+    def export_batch_requests(self, query="cat:cs.*", date_range=None, batch_file=None, max_results=10000, use_pipeline=None):
+        """将待分析论文的提示词写入 OpenAI batch 格式的 JSONL 文件，不同步调用 LLM
+
+        同时写入 <batch_file>.meta.jsonl，记录每个 custom_id 对应的论文信息，供导入结果时使用。
+        缓存中已有分析结果的论文直接保存，不再导出。返回写入的请求数。
+        """
+        if use_pipeline is None:
+            use_pipeline = self.use_pipeline
+        batch_file = batch_file or BATCH_REQUESTS_FILE
+        meta_file = _batch_meta_path(batch_file)
+        os.makedirs(os.path.dirname(os.path.abspath(batch_file)), exist_ok=True)
+        tasks = self._iter_pending_tasks(self._iter_feed_tasks(query, date_range))
+
+        if use_pipeline:
+            prepared = self._build_pipeline(
+                analyze_stage=Stage("prepare_batch", self._stage_prepare_batch, self.analyze_workers),
+                persist_stage=False,
+            ).run(tasks)
+        else:
+            stages = (self._stage_download, self._stage_extract, self._stage_revision, self._stage_prefilter,
+                      self._stage_prepare_batch)
+            prepared = (self._run_stages(task, stages) for task in tasks)
+
+        exported = 0
+        saved_from_cache = 0
+        try:
+            with open(batch_file, "w", encoding="utf-8") as f, open(meta_file, "w", encoding="utf-8") as mf:
+                for task in prepared:
+                    if not task:
                         continue
- 
-                    # 如果没有找到网页链接，可以从 entry.id 或 PDF 链接构造
-                    if not web_link and hasattr(entry, "id"):
-                        web_link = entry.id
-                    elif not web_link and pdf_link:
-                        # 从 PDF 链接构造网页链接
-                        arxiv_id = _get_xvid_from_pdf_url(pdf_link)
-                        web_link = f"https://arxiv.org/abs/{arxiv_id}"
-
-                    # 下载PDF
-                    pdf_file = _download_pdf(pdf_link)
-                    if not pdf_file:
-                        api_logger.info(f"论文 '{title}' PDF下载失败，跳过")
+                    if "paper_info" in task:
+                        if self._stage_persist(task):
+                            saved_from_cache += 1
                         continue
 
-                    # 提取PDF文本
-                    paper_text = _extract_text_from_pdf(pdf_file)
-                    pdf_file.close()
+                    f.write(json.dumps(task.pop("batch_request"), ensure_ascii=False) + "\n")
+                    self._mark_task(task, STATUS_EXPORTED)
+                    mf.write(json.dumps({
+                        "custom_id": task["paper_id"],
+                        "cache_key": task.pop("cache_key"),
+                        "task": task,
+                    }, ensure_ascii=False) + "\n")
+                    exported += 1
+                    if exported >= max_results:
+                        break
+        finally:
+            prepared.close()
 
-                    if not paper_text:
-                        api_logger.info(f"论文 '{title}' PDF文本提取失败，跳过")
-                        continue
+        api_logger.info(f"已导出 {exported} 条批处理请求到 {batch_file}，缓存命中直接保存 {saved_from_cache} 篇")
+        return exported
 
-                    summary = entry.summary
-                    # 使用OpenAI分析
-                    api_logger.debug(f"使用OpenAI分析论文: {title}")
-                    paper_info = self._analyze_paper_with_openai(paper_text, title, authors, summary)
-                    if not paper_info:
-                        api_logger.info(f"论文 '{title}' OpenAI分析失败，跳过")
+    def ingest_batch_results(self, results_file, meta_file=None):
+        """读取 OpenAI batch 结果 JSONL，解析后保存论文和作者信息，返回保存的论文"""
+        meta_file = meta_file or _batch_meta_path(BATCH_REQUESTS_FILE)
+        meta = {}
+        with open(meta_file, "r", encoding="utf-8") as mf:
+            for line in mf:
+                if line.strip():
+                    record = json.loads(line)
+                    meta[record["custom_id"]] = record
+
+        results = []
+        failed = 0
+        with open(results_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    custom_id = record.get("custom_id")
+                    if custom_id not in meta:
+                        api_logger.info(f"批处理结果 {custom_id} 没有对应的论文信息，跳过")
+                        failed += 1
                         continue
-                    else:
-                        api_logger.info(f"论文返回json:{paper_info}")
-                    
-                    paper_info["title"] = title
-                    paper_info["paper_id"] = paper_id
-                    paper_info["pdf_link"] = pdf_link
-                    paper_info["web_link"] = web_link
-                    paper_info["categories"] = categories
-                    paper_info["has_chinese_author"] = False
-                    paper_info["has_chinese_email"] = False
-                    # 直接创建 Paper 对象
-                    # 在代码中已经使用了 Paper 类
-                    paper = Paper.from_dict(paper_info)
-                    
-                    # 将论文和作者信息保存到数据库
-                    api_logger.info(f"添加论文: {title}")
-                    self.db_manager.save_paper_with_authors(paper)
-                    
-                    # 添加到结果列表
-                    results.append(paper)
-                    
-                    # 如果已经找到足够的论文，提前结束
-                    if len(results) >= max_results:
-                        break
 
-                start_index += len(feed.entries)
+                    response = record.get("response") or {}
+                    if record.get("error") or response.get("status_code") != 200:
+                        api_logger.info(f"论文 {custom_id} 批处理请求失败: {record.get('error') or response.get('status_code')}")
+                        failed += 1
+                        continue
 
-                # 避免请求过于频繁
-                time.sleep(3)
+                    content = response["body"]["choices"][0]["message"]["content"]
+                    paper_info = self._parse_analysis_content(content)
+                    if not paper_info:
+                        api_logger.info(f"论文 {custom_id} 的批处理结果无法解析为 JSON，跳过")
+                        failed += 1
+                        continue
 
-            except Exception as e:
-                api_logger.info(f"查询出错: {e}")
+                    self.llm_cache.put(meta[custom_id]["cache_key"], paper_info)
+                    task = dict(meta[custom_id]["task"])
+                    task["paper_info"] = paper_info
+                    paper = self._stage_persist(task)
+                    if paper:
+                        results.append(paper)
+                except Exception as e:
+                    api_logger.info(f"导入批处理结果出错: {e}")
+                    failed += 1
 
+        api_logger.info(f"批处理结果导入完成，保存 {len(results)} 篇论文，失败 {failed} 条")
         return results
 
-    def run(
-        self,
-        query="cat:cs.*",
-        max_results=10000,
-        days_back=365,
-    ):
+    def _date_window(self, days_back=365):
+        """根据数据库中最后发布日期确定搜索的开始和结束日期"""
         # 获取上次搜索日期
         last_search_date = self.db_manager.get_last_publish_date()
         today = datetime.now().date()
@@ -266,34 +1170,232 @@ class ArxivMonitor:
             # 首次搜索，使用指定的天数
             start_date = today - timedelta(days=days_back)
             api_logger.info(f"首次搜索，将搜索过去 {days_back} 天的论文")
+        return start_date, today
 
-        # 构建日期范围查询
-        date_range = f"submittedDate:[{start_date.strftime('%Y%m%d')}000000+TO+{today.strftime('%Y%m%d')}235959]"
+    def _search_shard(self, query, shard, max_results):
+        """处理一个日期分片；开启自适应分片时，论文过多的分片会继续拆分"""
+        date_range = submitted_datetime_range(*shard)
+        if self.backfill_shard_max_results and not CrawlCursor(query, date_range).start_index:
+            total = self._count_results(query, date_range)
+            if total is not None and total > self.backfill_shard_max_results:
+                sub_shards = split_shard(shard)
+                if len(sub_shards) > 1:
+                    api_logger.info(f"分片 {date_range} 有 {total} 篇论文，拆分为 {len(sub_shards)} 个子分片")
+                    results = []
+                    for sub_shard in sub_shards:
+                        results.extend(self._search_shard(query, sub_shard, max_results))
+                    return results
+        return self.search_papers(query=query, max_results=max_results, date_range=date_range)
+
+    def _run_shards(self, query, shards, max_results=10000):
+        """并行处理多个分片（日期范围字符串或 (开始, 结束) 时间元组），并汇报进度"""
+        total = len(shards)
+        results = []
+        finished = 0
+        started_at = time.time()
+
+        def run_one(shard):
+            if isinstance(shard, tuple):
+                return self._search_shard(query, shard, max_results)
+            return self.search_papers(query=query, max_results=max_results, date_range=shard)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.backfill_workers)) as executor:
+            futures = {executor.submit(run_one, shard): shard for shard in shards}
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    papers = future.result()
+                    results.extend(papers)
+                except Exception as e:
+                    papers = []
+                    api_logger.info(f"分片 {shard} 处理出错: {e}")
+                finished += 1
+                elapsed = time.time() - started_at
+                remaining = elapsed / finished * (total - finished)
+                api_logger.info(f"回填进度: {finished}/{total} 个分片，本分片 {len(papers)} 篇，共 {len(results)} 篇论文，"
+                                f"已用 {elapsed / 60:.1f} 分钟，预计剩余 {remaining / 60:.1f} 分钟")
+        return results
+
+    def backfill(self, start_date, end_date, query="cat:cs.*", max_results=10000, shard_days=None):
+        """按日期分片并行回填，每个分片有自己的游标，所有分片共享 arXiv 请求间隔"""
+        shards = plan_date_shards(start_date, end_date, shard_days or self.backfill_shard_days)
+        api_logger.info(f"开始回填 {start_date} 到 {end_date}，共 {len(shards)} 个分片，{self.backfill_workers} 个并行线程")
+        return self._run_shards(query, shards, max_results)
+
+    def run(
+        self,
+        query="cat:cs.*",
+        max_results=10000,
+        days_back=365,
+    ):
+        # 先重试以前窗口中失败的论文
+        if self.resume:
+            self.retry_failed_papers(query)
+            if self.fanout:
+                self.retry_failed_papers(self._category_queries())
 
+        # 有未完成的窗口时从中断处继续，否则根据数据库中的最后日期确定窗口
+        unfinished = [cursor for cursor in CrawlCursor.list_for_query(query) if not cursor.finished] if self.resume else []
+        unfinished_fanout = []
+        if self.resume and self.fanout:
+            unfinished_fanout = sorted({cursor.date_range for cursor in CrawlCursor.list_for_query(self._category_queries())
+                                        if not cursor.finished})
         api_logger.info(f"开始搜索arxiv论文，查询: {query}")
-        api_logger.info(f"日期范围: {start_date.strftime('%Y-%m-%d')} 到 {today.strftime('%Y-%m-%d')}...")
-        results = self.search_papers(query=query, max_results=max_results, date_range=date_range)
+        if unfinished or unfinished_fanout:
+            api_logger.info(f"检测到 {len(unfinished) + len(unfinished_fanout)} 个未完成的查询窗口，从中断处继续")
+            results = self._run_shards(query, [cursor.date_range for cursor in unfinished], max_results) if unfinished else []
+            for date_range in unfinished_fanout:
+                results.extend(self.search_categories(date_range, max_results=max_results))
+        else:
+            start_date, today = self._date_window(days_back)
+            api_logger.info(f"日期范围: {start_date.strftime('%Y-%m-%d')} 到 {today.strftime('%Y-%m-%d')}...")
+
+            if (today - start_date).days >= self.backfill_min_days:
+                results = self.backfill(start_date, today, query=query, max_results=max_results)
+            else:
+                # 构建日期范围查询
+                date_range = _submitted_date_range(start_date, today)
+                if self.fanout:
+                    results = self.search_categories(date_range, max_results=max_results)
+                else:
+                    results = self.search_papers(query=query, max_results=max_results, date_range=date_range)
+        if self.pending_per_run:
+            results.extend(self.process_pending(limit=self.pending_per_run))
         api_logger.info(f"找到 {len(results)} 篇来自中国大学的计算机科学论文")
-        
-        # 关闭数据库连接
+        api_logger.info(f"LLM 缓存统计: {self.llm_cache.stats()}")
+        api_logger.info(f"限速统计: {[limiter.stats() for limiter in (self.arxiv_limiter, self.llm_limiter, get_rate_limiter('pdf'))]}")
+        pdf_cache = get_pdf_cache()
+        pdf_cache.maintain()
+        api_logger.info(f"PDF 缓存统计: {pdf_cache.stats()}")
+        api_logger.info(f"PDF 下载统计: {get_pdf_downloader().stats()}")
+        if get_page_text_store():
+            api_logger.info(f"PDF 文本存储统计: {get_page_text_store().stats()}")
+        self.report_metrics()
+
+        # 释放当前线程的会话，连接池保留给下一次运行
         self.db_manager.close()
 
-def daily_task():
-    """每日执行的任务"""
-    api_logger.info(f"开始执行每日任务，时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    monitor = ArxivMonitor()
-    monitor.run()
-    api_logger.info(f"每日任务完成，时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    def report_metrics(self):
+        """输出本次运行的分阶段耗时汇总，导出 JSON，并开始新的统计"""
+        metrics, self.metrics = self.metrics, RunMetrics(self.metrics.name)
+        metrics.log_summary()
+        try:
+            return metrics.dump()
+        except Exception as e:
+            api_logger.info(f"保存运行统计失败: {e}")
+            return None
+
+    def close(self):
+        """释放数据库连接池、LLM 缓存、PDF 提取进程池、PDF 缓存索引、页面文本存储和 HTTP 连接，进程退出前调用"""
+        self.db_manager.close()
+        self.db_manager.engine.dispose()
+        self.llm_cache.close()
+        self.pdf_pool.close()
+        close_pdf_cache()
+        close_page_text_store()
+        close_http_sessions()
+
+
+class ArxivWorker:
+    """常驻的 arXiv 查询进程
+
+    ArxivMonitor 只创建一次，数据库连接池、HTTP 连接、OpenAI 客户端和已处理论文索引在多次运行之间保持预热。
+    每隔 interval_minutes 分钟运行一次，也可以通过 kill -USR1 <pid> 立即触发一次；
+    kill -TERM <pid> 时等当前运行结束后释放资源并退出。同一时间只有一次运行。
+    """
+
+    def __init__(self, interval_minutes=60):
+        self.interval_minutes = interval_minutes
+        self.monitor = None
+        self.run_requested = threading.Event()
+        self.stop_requested = threading.Event()
+
+    def run_once(self):
+        """执行一次查询，首次调用时初始化 ArxivMonitor"""
+        api_logger.info(f"开始执行定时任务，时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.monitor is None:
+            started = time.perf_counter()
+            self.monitor = ArxivMonitor()
+            api_logger.info(f"ArxivMonitor 初始化耗时 {time.perf_counter() - started:.2f} 秒")
+        try:
+            self.monitor.run()
+        except Exception as e:
+            api_logger.info(f"定时任务执行失败: {e}")
+        api_logger.info(f"定时任务完成，时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    def _on_signal(self, signum, frame):
+        """信号处理函数只设置标志，任务在主循环中执行"""
+        if signum == signal.SIGUSR1:
+            api_logger.info("收到 SIGUSR1，立即执行一次任务")
+            self.run_requested.set()
+        else:
+            api_logger.info(f"收到信号 {signum}，当前任务结束后退出")
+            self.stop_requested.set()
+            self.run_requested.set()
+
+    def serve(self):
+        """立即执行一次，然后按间隔或收到信号时执行，直到收到退出信号"""
+        signal.signal(signal.SIGUSR1, self._on_signal)
+        signal.signal(signal.SIGTERM, self._on_signal)
+
+        self.run_once()
+        schedule.every(self.interval_minutes).minutes.do(self.run_requested.set)
+        api_logger.info(f"已设置每 {self.interval_minutes} 分钟定时任务，程序将持续运行（kill -USR1 {os.getpid()} 可立即执行）...")
+        while not self.stop_requested.is_set():
+            schedule.run_pending()
+            # 等待定时或信号触发，每秒检查一次定时任务
+            if self.run_requested.wait(timeout=1):
+                self.run_requested.clear()
+                if not self.stop_requested.is_set():
+                    self.run_once()
+        if self.monitor:
+            self.monitor.close()
+        api_logger.info("常驻进程已退出")
 
 if __name__ == "__main__":
-    # 立即执行一次
-    daily_task()
+    parser = argparse.ArgumentParser(description="从 arXiv 获取计算机论文作者")
+    parser.add_argument("--mode", choices=["schedule", "oai", "batch-export", "batch-ingest", "backfill",
+                                           "snapshot-import", "process-pending"], default="schedule",
+                        help="schedule: 常驻进程，每小时定时查询，kill -USR1 可立即触发; oai: 通过 OAI-PMH 按日期范围采集一次; "
+                             "batch-export: 导出待分析论文的批处理请求; batch-ingest: 导入批处理结果; "
+                             "backfill: 按日期分片并行回填; snapshot-import: 从本地元数据快照导入待处理论文; "
+                             "process-pending: 处理快照导入的待处理论文")
+    parser.add_argument("--from-date", help="起始日期，格式 YYYY-MM-DD")
+    parser.add_argument("--until-date", help="结束日期，格式 YYYY-MM-DD")
+    parser.add_argument("--batch-file", default=BATCH_REQUESTS_FILE, help="批处理请求 JSONL 文件")
+    parser.add_argument("--batch-results", help="批处理结果 JSONL 文件")
+    parser.add_argument("--snapshot-file", help="arXiv 元数据快照文件（arxiv-metadata-oai-snapshot.json，可为 .gz）")
+    parser.add_argument("--limit", type=int, help="process-pending 模式最多处理的论文数")
+    parser.add_argument("--interval", type=int, default=int(os.getenv('ARXIV_INTERVAL_MINUTES', 60)),
+                        help="schedule 模式下两次运行的间隔（分钟）")
+    args = parser.parse_args()
 
-    # 设置每小时执行一次
-    schedule.every().hour.do(daily_task)
+    if args.mode != "schedule":
+        monitor = ArxivMonitor()
+        if args.mode == "oai":
+            monitor.harvest_papers(from_date=args.from_date, until_date=args.until_date)
+        elif args.mode == "batch-export":
+            if args.from_date:
+                start_date = datetime.strptime(args.from_date, "%Y-%m-%d").date()
+                end_date = datetime.strptime(args.until_date, "%Y-%m-%d").date() if args.until_date else datetime.now().date()
+            else:
+                start_date, end_date = monitor._date_window()
+            monitor.export_batch_requests(date_range=_submitted_date_range(start_date, end_date), batch_file=args.batch_file)
+        elif args.mode == "batch-ingest":
+            monitor.ingest_batch_results(args.batch_results, meta_file=_batch_meta_path(args.batch_file))
+        elif args.mode == "backfill":
+            start_date = datetime.strptime(args.from_date, "%Y-%m-%d").date()
+            end_date = datetime.strptime(args.until_date, "%Y-%m-%d").date() if args.until_date else datetime.now().date()
+            monitor.backfill(start_date, end_date)
+        elif args.mode == "snapshot-import":
+            start_date = datetime.strptime(args.from_date, "%Y-%m-%d").date() if args.from_date else None
+            end_date = datetime.strptime(args.until_date, "%Y-%m-%d").date() if args.until_date else None
+            monitor.import_snapshot(args.snapshot_file, start_date, end_date)
+        elif args.mode == "process-pending":
+            monitor.process_pending(limit=args.limit)
+        monitor.report_metrics()
+        monitor.close()
+        sys.exit(0)
 
-    api_logger.info("已设置每小时定时任务，程序将持续运行...")
-    # 持续运行，等待定时任务
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # 每分钟检查一次是否有待执行的任务
+    # 常驻运行，默认每小时执行一次
+    ArxivWorker(interval_minutes=args.interval).serve()
@@ -20,6 +20,7 @@ from datetime import datetime
 from crawl4ai import AsyncWebCrawler
 from utils.logger_settings import api_logger
 from utils.pdfUtils import HTML_CACHE_DIR
+from utils.rateLimiter import get_rate_limiter
 from model.universityCollege import UniversityCollege
 from model.universityTeacher import UniversityTeacher
 from db_manager import DBManager
@@ -149,7 +150,8 @@ class CollegeWebCrawler:
             
             try:    
                 # 调用OpenAI API分析内容
-                response = self.openAiClient.chat.completions.create(
+                response = get_rate_limiter("llm").call(
+                    self.openAiClient.chat.completions.create,
                     model=os.getenv('OPENAI_API_MODEL'),
                     messages=[
                         {"role": "system", "content": "你是一个专业的网页内容分析工具，能够准确提取教师信息。"},
@@ -398,7 +400,8 @@ class CollegeWebCrawler:
         """
         
         # 调用OpenAI API
-        response = self.openAiClient.chat.completions.create(
+        response = get_rate_limiter("llm").call(
+            self.openAiClient.chat.completions.create,
             model=os.getenv('OPENAI_API_MODEL'),
             messages=[
                 {"role": "system", "content": "你是一个专业的网页分析工具，能够准确识别网页的指定内容区域。"},
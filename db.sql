@@ -1,6 +1,8 @@
 CREATE TABLE
   `arxiv_papers` (
-    `paper_id` varchar(255) COLLATE utf8mb4_general_ci NOT NULL COMMENT '论文唯一标识符',
+    `paper_id` varchar(255) COLLATE utf8mb4_general_ci NOT NULL COMMENT '论文唯一标识符（不带版本号）',
+    `version` int DEFAULT '1' COMMENT '已处理的arXiv版本号',
+    `author_block_hash` varchar(64) COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '第一页作者信息块的哈希，用于判断新版本作者是否变化',
     `title` varchar(512) COLLATE utf8mb4_general_ci NOT NULL COMMENT '论文英文标题',
     `chinese_title` text COLLATE utf8mb4_general_ci COMMENT '论文中文标题',
     `publish_date` date NOT NULL COMMENT '论文发布日期',
@@ -11,8 +13,13 @@ CREATE TABLE
     `main_content` text COLLATE utf8mb4_general_ci COMMENT '论文主要内容和贡献',
     `has_chinese_author` tinyint (1) DEFAULT '0' COMMENT '是否有中国作者',
     `has_chinese_email` tinyint (1) DEFAULT '0' COMMENT '是否有中国作者邮箱',
+    `status` varchar(20) COLLATE utf8mb4_general_ci DEFAULT 'done' COMMENT '处理状态: done 已分析, skipped 预过滤跳过, pending 快照导入待处理',
+    `skip_reason` varchar(255) COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '跳过原因',
     `processed_date` datetime DEFAULT CURRENT_TIMESTAMP COMMENT '处理时间',
-    PRIMARY KEY (`paper_id`)
+    `summary` text COLLATE utf8mb4_general_ci COMMENT '论文摘要',
+    `author_names` text COLLATE utf8mb4_general_ci COMMENT 'arXiv上的作者姓名（JSON数组）',
+    PRIMARY KEY (`paper_id`),
+    KEY `idx_status` (`status`, `paper_id`)
   ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci COMMENT = 'arXiv论文信息表';
 
 CREATE TABLE
@@ -24,10 +31,12 @@ CREATE TABLE
     `affiliation` text COLLATE utf8mb4_general_ci COMMENT '所属机构',
     `email` varchar(255) COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '电子邮箱',
     `country` varchar(100) COLLATE utf8mb4_general_ci DEFAULT NULL COMMENT '国家',
+    `university_id` int DEFAULT NULL COMMENT '关联的 chinese_universities.id',
     `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
     `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
     PRIMARY KEY (`id`),
     UNIQUE KEY `paper_author` (`paper_id`, `author_name`),
+    KEY `idx_university_id` (`university_id`),
     CONSTRAINT `paper_authors_ibfk_1` FOREIGN KEY (`paper_id`) REFERENCES `arxiv_papers` (`paper_id`) ON DELETE CASCADE
   ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci COMMENT = '论文作者信息表';
 
@@ -78,4 +87,20 @@ CREATE TABLE
     `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
     PRIMARY KEY (`id`),
     UNIQUE KEY `collage_teacher` (`college_id`, `name`, `email`)
-  ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci COMMENT = '大学教师表';
\ No newline at end of file
+  ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_general_ci COMMENT = '大学教师表';
+
+-- 已有数据库升级
+-- ALTER TABLE `arxiv_papers` ADD COLUMN `status` varchar(20) DEFAULT 'done' COMMENT '处理状态: done 已分析, skipped 预过滤跳过', ADD COLUMN `skip_reason` varchar(255) DEFAULT NULL COMMENT '跳过原因';
+-- 论文ID去掉版本号，版本号单独保存（MySQL 8.0+），同一论文有多个版本时只保留最新版本
+-- ALTER TABLE `arxiv_papers` ADD COLUMN `version` int DEFAULT '1' COMMENT '已处理的arXiv版本号', ADD COLUMN `author_block_hash` varchar(64) DEFAULT NULL COMMENT '第一页作者信息块的哈希，用于判断新版本作者是否变化';
+-- UPDATE `arxiv_papers` SET `version` = CAST(SUBSTRING(REGEXP_SUBSTR(`paper_id`, 'v[0-9]+$'), 2) AS UNSIGNED) WHERE `paper_id` REGEXP 'v[0-9]+$';
+-- CREATE TEMPORARY TABLE `latest_versions` AS SELECT REGEXP_REPLACE(`paper_id`, 'v[0-9]+$', '') AS `base_id`, MAX(`version`) AS `version` FROM `arxiv_papers` GROUP BY `base_id`;
+-- DELETE p FROM `arxiv_papers` p JOIN `latest_versions` l ON REGEXP_REPLACE(p.`paper_id`, 'v[0-9]+$', '') = l.`base_id` AND p.`version` < l.`version`;
+-- SET FOREIGN_KEY_CHECKS = 0;
+-- UPDATE `paper_authors` SET `paper_id` = REGEXP_REPLACE(`paper_id`, 'v[0-9]+$', '');
+-- UPDATE `arxiv_papers` SET `paper_id` = REGEXP_REPLACE(`paper_id`, 'v[0-9]+$', '');
+-- SET FOREIGN_KEY_CHECKS = 1;
+-- 从元数据快照导入待处理论文
+-- ALTER TABLE `arxiv_papers` ADD COLUMN `summary` text COMMENT '论文摘要', ADD COLUMN `author_names` text COMMENT 'arXiv上的作者姓名（JSON数组）', ADD KEY `idx_status` (`status`, `paper_id`);
+-- 作者关联大学，加列后运行 python link_universities.py 回填
+-- ALTER TABLE `paper_authors` ADD COLUMN `university_id` int DEFAULT NULL COMMENT '关联的 chinese_universities.id', ADD KEY `idx_university_id` (`university_id`);
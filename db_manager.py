@@ -7,9 +7,11 @@ from model.paper import Paper
 from model.paperAuthor import PaperAuthor
 from model.university import ChineseUniversity
 from utils.logger_settings import api_logger
+from utils.universityLinker import UniversityLinker
 import os
 from dotenv import load_dotenv
 import platform
+import threading
 
 # 加载.env文件
 load_dotenv()
@@ -33,14 +35,22 @@ class DBManager:
         else:
             self.db_config = db_config
         
-        # 创建数据库连接URL
-        db_url = f"mysql+mysqlconnector://{self.db_config['user']}:{self.db_config['password']}@{self.db_config['host']}/{self.db_config['database']}"
+        # 创建数据库连接URL，DB_URL 可指向其他数据库（如基准测试用的临时 sqlite 库）
+        db_url = os.getenv('DB_URL') or f"mysql+mysqlconnector://{self.db_config['user']}:{self.db_config['password']}@{self.db_config['host']}/{self.db_config['database']}"
         
-        # 创建引擎
-        self.engine = create_engine(db_url)
+        # 创建引擎，常驻进程中连接可能被服务端超时断开，取用前先检测并定期回收
+        self.engine = create_engine(db_url, pool_pre_ping=True, pool_recycle=3600)
         
         # 创建会话工厂
         self.Session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=self.engine))
+
+        # 进程内已处理论文的 {论文ID: 版本号}，启动时预热，保存论文时更新
+        self.known_paper_versions = {}
+        self._known_ids_lock = threading.Lock()
+
+        # 作者单位到大学ID的关联器，第一次使用时从大学表构建
+        self._university_linker = None
+        self._linker_lock = threading.Lock()
     
     def _get_session(self):
         """获取数据库会话"""
@@ -77,6 +87,8 @@ class DBManager:
         try:
             # 使用Paper模型的静态方法保存论文
             result = Paper.save(session, paper)
+            if result:
+                self._mark_paper_known(paper.paper_id, paper.version)
             return result
         finally:
             session.close()
@@ -103,6 +115,99 @@ class DBManager:
         finally:
             session.close()
     
+    def warm_known_papers(self):
+        """从数据库加载所有论文ID和版本号到内存"""
+        session = self._get_session()
+
+        try:
+            versions = Paper.get_all_versions(session)
+            with self._known_ids_lock:
+                self.known_paper_versions.update(versions)
+            api_logger.info(f"已加载 {len(versions)} 个已处理论文ID")
+            return len(versions)
+        finally:
+            session.close()
+
+    def filter_new_papers(self, paper_versions) -> dict:
+        """批量检查论文是否需要处理，paper_versions 为 [(论文ID, 版本号)]
+
+        返回需要处理的 {论文ID: 已处理的版本号}（保持输入顺序），未处理过的论文已处理版本号为 None，
+        已处理过旧版本的论文返回旧版本号。先查内存，内存中没有的用一次主键 IN 查询确认，避免逐条查询。
+        """
+        with self._known_ids_lock:
+            unknown_ids = [paper_id for paper_id, _ in paper_versions if paper_id not in self.known_paper_versions]
+
+        if unknown_ids:
+            session = self._get_session()
+            try:
+                existing = Paper.get_versions(session, unknown_ids)
+            finally:
+                session.close()
+            with self._known_ids_lock:
+                for paper_id, version in existing.items():
+                    self.known_paper_versions[paper_id] = max(version, self.known_paper_versions.get(paper_id, 0))
+
+        new_papers = {}
+        with self._known_ids_lock:
+            for paper_id, version in paper_versions:
+                known_version = self.known_paper_versions.get(paper_id)
+                if known_version is None or known_version < version:
+                    new_papers[paper_id] = known_version
+        return new_papers
+
+    def _mark_paper_known(self, paper_id, version=1):
+        """记录论文已处理的版本号"""
+        with self._known_ids_lock:
+            self.known_paper_versions[paper_id] = max(version or 1, self.known_paper_versions.get(paper_id, 0))
+
+    def get_author_block_hash(self, paper_id):
+        """获取已保存论文的作者信息块哈希"""
+        session = self._get_session()
+
+        try:
+            return Paper.get_author_block_hash(session, paper_id)
+        finally:
+            session.close()
+
+    def update_paper_version(self, paper_id, version, pdf_link=None, web_link=None, author_block_hash=None):
+        """作者信息没有变化的新版本：只更新版本号和链接，复用原有作者信息"""
+        session = self._get_session()
+
+        try:
+            result = Paper.update_version(session, paper_id, version, pdf_link, web_link, author_block_hash)
+            if result:
+                self._mark_paper_known(paper_id, version)
+            return result
+        finally:
+            session.close()
+
+    def insert_paper_stubs(self, stubs) -> int:
+        """批量插入快照导入的待处理论文，已存在的论文跳过，返回插入数量"""
+        session = self._get_session()
+
+        try:
+            return Paper.insert_stubs(session, stubs)
+        finally:
+            session.close()
+
+    def get_pending_papers(self, limit=100, after_id=None) -> list:
+        """按论文ID顺序获取一批待处理论文"""
+        session = self._get_session()
+
+        try:
+            return Paper.get_pending(session, limit, after_id)
+        finally:
+            session.close()
+
+    def count_pending_papers(self) -> int:
+        """统计待处理论文数量"""
+        session = self._get_session()
+
+        try:
+            return Paper.count_pending(session)
+        finally:
+            session.close()
+
     def get_all_papers(self, limit=100, offset=0) -> list:
         """获取所有论文"""
         session = self._get_session()
@@ -140,21 +245,41 @@ class DBManager:
         finally:
             session.close()
     
-    def save_paper_with_authors(self, paper: Paper):
-        """将论文和作者信息保存到数据库"""
+    def save_paper_with_authors(self, paper: Paper, replace_authors=False):
+        """将论文和作者信息保存到数据库，replace_authors 为真时先删除论文原有的作者
+
+        论文、删除旧作者和写入新作者在同一个事务中提交，任何一步失败都整体回滚（旧作者保留），
+        提交成功后才把论文记为已处理，失败的论文之后还会重试。
+        """
         session = self._get_session()
         
         try:
             # 先保存论文基本信息
-            if not Paper.save(session, paper):
+            if not Paper.save(session, paper, commit=False):
+                return False
+
+            # 新版本作者有变化时，旧版本的作者记录作废
+            if replace_authors and not PaperAuthor.delete_by_paper_id(session, paper.paper_id, commit=False):
                 return False
                 
-            # 然后保存每个作者信息
+            # 然后保存每个作者信息，入库时关联单位对应的大学
+            linker = self.get_university_linker()
             for author in paper.authors:
                 author.nsfc = paper.nsfc
+                if author.university_id is None:
+                    author.university_id = linker.link(author.affiliation)
             
-            # 批量保存作者信息
-            return PaperAuthor.save_multiple(session, paper.authors)
+            # 批量保存作者信息，各步骤出错时已回滚
+            if not PaperAuthor.save_multiple(session, paper.authors, commit=False):
+                return False
+            try:
+                session.commit()
+            except Exception as e:
+                api_logger.error(f"保存论文和作者失败: {e}")
+                session.rollback()
+                return False
+            self._mark_paper_known(paper.paper_id, paper.version)
+            return True
         finally:
             session.close()
     
@@ -169,6 +294,41 @@ class DBManager:
         finally:
             session.close()
     
+    def get_university_linker(self, reload=False):
+        """获取作者单位到大学ID的关联器，reload 为真时按大学表重新构建"""
+        with self._linker_lock:
+            if self._university_linker is None or reload:
+                self._university_linker = UniversityLinker(self.get_universities())
+            return self._university_linker
+
+    def link_author_universities(self, batch_size=1000, relink=False):
+        """批量回填 paper_authors.university_id，relink 为真时重新关联所有作者，返回 (处理数, 关联成功数)"""
+        linker = self.get_university_linker(reload=True)
+        session = self._get_session()
+
+        try:
+            after_id = 0
+            scanned = 0
+            linked = 0
+            while True:
+                rows = PaperAuthor.get_affiliations(session, after_id, batch_size, only_unlinked=not relink)
+                if not rows:
+                    break
+                after_id = rows[-1][0]
+                university_ids = {author_id: linker.link(affiliation) for author_id, affiliation in rows}
+                if not relink:
+                    # 只回填时没有关联上的作者不需要更新
+                    university_ids = {author_id: university_id for author_id, university_id in university_ids.items()
+                                      if university_id is not None}
+                if not PaperAuthor.update_university_ids(session, university_ids):
+                    break
+                scanned += len(rows)
+                linked += sum(1 for university_id in university_ids.values() if university_id is not None)
+                api_logger.info(f"作者关联大学进度: 已处理 {scanned} 位作者，关联 {linked} 位，当前作者ID {after_id}")
+            return scanned, linked
+        finally:
+            session.close()
+
     def get_authors_by_country(self, country):
         """根据国家获取作者"""
         session = self._get_session()
@@ -199,7 +359,7 @@ class DBManager:
         
         try:
             # 使用ChineseUniversity模型的静态方法获取所有大学
-            universities = ChineseUniversity.get_all(session, self.engine)
+            universities = ChineseUniversity.get_all(session)
             return [uni.to_dict() for uni in universities]
         finally:
             session.close()
@@ -604,9 +604,14 @@ def search_paper_authors(is_china=True, author_positions=None, has_email=False,
         
 
         
-        # 4. 所属机构
+        # 4. 所属机构：能识别为某所大学时按 university_id 等值查询（走索引，单位写法不同也能找到），
+        # 否则按单位模糊匹配。未关联 university_id 的历史记录需先运行 link_universities.py 回填
         if affiliation and affiliation.strip():
-            query = query.filter(PaperAuthor.affiliation.like(f'%{affiliation.strip()}%'))
+            university_id = db_manager.get_university_linker().link(affiliation.strip())
+            if university_id:
+                query = query.filter(PaperAuthor.university_id == university_id)
+            else:
+                query = query.filter(PaperAuthor.affiliation.like(f'%{affiliation.strip()}%'))
         
         # 5. 论文标题
         if paper_title and paper_title.strip():
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+把论文作者的单位关联到 chinese_universities
+回填 paper_authors.university_id，新入库的作者在保存时已自动关联
+"""
+
+import argparse
+import time
+from utils.logger_settings import api_logger
+from db_manager import DBManager
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="回填论文作者关联的大学ID")
+    parser.add_argument("--relink", action="store_true", help="重新关联所有作者（大学表或别名更新后使用），默认只处理尚未关联的作者")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每批处理的作者数")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db_manager = DBManager()
+    try:
+        scanned, linked = db_manager.link_author_universities(batch_size=args.batch_size, relink=args.relink)
+    finally:
+        db_manager.close()
+    api_logger.info(f"作者关联大学完成，处理 {scanned} 位作者，关联 {linked} 位，耗时 {time.perf_counter() - started:.1f} 秒")
+
+
+if __name__ == "__main__":
+    main()
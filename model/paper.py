@@ -1,18 +1,24 @@
 
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from sqlalchemy import Column, String, DateTime, Boolean, func, desc, Text
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, func, desc, or_, Text
 from sqlalchemy.orm import Session
 from model.database import Base
 import json
 from utils.logger_settings import api_logger
 from model.paperAuthor import PaperAuthor
 
+# 从元数据快照导入、尚未下载和分析的论文
+STATUS_PENDING = "pending"
+
 class Paper(Base):
     """论文模型类 - SQLAlchemy ORM"""
     __tablename__ = 'arxiv_papers'
     
+    # 不带版本号的论文ID，如 http://arxiv.org/abs/2401.12345
     paper_id = Column(String(255), primary_key=True)
+    version = Column(Integer, default=1, comment='已处理的arXiv版本号')
+    author_block_hash = Column(String(64), comment='第一页作者信息块的哈希，用于判断新版本作者是否变化')
     title = Column(String(500), nullable=False)
     chinese_title = Column(String(500))
     publish_date = Column(DateTime)
@@ -25,7 +31,12 @@ class Paper(Base):
     has_chinese_author = Column(Boolean, default=False)
     has_chinese_email = Column(Boolean, default=False)
     nsfc = Column(Boolean, default=False, comment='国家自然科学基金是否资助')
+    status = Column(String(20), default='done', comment='处理状态: done 已分析, skipped 预过滤跳过, pending 快照导入待处理')
+    skip_reason = Column(String(255), comment='跳过原因')
     processed_date = Column(DateTime, default=datetime.now)
+    # 论文摘要和 arXiv 上的作者姓名（JSON 数组），快照导入的待处理论文据此构建分析任务
+    summary = Column(Text)
+    author_names = Column(Text)
     
     authors:List[PaperAuthor] = []
     
@@ -43,9 +54,17 @@ class Paper(Base):
         has_chinese_author: bool = False,
         has_chinese_email: bool = False,
         nsfc: bool = False,
-        processed_date: Optional[datetime] = None
+        status: str = "done",
+        skip_reason: str = "",
+        processed_date: Optional[datetime] = None,
+        version: int = 1,
+        author_block_hash: str = None,
+        summary: str = None,
+        author_names: List[str] = None
     ):
         self.paper_id = paper_id
+        self.version = version
+        self.author_block_hash = author_block_hash
         self.title = title
         self.chinese_title = chinese_title
         
@@ -69,7 +88,11 @@ class Paper(Base):
         self.has_chinese_author = has_chinese_author
         self.has_chinese_email = has_chinese_email
         self.nsfc = nsfc
+        self.status = status
+        self.skip_reason = skip_reason
         self.processed_date = processed_date or datetime.now()
+        self.summary = summary
+        self.author_names = json.dumps(author_names) if author_names is not None else None
     
     def set_categories(self, categories_list: List[str]):
         """Convert categories list to JSON string for storage"""
@@ -84,6 +107,15 @@ class Paper(Base):
         except:
             return []
     
+    def get_author_names(self) -> List[str]:
+        """获取 arXiv 上的作者姓名列表"""
+        if not self.author_names:
+            return []
+        try:
+            return json.loads(self.author_names)
+        except:
+            return []
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Paper':
         """从字典创建论文对象"""
@@ -100,7 +132,11 @@ class Paper(Base):
             has_chinese_author=data.get("是否有中国作者", False) or data.get("has_chinese_author", False),
             has_chinese_email=data.get("是否有中国作者邮箱", False) or data.get("has_chinese_email", False),
             nsfc=data.get("国家自然科学基金(nsfc)是否资助", False) or data.get("nsfc", False),
-            processed_date=data.get("processed_date")
+            status=data.get("status", "done"),
+            skip_reason=data.get("skip_reason", ""),
+            processed_date=data.get("processed_date"),
+            version=data.get("version", 1),
+            author_block_hash=data.get("author_block_hash")
         )
         
         # 检查是否有中国作者和中国作者邮箱
@@ -133,13 +169,17 @@ class Paper(Base):
             "是否有中国作者": self.has_chinese_author,
             "是否有中国作者邮箱": self.has_chinese_email,
             "国家自然科学基金(nsfc)是否资助": self.nsfc,
-            "processed_date": self.processed_date
+            "status": self.status,
+            "skip_reason": self.skip_reason,
+            "processed_date": self.processed_date,
+            "version": self.version,
+            "author_block_hash": self.author_block_hash
         }
     
     # 数据库操作方法
     @staticmethod
-    def save(session: Session, paper: 'Paper') -> bool:
-        """将论文保存到数据库"""
+    def save(session: Session, paper: 'Paper', commit=True) -> bool:
+        """将论文保存到数据库，commit 为假时只 flush，由调用方在同一事务中提交"""
         try:
             # 检查是否已存在
             existing_paper = session.query(Paper).filter(Paper.paper_id == paper.paper_id).first()
@@ -157,12 +197,19 @@ class Paper(Base):
                 existing_paper.has_chinese_author = paper.has_chinese_author
                 existing_paper.has_chinese_email = paper.has_chinese_email
                 existing_paper.nsfc = paper.nsfc
+                existing_paper.status = paper.status
+                existing_paper.skip_reason = paper.skip_reason
+                existing_paper.version = paper.version
+                existing_paper.author_block_hash = paper.author_block_hash
                 existing_paper.processed_date = datetime.now()
             else:
                 # 添加新记录
                 session.add(paper)
             
-            session.commit()
+            if commit:
+                session.commit()
+            else:
+                session.flush()
             return True
             
         except Exception as e:
@@ -182,6 +229,69 @@ class Paper(Base):
             api_logger.error(f"获取论文失败: {e}")
             return None
     
+    @staticmethod
+    def not_pending():
+        """已处理（非快照导入待处理）论文的过滤条件"""
+        return or_(Paper.status.is_(None), Paper.status != STATUS_PENDING)
+
+    @staticmethod
+    def get_versions(session: Session, paper_ids: List[str]) -> Dict[str, int]:
+        """批量查询已处理论文的版本号，返回 {论文ID: 版本号}（只查主键和版本列）"""
+        if not paper_ids:
+            return {}
+        try:
+            rows = session.query(Paper.paper_id, Paper.version).filter(
+                Paper.paper_id.in_(list(paper_ids)), Paper.not_pending()).all()
+            return {row[0]: row[1] or 1 for row in rows}
+
+        except Exception as e:
+            api_logger.error(f"批量查询论文版本失败: {e}")
+            return {}
+
+    @staticmethod
+    def get_all_versions(session: Session) -> Dict[str, int]:
+        """获取所有已处理论文的版本号，返回 {论文ID: 版本号}"""
+        try:
+            rows = session.query(Paper.paper_id, Paper.version).filter(Paper.not_pending()).all()
+            return {row[0]: row[1] or 1 for row in rows}
+
+        except Exception as e:
+            api_logger.error(f"获取论文版本列表失败: {e}")
+            return {}
+
+    @staticmethod
+    def get_author_block_hash(session: Session, paper_id: str) -> Optional[str]:
+        """获取论文第一页作者信息块的哈希"""
+        try:
+            return session.query(Paper.author_block_hash).filter(Paper.paper_id == paper_id).scalar()
+
+        except Exception as e:
+            api_logger.error(f"获取作者信息哈希失败: {e}")
+            return None
+
+    @staticmethod
+    def update_version(session: Session, paper_id: str, version: int, pdf_link: str = None,
+                       web_link: str = None, author_block_hash: str = None) -> bool:
+        """作者信息没有变化的新版本：只更新版本号和链接，保留原有分析结果和作者"""
+        try:
+            paper = session.query(Paper).filter(Paper.paper_id == paper_id).first()
+            if not paper:
+                return False
+            paper.version = version
+            if pdf_link:
+                paper.pdf_link = pdf_link
+            if web_link:
+                paper.web_link = web_link
+            if author_block_hash:
+                paper.author_block_hash = author_block_hash
+            session.commit()
+            return True
+
+        except Exception as e:
+            api_logger.error(f"更新论文版本失败: {e}")
+            session.rollback()
+            return False
+
     @staticmethod
     def get_all(session: Session, limit=100, offset=0) -> List['Paper']:
         """获取所有论文"""
@@ -199,9 +309,68 @@ class Paper(Base):
         """获取最后发布日期"""
         try:
             # 使用SQLAlchemy的func.max获取最大日期
-            last_date = session.query(func.max(Paper.publish_date)).scalar()
+            last_date = session.query(func.max(Paper.publish_date)).filter(Paper.not_pending()).scalar()
             return last_date
             
         except Exception as e:
             api_logger.error(f"获取最后发布日期失败: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def insert_stubs(session: Session, stubs: List[Dict[str, Any]]) -> int:
+        """批量插入待处理论文，已存在的论文ID跳过，返回插入的数量"""
+        if not stubs:
+            return 0
+        try:
+            stub_ids = [stub["paper_id"] for stub in stubs]
+            existing = {row[0] for row in session.query(Paper.paper_id).filter(Paper.paper_id.in_(stub_ids)).all()}
+            rows = []
+            for stub in stubs:
+                if stub["paper_id"] in existing:
+                    continue
+                existing.add(stub["paper_id"])
+                rows.append({
+                    "paper_id": stub["paper_id"],
+                    "version": stub.get("version", 1),
+                    "title": stub["title"][:500],
+                    "publish_date": stub.get("publish_date"),
+                    "pdf_link": stub["pdf_link"],
+                    "web_link": stub["web_link"],
+                    "categories": json.dumps(stub.get("categories", [])),
+                    "summary": stub.get("summary"),
+                    "author_names": json.dumps(stub.get("authors", []), ensure_ascii=False),
+                    "status": STATUS_PENDING,
+                    "processed_date": datetime.now(),
+                })
+            if rows:
+                session.bulk_insert_mappings(Paper, rows)
+                session.commit()
+            return len(rows)
+
+        except Exception as e:
+            api_logger.error(f"批量插入待处理论文失败: {e}")
+            session.rollback()
+            return 0
+
+    @staticmethod
+    def get_pending(session: Session, limit=100, after_id: str = None) -> List['Paper']:
+        """按论文ID顺序获取待处理论文，after_id 为上一批最后一篇的ID"""
+        try:
+            query = session.query(Paper).filter(Paper.status == STATUS_PENDING)
+            if after_id:
+                query = query.filter(Paper.paper_id > after_id)
+            return query.order_by(Paper.paper_id).limit(limit).all()
+
+        except Exception as e:
+            api_logger.error(f"获取待处理论文失败: {e}")
+            return []
+
+    @staticmethod
+    def count_pending(session: Session) -> int:
+        """统计待处理论文数量"""
+        try:
+            return session.query(func.count(Paper.paper_id)).filter(Paper.status == STATUS_PENDING).scalar() or 0
+
+        except Exception as e:
+            api_logger.error(f"统计待处理论文失败: {e}")
+            return 0
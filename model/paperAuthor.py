@@ -16,6 +16,7 @@ class PaperAuthor(Base):
     affiliation = Column(String(500), comment='单位')
     email = Column(String(255))
     country = Column(String(255))
+    university_id = Column(Integer, index=True, comment='关联的 chinese_universities.id')
     nsfc = Column(Boolean, default=False, comment='国家自然科学基金是否资助')
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -30,6 +31,7 @@ class PaperAuthor(Base):
         nsfc: bool = False,
         email: str = "",
         country: str = "",
+        university_id: Optional[int] = None,
         id: Optional[int] = None,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None
@@ -42,6 +44,7 @@ class PaperAuthor(Base):
         self.nsfc = nsfc
         self.email = email
         self.country = country
+        self.university_id = university_id
         self.created_at = created_at or datetime.now()
         self.updated_at = updated_at or datetime.now()
     
@@ -57,6 +60,7 @@ class PaperAuthor(Base):
             nsfc = data.get("国家自然科学基金(nsfc)是否资助", False) or data.get("nsfc", False),
             email=data.get("邮箱", "") or data.get("email", ""),
             country=data.get("国家", "") or data.get("country", ""),
+            university_id=data.get("university_id"),
             created_at=data.get("created_at"),
             updated_at=data.get("updated_at")
         )
@@ -72,6 +76,7 @@ class PaperAuthor(Base):
             "国家自然科学基金(nsfc)是否资助": self.nsfc,
             "邮箱": self.email,
             "国家": self.country,
+            "university_id": self.university_id,
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
@@ -85,7 +90,8 @@ class PaperAuthor(Base):
             "affiliation": self.affiliation,
             "nsfc": self.nsfc,  # 确保这个字段被正确地转换为布尔值
             "email": self.email,
-            "country": self.country
+            "country": self.country,
+            "university_id": self.university_id
         }
         if self.id:
             result["id"] = self.id
@@ -93,8 +99,8 @@ class PaperAuthor(Base):
     
     # 数据库操作方法
     @staticmethod
-    def save(session: Session, author: 'PaperAuthor') -> bool:
-        """将作者信息保存到数据库"""
+    def save(session: Session, author: 'PaperAuthor', commit=True) -> bool:
+        """将作者信息保存到数据库，commit 为假时只 flush，由调用方在同一事务中提交"""
         try:
             # 检查是否已存在
             existing_author = session.query(PaperAuthor).filter(
@@ -109,12 +115,16 @@ class PaperAuthor(Base):
                 existing_author.nsfc = author.nsfc
                 existing_author.email = author.email
                 existing_author.country = author.country
+                existing_author.university_id = author.university_id
                 existing_author.updated_at = datetime.now()
             else:
                 # 添加新记录
                 session.add(author)
             
-            session.commit()
+            if commit:
+                session.commit()
+            else:
+                session.flush()
             return True
             
         except Exception as e:
@@ -175,11 +185,55 @@ class PaperAuthor(Base):
             return []
     
     @staticmethod
-    def save_multiple(session: Session, authors: List['PaperAuthor']) -> bool:
-        """批量保存多个作者信息"""
+    def get_affiliations(session: Session, after_id: int = 0, limit=1000, only_unlinked=True) -> List[tuple]:
+        """按ID顺序获取一批 (作者ID, 单位)，only_unlinked 为真时只返回尚未关联大学的作者"""
+        try:
+            query = session.query(PaperAuthor.id, PaperAuthor.affiliation).filter(PaperAuthor.id > after_id)
+            if only_unlinked:
+                query = query.filter(PaperAuthor.university_id.is_(None))
+            return query.order_by(PaperAuthor.id).limit(limit).all()
+
+        except Exception as e:
+            api_logger.error(f"获取作者单位失败: {e}")
+            return []
+
+    @staticmethod
+    def update_university_ids(session: Session, university_ids: Dict[int, Optional[int]]) -> bool:
+        """批量更新作者关联的大学，university_ids 为 {作者ID: 大学ID}"""
+        if not university_ids:
+            return True
+        try:
+            session.bulk_update_mappings(PaperAuthor, [
+                {"id": author_id, "university_id": university_id} for author_id, university_id in university_ids.items()
+            ])
+            session.commit()
+            return True
+
+        except Exception as e:
+            api_logger.error(f"批量更新作者关联大学失败: {e}")
+            session.rollback()
+            return False
+
+    @staticmethod
+    def delete_by_paper_id(session: Session, paper_id: str, commit=True) -> bool:
+        """删除论文的所有作者（论文新版本作者变化后重新保存前使用），commit 为假时由调用方提交"""
+        try:
+            session.query(PaperAuthor).filter(PaperAuthor.paper_id == paper_id).delete()
+            if commit:
+                session.commit()
+            return True
+
+        except Exception as e:
+            api_logger.error(f"删除论文作者失败: {e}")
+            session.rollback()
+            return False
+
+    @staticmethod
+    def save_multiple(session: Session, authors: List['PaperAuthor'], commit=True) -> bool:
+        """批量保存多个作者信息，commit 为假时由调用方提交"""
         try:
             for author in authors:
-                if not PaperAuthor.save(session, author):
+                if not PaperAuthor.save(session, author, commit=commit):
                     return False
             return True
         except Exception as e:
@@ -10,6 +10,7 @@ from model.universityCollege import UniversityCollege  # 添加导入
 from model.universityTeacher import UniversityTeacher  # 添加导入
 from utils.logger_settings import api_logger
 from db_manager import DBManager
+from utils.rateLimiter import get_rate_limiter
 
 
 # 新建个python文件，实现如下功能
@@ -185,7 +186,8 @@ def get_university_details_from_openai(university_name: str, is_985: bool, is_21
         }}
         """
         
-        response = openAiClient.chat.completions.create(
+        response = get_rate_limiter("llm").call(
+            openAiClient.chat.completions.create,
             model=os.getenv('OPENAI_API_MODEL'),
             messages=[
                 {"role": "system", "content": "你是一个专业的中国大学信息助手，请提供准确的大学信息。"},
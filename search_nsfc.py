@@ -3,27 +3,37 @@
 
 """
 定时搜索PDF文件中的NSFC字符
-每小时运行一次，检查cache/pdf目录下的新增PDF文件，判断是否包含NSFC字符
+每小时运行一次，检查PDF缓存中新增的PDF文件，判断是否包含NSFC字符
 """
 
 import os
+import re
 import sys
 import time
+import functools
 import datetime
-import PyPDF2
 import schedule
 from pathlib import Path
 from utils.logger_settings import api_logger
 from db_manager import DBManager
 from model.paper import Paper
 from model.paperAuthor import PaperAuthor
+from utils.pdfExtractPool import get_pdf_extract_pool
+from utils.pdfUtils import get_pdf_cache, _head_then_reverse_tail_indexes
 
 # 基础目录
 BASE_DIR = Path(__file__).parent
-PDF_DIR = BASE_DIR / "cache" / "pdf"
 NSFC_FILES_PATH = BASE_DIR / "nsfc_files_list.txt"
 LAST_RUN_TIME_FILE = BASE_DIR / "last_nsfc_run_time.txt"
 
+# 基金信息通常在第一页脚注或文末致谢中：先看第一页，再从最后一页往前逐页查找，找到NSFC后不再解析剩余的页
+NSFC_PAGE_ORDER = functools.partial(_head_then_reverse_tail_indexes, head_pages=1, tail_pages=None)
+
+
+def mentions_nsfc(index, text):
+    """逐页提取时的停止条件：页面中出现 NSFC（不区分大小写）"""
+    return "NSFC" in (text or "").upper()
+
 db_manager = DBManager()
 
 def get_last_run_time():
@@ -48,36 +58,34 @@ def save_last_run_time(run_time):
     except Exception as e:
         api_logger.error(f"保存运行时间出错: {str(e)}")
 
+def contains_nsfc_text(result):
+    """判断提取结果中是否包含NSFC字符（不区分大小写）"""
+    if result["error"]:
+        api_logger.error(f"处理PDF文件 {result['path']} 时出错: {result['error']}")
+        return False
+    return any(mentions_nsfc(index, text) for index, text in result["pages"])
+
 def search_nsfc_in_pdf(pdf_path):
     """在PDF文件中搜索NSFC字符"""
-    try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            
-            # 搜索NSFC字符（不区分大小写）
-            contains_nsfc = "NSFC" in text.upper()
-            return contains_nsfc
-    except Exception as e:
-        api_logger.error(f"处理PDF文件 {pdf_path} 时出错: {str(e)}")
-        return False
+    result = get_pdf_extract_pool().extract_until(pdf_path, NSFC_PAGE_ORDER, mentions_nsfc)
+    return contains_nsfc_text(result)
 
 def update_paper_nsfc_status(pdf_path, contains_nsfc):
     """更新论文和作者的NSFC状态"""
     if not contains_nsfc:
         return False
     
-    # 从PDF文件路径中提取文件名（不含后缀）
+    # 从PDF文件路径中提取文件名（不含后缀），如 2401_12345v2
     pdf_file = Path(pdf_path)
     file_name_without_ext = pdf_file.stem
+    # 数据库中的论文ID不带版本号，如 http://arxiv.org/abs/2401.12345
+    base_name = re.sub(r"v\d+$", "", file_name_without_ext)
     
     # 获取数据库会话
     session = db_manager._get_session()
     try:
-        # 搜索匹配的论文
-        search_pattern = f"%{file_name_without_ext}%"
+        # 搜索匹配的论文，文件名中的 _ 在 LIKE 中匹配原ID中的 . 或 /，只匹配ID结尾
+        search_pattern = f"%/{base_name}"
         papers = session.query(Paper).filter(Paper.paper_id.like(search_pattern)).all()
         
         if not papers:
@@ -120,35 +128,33 @@ def scan_new_files():
     # 获取上次运行时间
     last_run_time = get_last_run_time()
     
-    # 确保目录存在
-    if not PDF_DIR.exists():
-        api_logger.warning(f"PDF目录 {PDF_DIR} 不存在，将创建该目录")
-        PDF_DIR.mkdir(parents=True, exist_ok=True)
-    
-    # 获取所有PDF文件
-    pdf_files = list(PDF_DIR.glob("**/*.pdf"))
+    # 从PDF缓存索引中查询上次运行后写入的文件，不再遍历目录
+    pdf_cache = get_pdf_cache()
+    entries = pdf_cache.entries(since=last_run_time.timestamp() if last_run_time else None)
     
     # 如果是第一次运行，处理所有文件
     if last_run_time is None:
-        new_files = pdf_files
-        api_logger.info(f"首次运行，将处理所有 {len(new_files)} 个PDF文件")
+        api_logger.info(f"首次运行，将处理所有 {len(entries)} 个PDF文件")
     else:
-        # 只处理上次运行后创建的文件
-        new_files = []
-        for pdf_file in pdf_files:
-            # 获取文件创建时间
-            creation_time = datetime.datetime.fromtimestamp(pdf_file.stat().st_ctime)
-            # 如果文件创建时间晚于上次运行时间，则处理
-            if creation_time > last_run_time:
-                new_files.append(pdf_file)
-        
-        api_logger.info(f"发现 {len(new_files)} 个新增PDF文件（创建时间晚于 {last_run_time}）")
-    
-    # 处理新文件
+        api_logger.info(f"发现 {len(entries)} 个新增PDF文件（写入时间晚于 {last_run_time}）")
+    
+    # 进程池按在途任务数逐个取出 PDF 路径；已压缩的冷文件只解压到临时文件，处理完删除，缓存中仍保持压缩
+    cache_paths = {}
+    def iter_pdf_paths():
+        for entry in entries:
+            path = pdf_cache.get(entry["name"], decompress=False)
+            if path:
+                cache_paths[path] = Path(pdf_cache.directory) / f"{entry['name']}.pdf"
+                yield path
+    
+    # 处理新文件，在进程池中并行逐页提取文本，找到NSFC后停止
     nsfc_files = []
-    for pdf_file in new_files:
-        api_logger.info(f"处理文件: {pdf_file}")
-        contains_nsfc = search_nsfc_in_pdf(str(pdf_file))
+    for result in get_pdf_extract_pool().imap_until(iter_pdf_paths(), NSFC_PAGE_ORDER, mentions_nsfc):
+        pdf_cache.release(result["path"])
+        pdf_file = cache_paths.pop(result["path"], Path(result["path"]))
+        api_logger.info(f"处理文件: {pdf_file}，解析 {len(result['pages'])}/{result['page_count']} 页，"
+                        f"耗时 {result['elapsed']:.2f} 秒")
+        contains_nsfc = contains_nsfc_text(result)
         
         if contains_nsfc:
             nsfc_files.append(pdf_file)
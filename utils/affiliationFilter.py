@@ -0,0 +1,54 @@
+import re
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+
+# 中国机构邮箱域名
+CHINESE_EMAIL_DOMAIN_PATTERN = r"[A-Za-z0-9.\-]+\.(?:edu|ac)\.cn\b"
+
+# 常见的中国关键词和城市名
+CHINESE_KEYWORDS = [
+    "China", "P. R. China", "P.R. China", "PR China", "PRC", "Chinese Academy", "中国",
+    "Beijing", "Shanghai", "Shenzhen", "Guangzhou", "Hangzhou", "Nanjing", "Wuhan", "Chengdu",
+    "Xi'an", "Hefei", "Harbin", "Tianjin", "Changsha", "Xiamen", "Jinan", "Qingdao",
+    "Dalian", "Chongqing", "Suzhou", "Shenyang", "Changchun", "Lanzhou", "Kunming", "Fuzhou",
+    "Zhengzhou", "Nanchang", "Taiyuan", "Shijiazhuang", "Hohhot", "Urumqi", "Guiyang", "Nanning",
+    "Haikou", "Ningbo", "Wuxi", "Zhuhai", "Dongguan", "Hong Kong", "Macau",
+]
+
+
+class ChineseAffiliationFilter:
+    """判断论文文本中是否出现中国机构的预过滤器
+
+    把大学中英文名、城市名和 .edu.cn/.ac.cn 邮箱域名编译成一个正则，
+    一次扫描即可判断，不需要调用 LLM。
+    """
+
+    def __init__(self, universities=None, extra_keywords=None):
+        terms = set(CHINESE_KEYWORDS)
+        for university in universities or []:
+            for key in ("name_cn", "name_en", "city"):
+                value = (university.get(key) or "").strip()
+                if len(value) >= 2:
+                    terms.add(value)
+        terms.update(extra_keywords or [])
+
+        # 长词优先，避免短词先匹配
+        alternation = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+        self.pattern = re.compile(
+            rf"(?P<email>{CHINESE_EMAIL_DOMAIN_PATTERN})|(?<![A-Za-z])(?P<term>{alternation})(?![A-Za-z])",
+            re.IGNORECASE,
+        )
+        api_logger.info(f"中国机构预过滤器已加载 {len(terms)} 个关键词")
+
+    def match(self, text):
+        """返回 (是否匹配, 匹配到的关键词或原因)"""
+        if not text:
+            return False, "文本为空"
+        found = self.pattern.search(text)
+        if not found:
+            return False, "未匹配到中国机构、城市或邮箱域名"
+        if found.group("email"):
+            return True, f"邮箱域名: {found.group('email')}"
+        return True, f"关键词: {found.group('term')}"
@@ -0,0 +1,30 @@
+import re
+
+ARXIV_ABS_URL = "http://arxiv.org/abs/"
+
+# 新格式 2401.12345v2，旧格式 cs/0501001v1 或 math.GT/0309136v1
+ARXIV_ID_PATTERN = re.compile(
+    r"(?P<base>\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Za-z\-]+)?/\d{7})(?:v(?P<version>\d+))?$"
+)
+
+
+def split_arxiv_id(paper_id):
+    """把带版本的论文ID拆分为 (不带版本的论文ID, 版本号)
+
+    论文ID统一为 http://arxiv.org/abs/<基础ID>，如
+    http://arxiv.org/abs/2401.12345v2 -> ("http://arxiv.org/abs/2401.12345", 2)。
+    没有版本号时版本为 1；无法识别的ID原样返回。
+    """
+    if not paper_id:
+        return paper_id, 1
+    tail = paper_id.rstrip("/")
+    for marker in ("/abs/", "/pdf/"):
+        if marker in tail:
+            tail = tail.split(marker, 1)[1]
+            break
+    if tail.endswith(".pdf"):
+        tail = tail[:-4]
+    found = ARXIV_ID_PATTERN.search(tail)
+    if not found or found.start() != 0:
+        return paper_id, 1
+    return f"{ARXIV_ABS_URL}{found.group('base')}", int(found.group("version") or 1)
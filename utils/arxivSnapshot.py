@@ -0,0 +1,102 @@
+import os
+import re
+import gzip
+import json
+from email.utils import parsedate_to_datetime
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.arxivId import ARXIV_ABS_URL
+
+# PDF 下载地址前缀，可通过 ARXIV_PDF_URL 指向本地模拟服务器
+ARXIV_PDF_URL = os.getenv("ARXIV_PDF_URL", "http://arxiv.org/pdf/")
+
+
+def _open_snapshot(path):
+    """打开元数据快照文件，支持 gzip 压缩"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _author_names(record):
+    """从 authors_parsed（[姓, 名, 后缀]）拼出作者姓名，没有时拆分 authors 字符串"""
+    names = []
+    for parts in record.get("authors_parsed") or []:
+        last, first, suffix = (list(parts) + ["", "", ""])[:3]
+        name = " ".join(part.strip() for part in (first, last, suffix) if part and part.strip())
+        if name:
+            names.append(name)
+    if not names and record.get("authors"):
+        names = [name.strip() for name in re.split(r",\s*|\s+and\s+", record["authors"]) if name.strip()]
+    return names
+
+
+def snapshot_record_to_stub(record, category_prefix="cs."):
+    """把快照中的一条记录转换为待处理论文的字段，不属于指定分类时返回 None"""
+    categories = [category for category in (record.get("categories") or "").split() if category.startswith(category_prefix)]
+    if not categories or not record.get("id"):
+        return None
+
+    versions = record.get("versions") or []
+    version = 1
+    if versions:
+        found = re.match(r"v(\d+)$", versions[-1].get("version", ""))
+        version = int(found.group(1)) if found else len(versions)
+    # 第一个版本的提交时间即 arXiv 的 submittedDate
+    submitted = None
+    if versions and versions[0].get("created"):
+        try:
+            submitted = parsedate_to_datetime(versions[0]["created"]).date()
+        except (TypeError, ValueError):
+            submitted = None
+
+    arxiv_id = record["id"].strip()
+    return {
+        "paper_id": f"{ARXIV_ABS_URL}{arxiv_id}",
+        "version": version,
+        "title": re.sub(r"\s+", " ", record.get("title") or "").strip(),
+        "authors": _author_names(record),
+        "categories": categories,
+        "pdf_link": f"{ARXIV_PDF_URL}{arxiv_id}v{version}",
+        "web_link": f"{ARXIV_ABS_URL}{arxiv_id}v{version}",
+        "summary": (record.get("abstract") or "").strip(),
+        "submitted": submitted,
+    }
+
+
+def iter_snapshot_stubs(path, from_date=None, until_date=None, category_prefix="cs."):
+    """逐行读取 arXiv 元数据快照（JSON lines），返回指定分类和提交日期范围内的论文
+
+    内存占用与文件大小无关。不含分类前缀的行先用字符串判断跳过，不做 JSON 解析。
+    from_date / until_date 为 date，按第一个版本的提交日期过滤（含两端）。
+    """
+    marker = f'"{category_prefix}'
+    inner_marker = f" {category_prefix}"
+    total = 0
+    matched = 0
+    with _open_snapshot(path) as f:
+        for line in f:
+            total += 1
+            if total % 100000 == 0:
+                api_logger.info(f"快照已读取 {total} 行，符合条件 {matched} 篇")
+            # categories 形如 "cs.AI cs.LG"，分类前缀只可能出现在开头或空格之后
+            if marker not in line and inner_marker not in line:
+                continue
+            try:
+                stub = snapshot_record_to_stub(json.loads(line), category_prefix)
+            except json.JSONDecodeError as e:
+                api_logger.info(f"快照第 {total} 行解析失败: {e}")
+                continue
+            if not stub:
+                continue
+            submitted = stub["submitted"]
+            if (from_date or until_date) and submitted is None:
+                continue
+            if from_date and submitted < from_date:
+                continue
+            if until_date and submitted > until_date:
+                continue
+            matched += 1
+            yield stub
+    api_logger.info(f"快照读取完成，共 {total} 行，符合条件 {matched} 篇")
@@ -0,0 +1,97 @@
+import re
+import xml.etree.ElementTree as ET
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+OPENSEARCH_NS = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+
+def _clean(text):
+    """合并空白"""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class AtomEntry:
+    """arXiv Atom 条目，只保留爬虫用到的字段"""
+
+    __slots__ = ("id", "title", "authors", "tags", "pdf_link", "web_link", "summary", "published")
+
+    def __init__(self, id="", title="", authors=None, tags=None, pdf_link="", web_link="", summary="", published=""):
+        self.id = id
+        self.title = title
+        self.authors = authors or []
+        self.tags = tags or []
+        self.pdf_link = pdf_link
+        self.web_link = web_link
+        self.summary = summary
+        self.published = published
+
+
+class AtomStreamParser:
+    """arXiv API Atom 响应的增量解析器
+
+    每次 feed() 传入一段字节，返回这段数据中已经解析完整的条目，
+    不必等整页下载完成。已解析的条目会从树中移除，内存占用与页面大小无关。
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self.total_results = None
+
+    def _parse_entry(self, elem):
+        """把 <entry> 节点转换为 AtomEntry"""
+        entry = AtomEntry(
+            id=(elem.findtext(f"{ATOM_NS}id") or "").strip(),
+            title=_clean(elem.findtext(f"{ATOM_NS}title")),
+            summary=(elem.findtext(f"{ATOM_NS}summary") or "").strip(),
+            published=(elem.findtext(f"{ATOM_NS}published") or "").strip(),
+        )
+        for author in elem.findall(f"{ATOM_NS}author"):
+            name = _clean(author.findtext(f"{ATOM_NS}name"))
+            if name:
+                entry.authors.append(name)
+        for category in elem.findall(f"{ATOM_NS}category"):
+            if category.get("term"):
+                entry.tags.append(category.get("term"))
+        for link in elem.findall(f"{ATOM_NS}link"):
+            if link.get("title") == "pdf":
+                entry.pdf_link = link.get("href", "")
+            elif link.get("rel") == "alternate" and link.get("type") == "text/html":
+                entry.web_link = link.get("href", "")
+        return entry
+
+    def _drain(self):
+        """处理解析器中已完成的事件"""
+        entries = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            if elem.tag == f"{ATOM_NS}entry":
+                entries.append(self._parse_entry(elem))
+                # 条目已转换完毕，从树中移除以释放内存
+                if self._root is not None and elem in self._root:
+                    self._root.remove(elem)
+            elif elem.tag == f"{OPENSEARCH_NS}totalResults" and elem.text:
+                self.total_results = int(elem.text.strip())
+        return entries
+
+    def feed(self, data):
+        """传入一段响应数据，返回已解析完成的条目"""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self):
+        """数据结束，返回剩余的条目"""
+        self._parser.close()
+        return self._drain()
+
+
+def iter_atom_entries(chunks, parser=None):
+    """从字节块迭代器（如 response.iter_content()）中逐条返回 AtomEntry"""
+    parser = parser or AtomStreamParser()
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,309 @@
+import re
+import os
+import unicodedata
+from urllib.parse import urlparse
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.promptBuilder import find_author_block, find_acknowledgement
+from utils.categoryFanout import CS_CATEGORY_NAMES
+
+_EMAIL_LOCAL = r"[A-Za-z0-9][A-Za-z0-9._%+\-]*"
+_EMAIL_DOMAIN = r"[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)*\.[A-Za-z]{2,24}"
+# 分组写法：{zhang, li}@tsinghua.edu.cn、(zhang|li)@pku.edu.cn
+GROUP_EMAIL_PATTERN = re.compile(
+    rf"[{{(\[]\s*({_EMAIL_LOCAL}(?:\s*[,;|]\s*{_EMAIL_LOCAL})+)\s*[}})\]]\s*@\s*({_EMAIL_DOMAIN})"
+)
+EMAIL_PATTERN = re.compile(rf"({_EMAIL_LOCAL})\s?@\s?({_EMAIL_DOMAIN})")
+
+# 作者名后和单位行首的上标标记：数字或常见符号
+MARKER_SYMBOLS = "*∗†‡§¶♯#⋆"
+_MARKER = rf"(?:\d{{1,2}}|[{re.escape(MARKER_SYMBOLS)}])"
+AUTHOR_MARKERS_PATTERN = re.compile(rf"(?:[ \t]*{_MARKER}[ \t]*,?)+")
+MARKED_LINE_PATTERN = re.compile(rf"^\s*({_MARKER})[ \t]*(\S.*)$")
+# 单位行：不含邮箱关键字，只看机构名称
+INSTITUTION_PATTERN = re.compile(
+    r"universit|institute|laborator|\blab\b|college|school of|department|academy|\bresearch\b|\bcent(?:er|re)\b"
+    r"|\binc\b|\bcorp|company|大学|研究院|研究所|实验室|公司",
+    re.IGNORECASE,
+)
+CORRESPONDING_PATTERN = re.compile(r"correspond|通讯作者", re.IGNORECASE)
+NSFC_PATTERN = re.compile(r"National\s+Natural\s+Science\s+Foundation\s+of\s+China|\bNSFC\b|国家自然科学基金",
+                          re.IGNORECASE)
+
+# 单位中的国家名称，未列出的国家交给 LLM 判断
+COUNTRY_NAMES = {
+    "USA": "美国", "U.S.A": "美国", "United States": "美国", "UK": "英国", "United Kingdom": "英国",
+    "Germany": "德国", "France": "法国", "Japan": "日本", "Korea": "韩国", "Singapore": "新加坡",
+    "Canada": "加拿大", "Australia": "澳大利亚", "Switzerland": "瑞士", "Netherlands": "荷兰",
+    "Italy": "意大利", "Spain": "西班牙", "India": "印度", "Israel": "以色列", "Sweden": "瑞典",
+    "Denmark": "丹麦", "Finland": "芬兰", "Norway": "挪威", "Belgium": "比利时", "Austria": "奥地利",
+}
+# 邮箱顶级域名对应的国家
+EMAIL_TLD_COUNTRIES = {
+    "cn": "中国", "edu": "美国", "us": "美国", "uk": "英国", "de": "德国", "fr": "法国", "jp": "日本",
+    "kr": "韩国", "sg": "新加坡", "ca": "加拿大", "au": "澳大利亚", "ch": "瑞士", "nl": "荷兰",
+    "it": "意大利", "es": "西班牙", "il": "以色列", "se": "瑞典", "dk": "丹麦", "fi": "芬兰",
+}
+_COUNTRY_PATTERN = re.compile(
+    r"(?<![A-Za-z])(" + "|".join(re.escape(name) for name in sorted(COUNTRY_NAMES, key=len, reverse=True)) + r")(?![A-Za-z])"
+)
+
+
+def extract_emails(text):
+    """提取文本中的邮箱（小写，按出现顺序去重），展开 {a,b}@domain 这类分组写法
+
+    返回 [(邮箱, 分组编号)]，同一个分组展开的邮箱分组编号相同，单独的邮箱为 None。
+    """
+    emails = []
+    seen = set()
+
+    def add(email, group):
+        if email not in seen:
+            seen.add(email)
+            emails.append((email, group))
+
+    masked = text or ""
+    for group, found in enumerate(GROUP_EMAIL_PATTERN.finditer(masked)):
+        domain = found.group(2).lower()
+        for local in re.split(r"\s*[,;|]\s*", found.group(1)):
+            add(f"{local.lower()}@{domain}", group)
+    # 分组写法已经处理过，替换成空白后再找单独的邮箱
+    masked = GROUP_EMAIL_PATTERN.sub(lambda found: " " * len(found.group(0)), masked)
+    for found in EMAIL_PATTERN.finditer(masked):
+        add(f"{found.group(1).lower()}@{found.group(2).lower()}", None)
+    return emails
+
+
+def _name_tokens(name):
+    """姓名转为小写 ASCII 单词列表（去掉重音符号）"""
+    ascii_name = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii")
+    return re.findall(r"[a-z]+", ascii_name.lower())
+
+
+def _email_score(local, tokens):
+    """邮箱用户名与作者姓名的匹配程度：3 完全对应，2 含姓和名的首字母，1 只含姓或名，0 不匹配"""
+    local = re.sub(r"[^a-z]", "", local.lower())
+    if not local or not tokens:
+        return 0
+    first, last = tokens[0], tokens[-1]
+    exact = {"".join(tokens), "".join(reversed(tokens)), first[0] + last, last + first[0], last + first,
+             "".join(token[0] for token in tokens[:-1]) + last}
+    if local in exact:
+        return 3
+    if len(tokens) > 1:
+        for family, given in ((last, first), (first, last)):
+            if len(family) >= 2 and family in local and given[0] in local.replace(family, "", 1):
+                return 2
+    if any(len(token) >= 3 and token in local for token in tokens):
+        return 1
+    return 0
+
+
+def match_emails_to_authors(emails, author_names):
+    """按用户名和姓名的相似度把邮箱分配给作者，返回 {作者下标: 邮箱}
+
+    每个邮箱只分配给得分最高且唯一的作者；都没匹配上、邮箱来自同一个分组且数量与作者相同时按顺序分配。
+    """
+    tokens = [_name_tokens(name) for name in author_names]
+    candidates = []
+    for email_index, (email, _) in enumerate(emails):
+        local = email.split("@", 1)[0]
+        scores = [_email_score(local, author_tokens) for author_tokens in tokens]
+        best = max(scores, default=0)
+        # 同一邮箱对多位作者得分相同（如同姓）时无法判断，不分配
+        if best > 0 and scores.count(best) == 1:
+            candidates.append((best, email_index, scores.index(best)))
+
+    assigned = {}
+    used_emails = set()
+    for _, email_index, author_index in sorted(candidates, key=lambda item: -item[0]):
+        if author_index in assigned or email_index in used_emails:
+            continue
+        assigned[author_index] = emails[email_index][0]
+        used_emails.add(email_index)
+
+    groups = {group for _, group in emails}
+    if not assigned and len(emails) == len(author_names) and len(groups) == 1 and None not in groups:
+        assigned = {index: email for index, (email, _) in enumerate(emails)}
+    return assigned
+
+
+def _clean_affiliation(text):
+    """去掉单位文本中的邮箱、标记和多余标点"""
+    text = GROUP_EMAIL_PATTERN.sub(" ", text)
+    text = EMAIL_PATTERN.sub(" ", text)
+    text = re.sub(r"\b(?:e-?mail|emails)\s*:?", " ", text, flags=re.IGNORECASE)
+    text = re.sub(r"\s+", " ", text).strip(" ,;.")
+    return text[:500]
+
+
+def _name_pattern(name):
+    """姓名在 PDF 文本中的正则：单词之间允许任意空白（提取时可能丢失空格），忽略大小写"""
+    parts = [re.escape(part) for part in re.findall(r"[^\s.\-]+", name or "")]
+    if not parts:
+        return None
+    return re.compile(r"(?<![A-Za-z])" + r"[\s.\-]*".join(parts) + r"(?![A-Za-z])", re.IGNORECASE)
+
+
+def _normalize_text(text):
+    return re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).strip()
+
+
+class AuthorExtractor:
+    """不调用 LLM，直接从第一页文本中提取作者的邮箱、单位、国家和位置
+
+    邮箱按姓名分配给作者，单位通过作者名后的上标标记对应到标记开头的单位行，
+    没有标记时取作者名之后的第一行单位。单位和邮箱域名关联到 chinese_universities，
+    关联上的使用大学中文名。每位作者都有单位和国家时结果是可信的（confident），
+    可以不再让 LLM 提取作者信息。
+    """
+
+    def __init__(self, universities=None, linker=None, chinese_filter=None):
+        self.linker = linker
+        self.chinese_filter = chinese_filter
+        # 大学官网域名（去掉 www.）到大学ID，用于关联邮箱域名
+        self.domains = {}
+        for university in universities or []:
+            host = urlparse(university.get("website") or "").hostname or ""
+            host = host[4:] if host.startswith("www.") else host
+            if university.get("id") and host.count(".") >= 1:
+                self.domains[host] = university["id"]
+        api_logger.info(f"作者信息提取器已加载 {len(self.domains)} 个大学邮箱域名")
+
+    def university_by_domain(self, domain):
+        """按邮箱域名及其上级域名查找大学ID（如 mails.tsinghua.edu.cn -> tsinghua.edu.cn）"""
+        labels = (domain or "").lower().split(".")
+        for i in range(len(labels) - 1):
+            university_id = self.domains.get(".".join(labels[i:]))
+            if university_id:
+                return university_id
+        return None
+
+    def _country(self, affiliation, email, university_id):
+        """判断作者国家：关联到中国大学或匹配到中国关键词为中国，其次看单位中的国家名和邮箱顶级域名"""
+        if university_id:
+            return "中国"
+        if affiliation and self.chinese_filter and self.chinese_filter.match(affiliation)[0]:
+            return "中国"
+        found = _COUNTRY_PATTERN.search(affiliation or "")
+        if found:
+            return COUNTRY_NAMES[found.group(1)]
+        if email:
+            return EMAIL_TLD_COUNTRIES.get(email.rsplit(".", 1)[-1], "")
+        return ""
+
+    def _parse_header(self, header, title):
+        """解析作者信息块，返回 (标记到单位的映射, [(位置, 无标记的单位)], 通讯作者标记集合)"""
+        marked = {}
+        unmarked = []
+        corresponding_markers = set()
+        normalized_title = _normalize_text(title)
+        offset = 0
+        for line in header.splitlines(keepends=True):
+            position = offset
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            normalized_line = _normalize_text(line)
+            # 标题中包含 University 之类的单词时不当作单位
+            if normalized_title and len(normalized_line) > 10 and normalized_line in normalized_title:
+                continue
+            found = MARKED_LINE_PATTERN.match(line)
+            if found and CORRESPONDING_PATTERN.search(found.group(2)):
+                corresponding_markers.add(found.group(1))
+                continue
+            if found and INSTITUTION_PATTERN.search(found.group(2)):
+                marked.setdefault(found.group(1), _clean_affiliation(found.group(2)))
+            elif INSTITUTION_PATTERN.search(line):
+                affiliation = _clean_affiliation(line)
+                if affiliation:
+                    unmarked.append((position, affiliation))
+        return marked, unmarked, corresponding_markers
+
+    def extract(self, pages, author_names, title=""):
+        """从页面文本 [(页码, 文本)] 中提取作者信息
+
+        返回 {"authors": [作者信息], "emails": [邮箱], "nsfc": 是否有基金资助, "confident": 是否可信,
+        "missing": [缺少单位或国家的作者]}，作者信息字段与 LLM 返回的 作者信息 相同，另带 university_id。
+        """
+        first_page = next((text for index, text in pages if index == 0), "")
+        other_pages = "\n".join(text for index, text in pages if index != 0)
+        header = find_author_block(first_page)
+
+        emails = extract_emails(header)
+        email_by_author = match_emails_to_authors(emails, author_names)
+        marked, unmarked, corresponding_markers = self._parse_header(header, title)
+
+        authors = []
+        missing = []
+        for index, name in enumerate(author_names):
+            pattern = _name_pattern(name)
+            found = pattern.search(header) if pattern else None
+            affiliation = ""
+            corresponding = False
+            if found:
+                markers_found = AUTHOR_MARKERS_PATTERN.match(header, found.end())
+                markers = re.findall(_MARKER, markers_found.group(0)) if markers_found else []
+                affiliations = [marked[marker] for marker in markers if marker in marked]
+                corresponding = any(marker in corresponding_markers for marker in markers)
+                if affiliations:
+                    affiliation = "; ".join(dict.fromkeys(affiliations))
+                elif not marked:
+                    affiliation = next((text for position, text in unmarked if position >= found.end()), "")
+
+            email = email_by_author.get(index, "")
+            university_id = self.linker.link(affiliation) if self.linker and affiliation else None
+            if university_id is None and email:
+                university_id = self.university_by_domain(email.split("@", 1)[1])
+            if university_id and self.linker:
+                # 关联上的中国大学使用中文名，与 LLM 的输出一致
+                affiliation = self.linker.names.get(university_id) or affiliation
+            country = self._country(affiliation, email, university_id)
+
+            positions = ["第一作者" if index == 0 else "第二作者" if index == 1 else "其他作者"]
+            if corresponding:
+                positions.append("通讯作者")
+            authors.append({
+                "姓名": name,
+                "位置": ", ".join(positions),
+                "单位": affiliation,
+                "邮箱": email,
+                "国家": country,
+                "university_id": university_id,
+            })
+            if not affiliation or not country:
+                missing.append(name)
+
+        acknowledgement = find_acknowledgement(other_pages) or find_acknowledgement(first_page)
+        return {
+            "authors": authors,
+            "emails": [email for email, _ in emails],
+            "nsfc": bool(NSFC_PATTERN.search(f"{header}\n{acknowledgement}")),
+            "confident": bool(authors) and not missing,
+            "missing": missing,
+        }
+
+
+def research_direction(categories):
+    """由 arXiv 分类得到研究方向的中文描述"""
+    names = [CS_CATEGORY_NAMES[category] for category in categories or [] if category in CS_CATEGORY_NAMES]
+    return "、".join(dict.fromkeys(names))
+
+
+def merge_extracted_authors(llm_authors, extraction):
+    """用提取结果补全 LLM 返回的作者信息中缺少的邮箱、单位和国家"""
+    extracted = {"".join(_name_tokens(author["姓名"])): author for author in extraction.get("authors", [])}
+    for author in llm_authors or []:
+        if not isinstance(author, dict):
+            continue
+        found = extracted.get("".join(_name_tokens(author.get("姓名", ""))))
+        if not found:
+            continue
+        for key in ("邮箱", "单位", "国家"):
+            if not author.get(key) and found.get(key):
+                author[key] = found[key]
+        if author.get("university_id") is None and found.get("university_id") and author.get("单位") == found.get("单位"):
+            author["university_id"] = found["university_id"]
+    return llm_authors
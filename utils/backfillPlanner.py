@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, time as dt_time
+
+
+def plan_date_shards(start_date, end_date, shard_days=1):
+    """把日期范围拆分为若干分片，返回 [(开始时间, 结束时间)]，最近的分片在前"""
+    shard_days = max(1, int(shard_days))
+    shards = []
+    shard_end = end_date
+    while shard_end >= start_date:
+        shard_start = max(start_date, shard_end - timedelta(days=shard_days - 1))
+        shards.append((
+            datetime.combine(shard_start, dt_time.min),
+            datetime.combine(shard_end, dt_time(23, 59, 59)),
+        ))
+        shard_end = shard_start - timedelta(days=1)
+    return shards
+
+
+def split_shard(shard, min_span=timedelta(hours=1)):
+    """把一个分片从中间拆成两半，时间跨度已不足 min_span 时返回原分片"""
+    start, end = shard
+    if end - start <= min_span:
+        return [shard]
+    middle = start + (end - start) / 2
+    middle = middle.replace(microsecond=0)
+    return [(middle + timedelta(seconds=1), end), (start, middle)]
+
+
+def submitted_datetime_range(start, end):
+    """构建精确到秒的 arXiv submittedDate 查询"""
+    return f"submittedDate:[{start.strftime('%Y%m%d%H%M%S')}+TO+{end.strftime('%Y%m%d%H%M%S')}]"
@@ -0,0 +1,156 @@
+import os
+import time
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+
+# arXiv 计算机科学的全部子分类及中文名称
+CS_CATEGORY_NAMES = {
+    "cs.AI": "人工智能", "cs.AR": "硬件体系结构", "cs.CC": "计算复杂性", "cs.CE": "计算工程、金融与科学",
+    "cs.CG": "计算几何", "cs.CL": "计算与语言", "cs.CR": "密码学与安全", "cs.CV": "计算机视觉与模式识别",
+    "cs.CY": "计算机与社会", "cs.DB": "数据库", "cs.DC": "分布式、并行与集群计算", "cs.DL": "数字图书馆",
+    "cs.DM": "离散数学", "cs.DS": "数据结构与算法", "cs.ET": "新兴技术", "cs.FL": "形式语言与自动机理论",
+    "cs.GL": "一般文献", "cs.GR": "图形学", "cs.GT": "计算机科学与博弈论", "cs.HC": "人机交互",
+    "cs.IR": "信息检索", "cs.IT": "信息论", "cs.LG": "机器学习", "cs.LO": "计算机科学中的逻辑",
+    "cs.MA": "多智能体系统", "cs.MM": "多媒体", "cs.MS": "数学软件", "cs.NA": "数值分析",
+    "cs.NE": "神经与演化计算", "cs.NI": "网络与互联网体系结构", "cs.OH": "其他计算机科学", "cs.OS": "操作系统",
+    "cs.PF": "性能", "cs.PL": "编程语言", "cs.RO": "机器人学", "cs.SC": "符号计算",
+    "cs.SD": "声音", "cs.SE": "软件工程", "cs.SI": "社会与信息网络", "cs.SY": "系统与控制",
+}
+CS_CATEGORIES = tuple(CS_CATEGORY_NAMES)
+
+_EXHAUSTED = object()
+
+
+def parse_categories(value):
+    """解析逗号分隔的分类列表，为空时返回全部 cs 子分类"""
+    categories = [category.strip() for category in (value or "").split(",") if category.strip()]
+    return tuple(categories) or CS_CATEGORIES
+
+
+def _parse_published(published):
+    """解析 Atom 的 published（如 2024-01-01T00:00:00Z），无法解析返回 None"""
+    try:
+        return datetime.fromisoformat(published.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+
+class CategoryLag:
+    """按分类统计处理滞后：当前时间减去最早的未处理论文的提交时间
+
+    未处理论文包括已入队但未完成（完成、跳过、失败都算处理过）的论文；分类没有取完时，
+    最后取到的一批中最早的提交时间也计入，代表还没交给处理流程的论文。
+    没有未处理论文时滞后为 0。可在多个线程中同时调用。
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._boundary = {}
+        self._lock = threading.Lock()
+
+    def queued(self, category, paper_id, published):
+        """论文进入处理流程"""
+        published = _parse_published(published)
+        if published:
+            with self._lock:
+                self._pending.setdefault(category, {})[paper_id] = published
+
+    def finished(self, category, paper_id):
+        """论文处理结束"""
+        with self._lock:
+            self._pending.get(category, {}).pop(paper_id, None)
+
+    def fetched(self, category, published_list):
+        """记录分类最后取到的一批论文中最早的提交时间"""
+        dates = [date for date in map(_parse_published, published_list) if date]
+        if dates:
+            with self._lock:
+                self._boundary[category] = min(dates)
+
+    def lag_seconds(self, category, drained=True, now=None):
+        """分类的滞后秒数，drained 表示该分类已取完并全部交给处理流程"""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            dates = list(self._pending.get(category, {}).values())
+            if not drained and category in self._boundary:
+                dates.append(self._boundary[category])
+        return max(0, round((now - min(dates)).total_seconds())) if dates else 0
+
+
+class CategoryFanout:
+    """把多个分类各自的分页迭代器合并成一个任务批次流
+
+    每个分类同一时间只有一个在途的取页请求，取完的批次被消费后才会提交下一页，
+    提交按先进先出排队，因此论文多的分类不会挤占论文少的分类，各分类轮流前进；
+    最多 workers 个分类同时取页。同时出现在多个分类中的论文只返回第一次。
+    metrics 不为空时按分类记录 fetched、duplicates 和 drained_after（取完所有页用时，秒）。
+    """
+
+    def __init__(self, sources, workers=4, key_func=None, metrics=None):
+        self.sources = dict(sources)
+        self.workers = max(1, workers)
+        self.key_func = key_func or (lambda task: task["paper_id"])
+        self.metrics = metrics
+        self._seen = set()
+
+    def _next_batch(self, name):
+        """在线程池中读取某个分类的下一批任务"""
+        return next(self.sources[name], _EXHAUSTED)
+
+    def _dedupe(self, name, batch):
+        """去掉本次运行中已经从其他分类得到的论文"""
+        unique = []
+        for task in batch:
+            key = self.key_func(task)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            unique.append(task)
+        if self.metrics:
+            self.metrics.incr("fetched", len(batch), group=name)
+            self.metrics.incr("duplicates", len(batch) - len(unique), group=name)
+        return unique
+
+    def __iter__(self):
+        """按分类轮流返回去重后的任务批次"""
+        if not self.sources:
+            return
+        started = time.perf_counter()
+        pending = {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(self.sources))) as executor:
+            def submit(name):
+                pending[executor.submit(self._next_batch, name)] = name
+
+            for name in self.sources:
+                submit(name)
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = pending.pop(future)
+                        try:
+                            batch = future.result()
+                        except Exception as e:
+                            api_logger.info(f"分类 {name} 查询出错，停止该分类: {e}")
+                            continue
+                        if batch is _EXHAUSTED:
+                            if self.metrics:
+                                self.metrics.set_value("drained_after", round(time.perf_counter() - started, 3), group=name)
+                            continue
+                        unique = self._dedupe(name, batch)
+                        if unique:
+                            yield unique
+                        submit(name)
+            finally:
+                # 提前结束时先等在途的取页完成，再关闭各分类的迭代器
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                for source in self.sources.values():
+                    close = getattr(source, "close", None)
+                    if close:
+                        close()
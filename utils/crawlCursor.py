@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.pdfUtils import CACHE_DIR
+
+CURSOR_DIR = os.path.join(CACHE_DIR, "cursor")
+
+# 论文处理状态
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+STATUS_EXPORTED = "exported"
+
+# 只保存论文元数据，不保存 PDF 文件和文本
+TASK_FIELDS = ("paper_id", "version", "known_version", "title", "authors", "categories", "pdf_link", "web_link", "summary",
+               "published")
+
+
+class CrawlCursor:
+    """按查询和日期窗口持久化的爬取游标
+
+    记录下一页的 start 位置、最后看到的条目和每篇论文的状态。
+    pending 和 failed 的论文保存了元数据，重启后进入重试队列，不会丢失。
+    """
+
+    MAX_ATTEMPTS = 3
+    SAVE_INTERVAL = 5
+
+    def __init__(self, query, date_range, cursor_dir=None):
+        self.query = query
+        self.date_range = date_range
+        self.key = hashlib.sha1(f"{query}|{date_range}".encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(cursor_dir or CURSOR_DIR, f"{self.key}.json")
+
+        self.start_index = 0
+        self.last_entry_id = None
+        self.finished = False
+        self.papers = {}
+        self.tasks = {}
+        self.attempts = {}
+        self.updated_at = None
+
+        self._lock = threading.Lock()
+        self._last_save = 0
+        self._load()
+
+    @classmethod
+    def list_for_query(cls, query, cursor_dir=None):
+        """列出某个查询（或一组查询）的所有游标，最近更新的在前"""
+        queries = {query} if isinstance(query, str) else set(query)
+        cursor_dir = cursor_dir or CURSOR_DIR
+        cursors = []
+        if not os.path.exists(cursor_dir):
+            return cursors
+        for name in os.listdir(cursor_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(cursor_dir, name), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("query") in queries:
+                    cursors.append(cls(data["query"], data["date_range"], cursor_dir))
+            except Exception as e:
+                api_logger.info(f"读取游标 {name} 失败: {e}")
+        cursors.sort(key=lambda cursor: cursor.updated_at or "", reverse=True)
+        return cursors
+
+    def _load(self):
+        """从文件加载游标状态"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.start_index = data.get("start_index", 0)
+            self.last_entry_id = data.get("last_entry_id")
+            self.finished = data.get("finished", False)
+            self.papers = data.get("papers", {})
+            self.tasks = data.get("tasks", {})
+            self.attempts = data.get("attempts", {})
+            self.updated_at = data.get("updated_at")
+            api_logger.info(f"加载游标 {self.key}: start={self.start_index}, 状态统计 {self.summary()}")
+        except Exception as e:
+            api_logger.info(f"加载游标 {self.path} 失败: {e}")
+
+    def save(self, force=False):
+        """保存游标，先写临时文件再重命名；非强制保存时限制写入频率"""
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_save < self.SAVE_INTERVAL:
+                return
+            self._last_save = now
+            self.updated_at = time.strftime("%Y-%m-%d %H:%M:%S")
+            data = {
+                "query": self.query,
+                "date_range": self.date_range,
+                "start_index": self.start_index,
+                "last_entry_id": self.last_entry_id,
+                "finished": self.finished,
+                "papers": self.papers,
+                "tasks": self.tasks,
+                "attempts": self.attempts,
+                "updated_at": self.updated_at,
+            }
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def advance(self, start_index, last_entry_id):
+        """记录下一页的起始位置和最后看到的条目"""
+        with self._lock:
+            self.start_index = start_index
+            self.last_entry_id = last_entry_id
+
+    def mark_pending(self, tasks):
+        """登记即将处理的论文，每次交给处理流程都计一次尝试
+
+        处理时进程崩溃的论文一直是 pending，在交出时计数才能让它在 MAX_ATTEMPTS 次后不再重试，
+        不会每次重启都排在最前面阻塞整个运行。
+        """
+        with self._lock:
+            for task in tasks:
+                paper_id = task["paper_id"]
+                self.papers[paper_id] = STATUS_PENDING
+                self.tasks[paper_id] = {field: task.get(field) for field in TASK_FIELDS}
+                self.attempts[paper_id] = self.attempts.get(paper_id, 0) + 1
+        self.save(force=True)
+
+    def mark(self, paper_id, status):
+        """更新论文状态，完成或跳过的论文不再保留元数据"""
+        with self._lock:
+            self.papers[paper_id] = status
+            if status not in (STATUS_PENDING, STATUS_FAILED):
+                self.tasks.pop(paper_id, None)
+                self.attempts.pop(paper_id, None)
+        self.save()
+
+    def retry_tasks(self):
+        """返回需要重试的论文（中断时未完成的和失败的），尝试次数达到 MAX_ATTEMPTS 的不再重试"""
+        with self._lock:
+            return [
+                dict(task) for paper_id, task in self.tasks.items()
+                if self.papers.get(paper_id) in (STATUS_PENDING, STATUS_FAILED)
+                and self.attempts.get(paper_id, 0) < self.MAX_ATTEMPTS
+            ]
+
+    def finish(self):
+        """标记窗口内的所有页面都已查询完"""
+        with self._lock:
+            self.finished = True
+        self.save(force=True)
+
+    def reopen(self):
+        """重新查询已查询完的窗口：从头开始，只保留需要重试的论文
+
+        窗口结束时间未过去时（如当天的窗口），上次查询完之后提交的论文排在末尾，
+        必须从头查询；已处理过的论文会被数据库检查过滤。
+        """
+        retry_ids = {task["paper_id"] for task in self.retry_tasks()}
+        with self._lock:
+            self.start_index = 0
+            self.last_entry_id = None
+            self.finished = False
+            self.papers = {paper_id: status for paper_id, status in self.papers.items() if paper_id in retry_ids}
+            self.tasks = {paper_id: task for paper_id, task in self.tasks.items() if paper_id in retry_ids}
+            self.attempts = {paper_id: count for paper_id, count in self.attempts.items() if paper_id in retry_ids}
+        self.save(force=True)
+
+    def is_complete(self):
+        """窗口已查询完且没有需要重试的论文"""
+        return self.finished and not self.retry_tasks()
+
+    def remove(self):
+        """删除游标文件"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def abandoned(self):
+        """尝试 MAX_ATTEMPTS 次后仍失败或未完成的论文ID"""
+        with self._lock:
+            return [paper_id for paper_id, status in self.papers.items()
+                    if status in (STATUS_PENDING, STATUS_FAILED) and self.attempts.get(paper_id, 0) >= self.MAX_ATTEMPTS]
+
+    def summary(self):
+        """按状态统计论文数量"""
+        counts = {}
+        for status in list(self.papers.values()):
+            counts[status] = counts.get(status, 0) + 1
+        return counts
@@ -0,0 +1,37 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_http_session(name, pool_size=None):
+    """获取某个远程服务共享的 requests.Session
+
+    同一服务的请求复用 keep-alive 连接，常驻进程中多次运行之间也不必重新握手。
+    连接池大小可通过环境变量 HTTP_POOL_<NAME> 配置，默认 16。
+    """
+    with _sessions_lock:
+        if name not in _sessions:
+            pool_size = int(os.getenv(f"HTTP_POOL_{name.upper()}", pool_size or 16))
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[name] = session
+            api_logger.debug(f"创建 HTTP 会话 {name}，连接池大小: {pool_size}")
+        return _sessions[name]
+
+
+def close_http_sessions():
+    """关闭所有共享的 HTTP 会话"""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,133 @@
+import os
+import re
+import xml.etree.ElementTree as ET
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.rateLimiter import get_rate_limiter
+from utils.httpSession import get_http_session
+from utils.arxivId import ARXIV_ABS_URL
+from utils.arxivSnapshot import ARXIV_PDF_URL
+
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+ARXIV_RAW_NS = "{http://arxiv.org/OAI/arXivRaw/}"
+
+
+def _text(elem, tag):
+    """读取子节点文本并合并空白"""
+    child = elem.find(tag)
+    if child is None or child.text is None:
+        return ""
+    return re.sub(r"\s+", " ", child.text).strip()
+
+
+def _split_authors(authors_text):
+    """拆分 arXivRaw 的作者字符串，如 'A, B and C'"""
+    if not authors_text:
+        return []
+    parts = re.split(r",\s*|\s+and\s+", authors_text)
+    return [part.strip() for part in parts if part.strip()]
+
+
+class OAIHarvester:
+    """arXiv OAI-PMH 元数据采集器
+
+    使用 from/until 日期和 resumptionToken 分页拉取 ListRecords，
+    边下载边解析，逐条返回与 Atom 查询相同结构的论文任务字典。
+    base_url 可通过 ARXIV_OAI_URL 指向本地模拟服务器（如 benchmark/crawler_benchmark.py --oai），
+    PDF 链接的前缀同样可通过 ARXIV_PDF_URL 修改。
+    """
+
+    def __init__(self, base_url=None, set_spec="cs", metadata_prefix="arXivRaw", timeout=60, max_retries=5):
+        self.base_url = base_url or os.getenv("ARXIV_OAI_URL", "http://export.arxiv.org/oai2")
+        self.set_spec = set_spec
+        self.metadata_prefix = metadata_prefix
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = get_rate_limiter("arxiv_oai")
+        self.session = get_http_session("arxiv_oai")
+
+    def _request(self, params):
+        """发送 OAI 请求，遇到 503 时限速器按 Retry-After 暂停后重试"""
+        for i in range(self.max_retries):
+            api_logger.info(f"OAI-PMH 请求: {self.base_url} {params}")
+            self.limiter.acquire()
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout, stream=True)
+            except Exception as e:
+                self.limiter.observe_exception(e)
+                raise
+            self.limiter.observe_response(response)
+            if response.status_code == 503:
+                response.close()
+                api_logger.info(f"OAI-PMH 服务繁忙，尝试 {i+1}/{self.max_retries} 次，稍后重试...")
+                continue
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return response
+        raise RuntimeError(f"OAI-PMH 请求失败，已重试 {self.max_retries} 次")
+
+    def _parse_record(self, record):
+        """将 arXivRaw 记录转换为论文任务字典，已删除的记录返回 None"""
+        header = record.find(f"{OAI_NS}header")
+        if header is not None and header.get("status") == "deleted":
+            return None
+
+        meta = record.find(f"{OAI_NS}metadata/{ARXIV_RAW_NS}arXivRaw")
+        if meta is None:
+            return None
+
+        arxiv_id = _text(meta, f"{ARXIV_RAW_NS}id")
+        versions = [v.get("version", "") for v in meta.findall(f"{ARXIV_RAW_NS}version")]
+        latest_version = versions[-1] if versions else "v1"
+        versioned_id = f"{arxiv_id}{latest_version}"
+
+        categories = [c for c in _text(meta, f"{ARXIV_RAW_NS}categories").split() if c.startswith("cs.")]
+
+        return {
+            "paper_id": f"{ARXIV_ABS_URL}{arxiv_id}",
+            "version": int(latest_version.lstrip("v") or 1),
+            "title": _text(meta, f"{ARXIV_RAW_NS}title"),
+            "authors": _split_authors(_text(meta, f"{ARXIV_RAW_NS}authors")),
+            "categories": categories,
+            "pdf_link": f"{ARXIV_PDF_URL}{versioned_id}",
+            "web_link": f"http://arxiv.org/abs/{versioned_id}",
+            "summary": _text(meta, f"{ARXIV_RAW_NS}abstract"),
+        }
+
+    def iter_records(self, from_date=None, until_date=None):
+        """按日期范围逐条返回论文任务，日期格式 YYYY-MM-DD"""
+        params = {"verb": "ListRecords", "metadataPrefix": self.metadata_prefix, "set": self.set_spec}
+        if from_date:
+            params["from"] = from_date
+        if until_date:
+            params["until"] = until_date
+
+        total = 0
+        while True:
+            response = self._request(params)
+            resumption_token = None
+            try:
+                for _, elem in ET.iterparse(response.raw, events=("end",)):
+                    if elem.tag == f"{OAI_NS}record":
+                        task = self._parse_record(elem)
+                        elem.clear()
+                        if task:
+                            total += 1
+                            yield task
+                    elif elem.tag == f"{OAI_NS}error":
+                        if elem.get("code") == "noRecordsMatch":
+                            api_logger.info("OAI-PMH 没有符合条件的记录")
+                        else:
+                            api_logger.info(f"OAI-PMH 返回错误: {elem.get('code')} {elem.text}")
+                        return
+                    elif elem.tag == f"{OAI_NS}resumptionToken":
+                        resumption_token = (elem.text or "").strip()
+            finally:
+                response.close()
+
+            api_logger.info(f"OAI-PMH 已获取 {total} 条记录")
+            if not resumption_token:
+                return
+
+            params = {"verb": "ListRecords", "resumptionToken": resumption_token}
@@ -0,0 +1,172 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.pdfUtils import PDF_CACHE_DIR
+
+PAGE_TEXT_STORE_PATH = os.path.join(PDF_CACHE_DIR, "pages.sqlite")
+
+
+class PageTextStore:
+    """PDF 每页提取文本的持久化存储
+
+    以 PDF 文件内容的 sha256 和页码为 key，同一个 PDF 不论路径和调用方只用 PyPDF2 解析一次。
+    按需填充：调用方只写入实际提取过的页，documents 表记录总页数用于选择末尾页。
+    超过容量上限时按文档的最近访问时间（LRU）整篇淘汰。
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or PAGE_TEXT_STORE_PATH
+        if max_bytes is None:
+            max_bytes = int(os.getenv("PDF_TEXT_STORE_MAX_MB", 2048)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.page_hits = 0
+        self.page_misses = 0
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "sha256 TEXT PRIMARY KEY, page_count INTEGER NOT NULL, size INTEGER NOT NULL DEFAULT 0, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "sha256 TEXT NOT NULL, page INTEGER NOT NULL, text TEXT NOT NULL, PRIMARY KEY (sha256, page))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_last_access ON documents (last_access)")
+        self._conn.commit()
+
+    def file_hash(self, pdf_path):
+        """计算 PDF 文件的 sha256，文件大小和修改时间不变时使用上次的结果"""
+        stat = os.stat(pdf_path)
+        signature = (str(pdf_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._hashes.get(signature)
+        if cached:
+            return cached
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        key = digest.hexdigest()
+        with self._lock:
+            if len(self._hashes) >= 10000:
+                self._hashes.clear()
+            self._hashes[signature] = key
+        return key
+
+    def get(self, key, indexes=None):
+        """返回 (总页数, {页码: 文本})；没有记录时总页数为 None，indexes 为 None 时返回已存储的全部页"""
+        with self._lock:
+            row = self._conn.execute("SELECT page_count FROM documents WHERE sha256 = ?", (key,)).fetchone()
+            if row is None:
+                return None, {}
+            if indexes is None:
+                rows = self._conn.execute("SELECT page, text FROM pages WHERE sha256 = ?", (key,)).fetchall()
+            else:
+                indexes = list(indexes)
+                placeholders = ",".join("?" * len(indexes))
+                rows = self._conn.execute(
+                    f"SELECT page, text FROM pages WHERE sha256 = ? AND page IN ({placeholders})", [key] + indexes
+                ).fetchall() if indexes else []
+                self.page_hits += len(rows)
+                self.page_misses += len(indexes) - len(rows)
+            self._conn.execute("UPDATE documents SET last_access = ? WHERE sha256 = ?", (time.time(), key))
+            self._conn.commit()
+        return row[0], dict(rows)
+
+    def record_lookup(self, hits, misses):
+        """记录按需逐页提取时实际用到的已存储页数和需要解析的页数（get 未传 indexes 时不计入命中率）"""
+        with self._lock:
+            self.page_hits += hits
+            self.page_misses += misses
+
+    def put(self, key, page_count, pages):
+        """写入一个 PDF 的总页数和若干页的文本 [(页码, 文本)]"""
+        pages = list(pages)
+        added = sum(len(text.encode("utf-8")) for _, text in pages)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO documents (sha256, page_count, size, last_access) VALUES (?, ?, 0, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET page_count = excluded.page_count, last_access = excluded.last_access",
+                (key, page_count, time.time()),
+            )
+            self._conn.executemany("INSERT OR REPLACE INTO pages (sha256, page, text) VALUES (?, ?, ?)",
+                                   [(key, index, text) for index, text in pages])
+            self._conn.execute(
+                "UPDATE documents SET size = (SELECT COALESCE(SUM(LENGTH(CAST(text AS BLOB))), 0) FROM pages WHERE sha256 = ?) "
+                "WHERE sha256 = ?", (key, key))
+            if added:
+                self._evict(keep=key)
+            self._conn.commit()
+
+    def _evict(self, keep=None):
+        """按文档的最近访问时间淘汰，直到总大小不超过上限"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+        evicted = 0
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT sha256, size FROM documents WHERE sha256 != ? ORDER BY last_access ASC LIMIT 100", (keep or "",)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM pages WHERE sha256 = ?", (key,))
+                self._conn.execute("DELETE FROM documents WHERE sha256 = ?", (key,))
+                total -= size
+                evicted += 1
+        if evicted:
+            api_logger.info(f"PDF 文本存储超过上限，淘汰 {evicted} 篇文档")
+
+    def stats(self):
+        """返回存储统计信息"""
+        with self._lock:
+            documents, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM documents").fetchone()
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        lookups = self.page_hits + self.page_misses
+        return {
+            "page_hits": self.page_hits,
+            "page_misses": self.page_misses,
+            "hit_rate": round(self.page_hits / lookups, 4) if lookups else 0.0,
+            "documents": documents,
+            "pages": pages,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self):
+        """关闭存储数据库"""
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_page_text_store():
+    """获取进程内共享的页面文本存储，PDF_TEXT_STORE=0 时返回 None"""
+    global _store
+    if os.getenv("PDF_TEXT_STORE", "1") != "1":
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = PageTextStore()
+        return _store
+
+
+def close_page_text_store():
+    """关闭页面文本存储"""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
@@ -0,0 +1,199 @@
+import os
+import abc
+import time
+import importlib
+
+
+class PdfBackend(abc.ABC):
+    """PDF 文本提取后端
+
+    open 返回一个文档对象，带 page_count 属性和 page_text(页码)、close() 方法。
+    依赖的库只在 open 时导入，未安装的后端 is_available() 为假。
+    """
+
+    name = ""
+    module = ""
+
+    @classmethod
+    def is_available(cls):
+        try:
+            importlib.import_module(cls.module)
+            return True
+        except ImportError:
+            return False
+
+    @abc.abstractmethod
+    def open(self, pdf_path):
+        """打开 PDF，返回文档对象"""
+
+
+class _Document:
+    """各后端打开的文档的统一包装"""
+
+    def __init__(self, page_count, page_text, close=None):
+        self.page_count = page_count
+        self._page_text = page_text
+        self._close = close
+
+    def page_text(self, index):
+        return self._page_text(index) or ""
+
+    def close(self):
+        if self._close:
+            self._close()
+
+
+class PyPDF2Backend(PdfBackend):
+    """PyPDF2，纯 Python 实现，最慢但没有额外依赖"""
+
+    name = "pypdf2"
+    module = "PyPDF2"
+
+    def open(self, pdf_path):
+        import PyPDF2
+        reader = PyPDF2.PdfReader(pdf_path)
+        return _Document(len(reader.pages), lambda index: reader.pages[index].extract_text())
+
+
+class PypdfBackend(PdfBackend):
+    """pypdf，PyPDF2 的后续版本，接口相同，文本提取更快更准确"""
+
+    name = "pypdf"
+    module = "pypdf"
+
+    def open(self, pdf_path):
+        import pypdf
+        reader = pypdf.PdfReader(pdf_path)
+        return _Document(len(reader.pages), lambda index: reader.pages[index].extract_text())
+
+
+class PdfiumBackend(PdfBackend):
+    """pypdfium2，基于 Chrome 的 PDFium（C++），比 PyPDF2 快一个数量级"""
+
+    name = "pypdfium2"
+    module = "pypdfium2"
+
+    def open(self, pdf_path):
+        import pypdfium2
+        document = pypdfium2.PdfDocument(pdf_path)
+
+        def page_text(index):
+            page = document[index]
+            text_page = page.get_textpage()
+            try:
+                return text_page.get_text_range()
+            finally:
+                text_page.close()
+                page.close()
+
+        return _Document(len(document), page_text, document.close)
+
+
+class PyMuPDFBackend(PdfBackend):
+    """PyMuPDF（fitz），基于 MuPDF（C），速度快，版面顺序较好"""
+
+    name = "pymupdf"
+    module = "fitz"
+
+    def open(self, pdf_path):
+        import fitz
+        if hasattr(pdf_path, "read"):
+            document = fitz.open(stream=pdf_path.read(), filetype="pdf")
+        else:
+            document = fitz.open(pdf_path)
+        return _Document(document.page_count, lambda index: document[index].get_text(), document.close)
+
+
+BACKENDS = {backend.name: backend for backend in (PyPDF2Backend, PypdfBackend, PdfiumBackend, PyMuPDFBackend)}
+DEFAULT_BACKEND = PyPDF2Backend.name
+
+
+def parse_backend_names(value=None):
+    """解析 PDF_EXTRACT_BACKEND（逗号分隔，按顺序回退），忽略未知和未安装的后端，至少包含 PyPDF2"""
+    if value is None:
+        value = os.getenv("PDF_EXTRACT_BACKEND", DEFAULT_BACKEND)
+    names = []
+    for name in (part.strip().lower() for part in value.split(",")):
+        if name in BACKENDS and name not in names and BACKENDS[name].is_available():
+            names.append(name)
+    if DEFAULT_BACKEND not in names:
+        names.append(DEFAULT_BACKEND)
+    return tuple(names)
+
+
+def available_backends():
+    """已安装的后端名称"""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def get_backend(name):
+    """创建指定名称的后端"""
+    return BACKENDS[name]()
+
+
+class LazyPages:
+    """按调用方指定的顺序逐页提取 PDF 文本，迭代到哪一页才解析哪一页
+
+    order(总页数) 返回页码的可迭代对象；known_pages 为已有文本的页 {页码: 文本}，直接返回不再解析。
+    迭代得到 (页码, 文本, 解析耗时秒数)，已有文本的页耗时为 None。调用方停止迭代后剩余的页不会被解析。
+    某个后端打开或解析出错时换下一个后端，已经返回过的页不再重复返回。
+    迭代开始后 page_count、backend、backend_errors 可用。
+    """
+
+    def __init__(self, source, order, backends=None, known_pages=None):
+        self.source = source
+        self.order = order
+        self.backends = backends or parse_backend_names()
+        self.known_pages = known_pages or {}
+        self.page_count = None
+        self.backend = None
+        self.backend_errors = []
+
+    def __iter__(self):
+        returned = set()
+        last_error = None
+        for name in self.backends:
+            if hasattr(self.source, "seek"):
+                self.source.seek(0)
+            document = None
+            try:
+                document = get_backend(name).open(self.source)
+                self.page_count = document.page_count
+                self.backend = name
+                for index in self.order(document.page_count):
+                    if index in returned:
+                        continue
+                    if index in self.known_pages:
+                        text, seconds = self.known_pages[index], None
+                    else:
+                        started = time.perf_counter()
+                        text = document.page_text(index)
+                        seconds = time.perf_counter() - started
+                    returned.add(index)
+                    yield index, text, seconds
+                return
+            except Exception as e:
+                self.backend_errors.append((name, str(e)))
+                last_error = e
+            finally:
+                if document:
+                    try:
+                        document.close()
+                    except Exception:
+                        pass
+        raise last_error
+
+
+def extract_pages(source, select_indexes, skip_pages=(), backends=None):
+    """提取 select_indexes(总页数) 选择的页，skip_pages 中的页不提取，某个后端出错时整篇换下一个后端
+
+    source 为文件路径或文件对象。返回 {"backend", "page_count", "pages": [(页码, 文本)], "page_times": [(页码, 秒)],
+    "backend_errors": [(后端, 错误)]}，所有后端都失败时抛出最后一个错误。
+    """
+    pages = LazyPages(source, lambda page_count: [index for index in select_indexes(page_count) if index not in skip_pages],
+                      backends)
+    extracted = [(index, text, seconds) for index, text, seconds in pages]
+    return {"backend": pages.backend, "page_count": pages.page_count,
+            "pages": [(index, text) for index, text, _ in extracted],
+            "page_times": [(index, seconds) for index, _, seconds in extracted],
+            "backend_errors": pages.backend_errors}
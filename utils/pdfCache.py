@@ -0,0 +1,307 @@
+import os
+import gzip
+import time
+import shutil
+import tempfile
+import hashlib
+import sqlite3
+import threading
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+
+# 读写文件和计算哈希时每次处理的字节数
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def cache_name(arxiv_id):
+    """缓存文件名（不含扩展名），与原来的 PDF 缓存文件名一致；对 cache_name 的结果再次调用结果不变"""
+    return arxiv_id.replace("/", "_").replace(".", "_")
+
+
+def _file_sha256(path):
+    """流式计算文件的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PdfCache:
+    """带索引的 PDF 缓存
+
+    PDF 保存为 <目录>/<name>.pdf，索引（sqlite）记录 name、arXiv ID、文件名、大小、sha256、
+    是否压缩、写入时间和最近访问时间。写入先写临时文件再改名，读到的文件总是完整的。
+    总大小超过上限时按最近访问时间（LRU）淘汰，pin_seconds 秒内读取或写入过的文件不淘汰
+    （其他线程或进程可能正在解析）；超过 compress_after_days 天未访问的文件
+    在 maintain 时压缩为 .pdf.gz，再次读取时自动解压。多个进程可以共用同一个缓存目录。
+    """
+
+    def __init__(self, directory, max_bytes=None, compress_after_days=None, pin_seconds=None):
+        self.directory = directory
+        if max_bytes is None:
+            max_bytes = int(os.getenv("PDF_CACHE_MAX_MB", 10240)) * 1024 * 1024
+        if compress_after_days is None:
+            compress_after_days = float(os.getenv("PDF_CACHE_COMPRESS_DAYS", 0))
+        if pin_seconds is None:
+            pin_seconds = float(os.getenv("PDF_CACHE_PIN_SECONDS", 600))
+        self.max_bytes = max_bytes
+        self.compress_after_days = compress_after_days
+        self.pin_seconds = pin_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=30, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pdf_cache ("
+            "name TEXT PRIMARY KEY, arxiv_id TEXT, filename TEXT NOT NULL, size INTEGER NOT NULL, sha256 TEXT, "
+            "compressed INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pdf_cache_last_access ON pdf_cache (last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pdf_cache_created_at ON pdf_cache (created_at)")
+        self._conn.commit()
+        if self._conn.execute("SELECT COUNT(*) FROM pdf_cache").fetchone()[0] == 0:
+            self._register_existing()
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def temp_path(self, arxiv_id):
+        """下载时使用的临时文件路径，与缓存文件在同一目录，改名是原子操作"""
+        return self._path(f"{cache_name(arxiv_id)}.pdf.part")
+
+    def _register_existing(self):
+        """首次使用索引时登记目录中已有的 PDF（升级前下载的文件）"""
+        registered = 0
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".pdf"):
+                name, compressed = filename[:-len(".pdf")], 0
+            elif filename.endswith(".pdf.gz"):
+                name, compressed = filename[:-len(".pdf.gz")], 1
+            else:
+                continue
+            path = self._path(filename)
+            stat = os.stat(path)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO pdf_cache (name, arxiv_id, filename, size, sha256, compressed, created_at, last_access) "
+                "VALUES (?, NULL, ?, ?, NULL, ?, ?, ?)",
+                (name, filename, stat.st_size, compressed, stat.st_ctime, stat.st_mtime),
+            )
+            registered += 1
+        self._conn.commit()
+        if registered:
+            api_logger.info(f"PDF 缓存索引登记了 {registered} 个已有文件")
+
+    def contains(self, arxiv_id):
+        """是否已缓存，不更新访问时间"""
+        with self._lock:
+            row = self._conn.execute("SELECT filename FROM pdf_cache WHERE name = ?", (cache_name(arxiv_id),)).fetchone()
+        return bool(row) and os.path.exists(self._path(row[0]))
+
+    def get(self, arxiv_id, decompress=True):
+        """返回缓存的 PDF 路径并更新访问时间，压缩的文件先解压；未缓存返回 None
+
+        arxiv_id 也可以是 entries 返回的 name。decompress 为假时（如批量扫描），压缩的文件只解压到临时目录，
+        缓存中仍保持压缩、不更新访问时间，用完后调用 release 删除临时文件。
+        """
+        name = cache_name(arxiv_id)
+        with self._lock:
+            row = self._conn.execute("SELECT filename, compressed FROM pdf_cache WHERE name = ?", (name,)).fetchone()
+            if row is None or not os.path.exists(self._path(row[0])):
+                if row is not None:
+                    # 文件被外部删除，索引同步删除
+                    self._conn.execute("DELETE FROM pdf_cache WHERE name = ?", (name,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            filename, compressed = row
+            if compressed and not decompress:
+                self.hits += 1
+                return self._decompress_temp(name, filename)
+            if compressed:
+                filename = self._decompress(name, filename)
+            self._conn.execute("UPDATE pdf_cache SET last_access = ? WHERE name = ?", (time.time(), name))
+            self._conn.commit()
+            self.hits += 1
+        return self._path(filename)
+
+    def put(self, arxiv_id, temp_path):
+        """把下载完成的临时文件改名为缓存文件并登记，必要时淘汰最久未访问的文件，返回缓存路径"""
+        name = cache_name(arxiv_id)
+        filename = f"{name}.pdf"
+        size = os.path.getsize(temp_path)
+        sha256 = _file_sha256(temp_path)
+        with self._lock:
+            os.replace(temp_path, self._path(filename))
+            # 同名的压缩文件已经过期
+            if os.path.exists(self._path(f"{filename}.gz")):
+                os.remove(self._path(f"{filename}.gz"))
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pdf_cache (name, arxiv_id, filename, size, sha256, compressed, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                (name, arxiv_id, filename, size, sha256, now, now),
+            )
+            self._evict(keep=name)
+            self._conn.commit()
+        return self._path(filename)
+
+    def remove(self, arxiv_id):
+        """删除缓存文件和索引"""
+        name = cache_name(arxiv_id)
+        with self._lock:
+            row = self._conn.execute("SELECT filename FROM pdf_cache WHERE name = ?", (name,)).fetchone()
+            if row:
+                self._delete(name, row[0])
+                self._conn.commit()
+
+    def _delete(self, name, filename):
+        try:
+            os.remove(self._path(filename))
+        except FileNotFoundError:
+            pass
+        self._conn.execute("DELETE FROM pdf_cache WHERE name = ?", (name,))
+
+    def _total_bytes(self):
+        # 其他进程也可能写入，每次从索引统计
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pdf_cache").fetchone()[0]
+
+    def _evict(self, keep=None):
+        """按 LRU 淘汰直到总大小不超过上限，keep 为刚写入的文件，最近 pin_seconds 秒内访问过的文件不淘汰"""
+        total = self._total_bytes()
+        evicted = 0
+        pinned_before = time.time() - self.pin_seconds
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT name, filename, size FROM pdf_cache WHERE name != ? AND last_access < ? "
+                "ORDER BY last_access ASC LIMIT 100",
+                (keep or "", pinned_before),
+            ).fetchall()
+            if not rows:
+                api_logger.info(f"PDF 缓存超过上限，剩余文件都在 {self.pin_seconds:.0f} 秒内访问过，暂不淘汰")
+                break
+            for name, filename, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._delete(name, filename)
+                total -= size
+                evicted += 1
+        if evicted:
+            self.evictions += evicted
+            api_logger.info(f"PDF 缓存超过上限，淘汰 {evicted} 个文件")
+
+    def _decompress(self, name, filename):
+        """把 .pdf.gz 解压为 .pdf，返回新文件名"""
+        target = f"{name}.pdf"
+        temp_path = self._path(f"{target}.unzip")
+        with gzip.open(self._path(filename), "rb") as source, open(temp_path, "wb") as f:
+            shutil.copyfileobj(source, f, COPY_CHUNK_BYTES)
+        os.replace(temp_path, self._path(target))
+        os.remove(self._path(filename))
+        self._conn.execute("UPDATE pdf_cache SET filename = ?, size = ?, compressed = 0 WHERE name = ?",
+                           (target, os.path.getsize(self._path(target)), name))
+        return target
+
+    def _decompress_temp(self, name, filename):
+        """把 .pdf.gz 解压到缓存目录下的临时目录，文件名与缓存文件相同，返回临时文件路径"""
+        temp_dir = tempfile.mkdtemp(prefix=".read-", dir=self.directory)
+        temp_path = os.path.join(temp_dir, f"{name}.pdf")
+        with gzip.open(self._path(filename), "rb") as source, open(temp_path, "wb") as f:
+            shutil.copyfileobj(source, f, COPY_CHUNK_BYTES)
+        return temp_path
+
+    def release(self, path):
+        """删除 get(decompress=False) 解压出的临时文件，缓存中的文件不受影响"""
+        path = str(path)
+        temp_dir = os.path.dirname(path)
+        if os.path.dirname(os.path.abspath(temp_dir)) != os.path.abspath(self.directory) \
+                or not os.path.basename(temp_dir).startswith(".read-"):
+            return
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def compress_cold(self, older_than_days=None):
+        """把超过 older_than_days 天未访问的 PDF 压缩为 .pdf.gz，返回压缩的文件数"""
+        days = self.compress_after_days if older_than_days is None else older_than_days
+        if not days:
+            return 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, filename FROM pdf_cache WHERE compressed = 0 AND last_access < ?",
+                (time.time() - days * 86400,),
+            ).fetchall()
+        compressed = 0
+        saved = 0
+        for name, filename in rows:
+            target = f"{filename}.gz"
+            temp_path = self._path(f"{target}.part")
+            try:
+                with open(self._path(filename), "rb") as source, gzip.open(temp_path, "wb") as f:
+                    shutil.copyfileobj(source, f, COPY_CHUNK_BYTES)
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                # 压缩期间被读取过的文件不再替换
+                row = self._conn.execute("SELECT last_access, size FROM pdf_cache WHERE name = ? AND compressed = 0",
+                                         (name,)).fetchone()
+                if row is None or row[0] >= time.time() - days * 86400:
+                    os.remove(temp_path)
+                    continue
+                os.replace(temp_path, self._path(target))
+                os.remove(self._path(filename))
+                size = os.path.getsize(self._path(target))
+                self._conn.execute("UPDATE pdf_cache SET filename = ?, size = ?, compressed = 1 WHERE name = ?",
+                                   (target, size, name))
+                self._conn.commit()
+            compressed += 1
+            saved += row[1] - size
+        if compressed:
+            api_logger.info(f"PDF 缓存压缩了 {compressed} 个冷文件，节省 {saved / 1024 / 1024:.1f} MB")
+        return compressed
+
+    def maintain(self):
+        """压缩冷文件并按容量上限淘汰，适合在每次运行结束时调用"""
+        self.compress_cold()
+        with self._lock:
+            self._evict()
+            self._conn.commit()
+
+    def entries(self, since=None):
+        """按写入时间返回缓存条目 [{name, arxiv_id, size, compressed, created_at}]，since 为时间戳"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, arxiv_id, size, compressed, created_at FROM pdf_cache WHERE created_at > ? ORDER BY created_at",
+                (since or 0,),
+            ).fetchall()
+        return [
+            {"name": name, "arxiv_id": arxiv_id, "size": size, "compressed": bool(compressed), "created_at": created_at}
+            for name, arxiv_id, size, compressed, created_at in rows
+        ]
+
+    def stats(self):
+        """返回缓存统计信息"""
+        with self._lock:
+            entries, total, compressed, compressed_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(compressed), 0), "
+                "COALESCE(SUM(CASE WHEN compressed = 1 THEN size ELSE 0 END), 0) FROM pdf_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+            "compressed_entries": compressed,
+            "compressed_bytes": compressed_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self):
+        """关闭索引数据库"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,154 @@
+import os
+import re
+import time
+import threading
+import requests
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.rateLimiter import get_rate_limiter, THROTTLE_STATUS_CODES
+from utils.httpSession import get_http_session
+
+PDF_MAGIC = b"%PDF-"
+# 流式写入时每次读取的字节数
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class PdfDownloadError(Exception):
+    """下载失败；retryable 为假时（如 404、返回的不是 PDF）重试也不会成功"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class PdfDownloader:
+    """流式下载 PDF 到缓存
+
+    使用共享的 keep-alive 连接池，响应分块写入缓存目录中的临时文件，写完校验 Content-Length 后
+    改名登记到 PdfCache。下载中断时保留临时文件，重试（包括下次运行）用 Range 请求从断点继续。
+    第一个数据块中没有 %PDF- 标记（如 arXiv 返回的 HTML 页面）时立即放弃，不再重试。
+    统计下载字节数、耗时、重试、断点续传和被拒绝的响应数。
+    """
+
+    def __init__(self, cache, retries=None, timeout=None):
+        self.cache = cache
+        self.retries = int(os.getenv("PDF_DOWNLOAD_RETRIES", 3)) if retries is None else retries
+        self.timeout = float(os.getenv("PDF_DOWNLOAD_TIMEOUT", 30)) if timeout is None else timeout
+        self.session = get_http_session("pdf")
+        self.limiter = get_rate_limiter("pdf")
+        self._lock = threading.Lock()
+        self.counters = {"downloads": 0, "failures": 0, "retries": 0, "resumed": 0, "rejected": 0,
+                         "length_mismatches": 0, "bytes": 0}
+        self.seconds = 0.0
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    @staticmethod
+    def _looks_like_pdf(head):
+        """PDF 规范允许 %PDF- 出现在前 1024 字节内"""
+        return PDF_MAGIC in head[:1024]
+
+    def download(self, pdf_url, arxiv_id):
+        """下载 PDF 并登记到缓存，返回缓存路径，失败返回 None；调用方先查缓存"""
+        temp_path = self.cache.temp_path(arxiv_id)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(min(2 ** attempt, 30))
+            try:
+                self._fetch(pdf_url, temp_path)
+            except PdfDownloadError as e:
+                api_logger.info(f"下载 PDF 失败 {pdf_url}（第 {attempt + 1} 次）: {e}")
+                if not e.retryable:
+                    break
+                continue
+            except requests.RequestException as e:
+                self.limiter.observe_exception(e)
+                api_logger.info(f"下载 PDF 出错 {pdf_url}（第 {attempt + 1} 次）: {e}")
+                continue
+            self._count("downloads")
+            return self.cache.put(arxiv_id, temp_path)
+
+        self._count("failures")
+        return None
+
+    def _fetch(self, pdf_url, temp_path):
+        """把 PDF 流式写入临时文件，已有部分内容时用 Range 请求续传"""
+        offset = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
+        if offset:
+            with open(temp_path, "rb") as f:
+                head = f.read(1024)
+            if not self._looks_like_pdf(head):
+                os.remove(temp_path)
+                offset = 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        self.limiter.acquire()
+        started = time.perf_counter()
+        try:
+            self._stream(pdf_url, temp_path, offset, headers)
+        finally:
+            with self._lock:
+                self.seconds += time.perf_counter() - started
+
+    def _stream(self, pdf_url, temp_path, offset, headers):
+        """发送请求并把响应写入临时文件，校验长度"""
+        with self.session.get(pdf_url, headers=headers, stream=True, timeout=self.timeout) as response:
+            self.limiter.observe_response(response)
+            if response.status_code == 416:
+                # 临时文件比服务器上的文件还长（文件已更新），从头下载
+                os.remove(temp_path)
+                raise PdfDownloadError("Range 超出文件长度，重新下载")
+            if response.status_code >= 400:
+                retryable = response.status_code in THROTTLE_STATUS_CODES or response.status_code >= 500
+                raise PdfDownloadError(f"HTTP {response.status_code}", retryable)
+
+            mode = "wb"
+            if response.status_code == 206 and offset:
+                found = re.match(r"bytes (\d+)-", response.headers.get("Content-Range", ""))
+                if not found or int(found.group(1)) != offset:
+                    os.remove(temp_path)
+                    raise PdfDownloadError(f"Content-Range 与断点不一致: {response.headers.get('Content-Range')}")
+                mode = "ab"
+                self._count("resumed")
+            else:
+                # 服务器不支持 Range 时返回完整内容
+                offset = 0
+
+            length = response.headers.get("Content-Length")
+            expected = offset + int(length) if length and length.isdigit() else None
+
+            written = 0
+            with open(temp_path, mode) as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                    if not chunk:
+                        continue
+                    if offset == 0 and written == 0 and not self._looks_like_pdf(chunk):
+                        f.close()
+                        os.remove(temp_path)
+                        self._count("rejected")
+                        content_type = response.headers.get("Content-Type", "")
+                        raise PdfDownloadError(f"响应不是 PDF（Content-Type: {content_type}）", retryable=False)
+                    f.write(chunk)
+                    written += len(chunk)
+                    self._count("bytes", len(chunk))
+
+        size = os.path.getsize(temp_path)
+        if expected is not None and size != expected:
+            self._count("length_mismatches")
+            if size > expected:
+                os.remove(temp_path)
+            raise PdfDownloadError(f"长度不一致，Content-Length {expected}，实际 {size}")
+        if size == 0:
+            raise PdfDownloadError("响应为空")
+
+    def stats(self):
+        """返回下载统计信息"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats["seconds"] = round(self.seconds, 2)
+            stats["bytes_per_sec"] = round(self.counters["bytes"] / self.seconds) if self.seconds else 0
+        return stats
@@ -0,0 +1,209 @@
+import os
+import time
+import threading
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.pdfUtils import _select_page_indexes
+from utils.pageTextStore import get_page_text_store
+from utils.pdfBackends import DEFAULT_BACKEND, LazyPages, parse_backend_names
+
+
+def extract_pdf_pages(pdf_path, order, stop=None, known_pages=None, backends=None):
+    """在子进程中按 order(总页数) 给出的顺序逐页提取 PDF 文本，stop(页码, 文本) 为真时不再解析后面的页
+
+    known_pages 为已存储过文本的页 {页码: 文本}，不再解析；order 和 stop 要能 pickle（模块级函数或其 partial）。
+    backends 为按顺序回退的后端名称。返回 {"path", "page_count", "pages": [(页码, 文本)], "page_times": [(页码, 秒)],
+    "stopped", "elapsed", "error", "backend", "backend_errors"}，page_times 只包含本次解析的页。
+    子进程中不写日志，出错时把错误信息放在 error 中由主进程记录。
+    """
+    started = time.perf_counter()
+    result = {"path": pdf_path, "page_count": 0, "pages": [], "page_times": [], "stopped": False, "elapsed": 0,
+              "error": None, "backend": None, "backend_errors": []}
+    pages = LazyPages(pdf_path, order, backends, known_pages)
+    iterator = iter(pages)
+    try:
+        for index, text, seconds in iterator:
+            result["pages"].append((index, text))
+            if seconds is not None:
+                result["page_times"].append((index, seconds))
+            if stop and stop(index, text):
+                result["stopped"] = True
+                break
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        iterator.close()
+    result.update(page_count=pages.page_count or 0, backend=pages.backend, backend_errors=pages.backend_errors)
+    result["pages"].sort()
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+class PdfExtractPool:
+    """PDF 文本提取进程池
+
+    PyPDF2 是纯 Python 实现，在线程中提取会受 GIL 限制，放到子进程中才能用满多核。
+    只接收文件路径，返回页面文本和每页耗时。进程数通过 PDF_EXTRACT_WORKERS 配置，默认为 CPU 核数。
+    extract_until 按调用方给出的页码顺序逐页解析，满足停止条件后不再解析剩余的页（如先看第一页，
+    再从最后一页往前找致谢）；extract 提取固定的前几页和最后几页。
+    提取前先查页面文本存储，已存储的页不再解析，新提取的页在主进程中写入存储。
+    PDF_EXTRACT_BACKEND 设置提取后端（逗号分隔，出错时按顺序回退，默认 pypdf2）。
+    """
+
+    def __init__(self, workers=None, text_store=None, backends=None):
+        self.workers = max(1, int(workers or os.getenv("PDF_EXTRACT_WORKERS", 0) or os.cpu_count() or 1))
+        self.backends = parse_backend_names(backends)
+        self.text_store = text_store if text_store is not None else get_page_text_store()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """延迟创建进程池，进程池损坏（如子进程崩溃）后重新创建"""
+        with self._lock:
+            if self._executor is None:
+                # spawn 启动的子进程不会继承主进程中其他线程持有的锁
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+                api_logger.info(f"PDF 提取进程池已启动，进程数: {self.workers}")
+            return self._executor
+
+    def _reset(self, executor):
+        """丢弃已损坏的进程池"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def submit(self, pdf_path, order, stop=None, known_pages=None):
+        """提交一个提取任务，返回 Future"""
+        executor = self._get_executor()
+        try:
+            return executor.submit(extract_pdf_pages, str(pdf_path), order, stop, known_pages, self.backends)
+        except BrokenProcessPool:
+            self._reset(executor)
+            return self._get_executor().submit(extract_pdf_pages, str(pdf_path), order, stop, known_pages, self.backends)
+
+    @staticmethod
+    def _store_key(file_hash, backend):
+        """页面文本存储的 key：不同后端提取的文本不同，非默认后端的 key 带上后端名称"""
+        return file_hash if backend == DEFAULT_BACKEND else f"{file_hash}:{backend}"
+
+    def _lookup(self, pdf_path, order, stop=None):
+        """查询首选后端在页面文本存储中的页，返回 (文件哈希, 已存储的页 {页码: 文本}, 不用解析就能得到的结果)
+
+        按 order 的顺序检查已存储的页，遇到未存储的页之前已满足 stop 或所有页都已存储时，直接返回结果。
+        """
+        if not self.text_store:
+            return None, {}, None
+        started = time.perf_counter()
+        try:
+            file_hash = self.text_store.file_hash(pdf_path)
+            page_count, known = self.text_store.get(self._store_key(file_hash, self.backends[0]))
+            if page_count is None:
+                return file_hash, {}, None
+        except Exception as e:
+            api_logger.info(f"查询 PDF 文本存储失败 {pdf_path}: {e}")
+            return None, {}, None
+        pages = []
+        stopped = False
+        for index in dict.fromkeys(order(page_count)):
+            if index not in known:
+                return file_hash, known, None
+            pages.append((index, known[index]))
+            if stop and stop(index, known[index]):
+                stopped = True
+                break
+        self.text_store.record_lookup(len(pages), 0)
+        return file_hash, known, {"path": str(pdf_path), "page_count": page_count, "pages": sorted(pages),
+                                  "page_times": [], "stopped": stopped, "elapsed": time.perf_counter() - started,
+                                  "error": None, "backend": None, "backend_errors": [], "cached_pages": len(pages)}
+
+    def _result(self, future, pdf_path, file_hash=None):
+        """读取任务结果，把新解析的页按实际提取的后端写入页面文本存储；子进程崩溃时返回带错误信息的结果
+
+        首选后端出错、由后备后端提取的页存到后备后端的 key 下，不会被当作首选后端的文本读到。
+        """
+        try:
+            result = future.result()
+        except BrokenProcessPool as e:
+            executor = self._executor
+            if executor:
+                self._reset(executor)
+            result = {"path": str(pdf_path), "page_count": 0, "pages": [], "page_times": [], "stopped": False,
+                      "elapsed": 0, "error": f"提取进程异常退出: {e}", "backend": None, "backend_errors": []}
+        for backend, error in result.get("backend_errors", []):
+            api_logger.info(f"PDF 提取后端 {backend} 处理 {result['path']} 出错，改用下一个后端: {error}")
+        if result["error"]:
+            api_logger.info(f"提取 PDF 文本失败 {result['path']}: {result['error']}")
+            return result
+        parsed = dict(result["page_times"])
+        if file_hash and parsed:
+            try:
+                self.text_store.put(self._store_key(file_hash, result["backend"]), result["page_count"],
+                                    [(index, text) for index, text in result["pages"] if index in parsed])
+            except Exception as e:
+                api_logger.info(f"写入 PDF 文本存储失败 {result['path']}: {e}")
+        result["cached_pages"] = len(result["pages"]) - len(parsed)
+        if file_hash:
+            self.text_store.record_lookup(result["cached_pages"], len(parsed))
+        if result["page_times"]:
+            slowest_page, slowest_time = max(result["page_times"], key=lambda item: item[1])
+            api_logger.debug(f"提取 {result['path']} {len(result['pages'])}/{result['page_count']} 页"
+                             f"{'（提前停止）' if result['stopped'] else ''}，耗时 {result['elapsed']:.2f} 秒，"
+                             f"最慢第 {slowest_page + 1} 页 {slowest_time:.2f} 秒")
+        return result
+
+    def extract_until(self, pdf_path, order, stop=None):
+        """按 order(总页数) 的顺序逐页提取一个 PDF，stop(页码, 文本) 为真时停止，阻塞直到完成；可在多个线程中同时调用"""
+        file_hash, known, cached = self._lookup(pdf_path, order, stop)
+        if cached:
+            return cached
+        return self._result(self.submit(pdf_path, order, stop, known), pdf_path, file_hash)
+
+    def imap_until(self, pdf_paths, order, stop=None):
+        """按 order 的顺序逐页并行提取多个 PDF，按完成顺序返回结果；同时在途的任务数限制为进程数的两倍"""
+        pending = {}
+        for pdf_path in pdf_paths:
+            file_hash, known, cached = self._lookup(pdf_path, order, stop)
+            if cached:
+                yield cached
+                continue
+            pending[self.submit(pdf_path, order, stop, known)] = (pdf_path, file_hash)
+            if len(pending) >= self.workers * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield self._result(future, *pending.pop(future))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield self._result(future, *pending.pop(future))
+
+    def extract(self, pdf_path, head_pages=2, tail_pages=0):
+        """提取一个 PDF 的前 head_pages 页和最后 tail_pages 页，head_pages 为 None 时提取全部页"""
+        return self.extract_until(pdf_path, functools.partial(_select_page_indexes, head_pages=head_pages,
+                                                              tail_pages=tail_pages))
+
+    def close(self):
+        """关闭进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_extract_pool():
+    """获取进程内共享的 PDF 提取进程池"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PdfExtractPool()
+        return _pool
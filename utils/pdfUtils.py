@@ -1,19 +1,54 @@
-import os,io
-import requests
-import PyPDF2
+import os
+import threading
 import sys,os
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from utils.logger_settings import api_logger
+from utils.pdfCache import PdfCache
+from utils.pdfDownloader import PdfDownloader
+from utils.pdfBackends import extract_pages
 
 
-# 创建缓存目录结构
-CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+# 创建缓存目录结构，CACHE_DIR 可指向其他目录（如基准测试用的临时目录）
+CACHE_DIR = os.getenv("CACHE_DIR") or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
 PDF_CACHE_DIR = os.path.join(CACHE_DIR, "pdf")
 HTML_CACHE_DIR = os.path.join(CACHE_DIR, "html")
 
 # 创建缓存目录（如果不存在）
-if not os.path.exists(PDF_CACHE_DIR):
-    os.makedirs(PDF_CACHE_DIR)
+os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+
+_pdf_cache = None
+_pdf_downloader = None
+_pdf_cache_lock = threading.Lock()
+
+
+def get_pdf_cache():
+    """获取进程内共享的 PDF 缓存，PDF_CACHE_MAX_MB 设置容量上限，PDF_CACHE_COMPRESS_DAYS 设置多少天未访问后压缩，
+    PDF_CACHE_PIN_SECONDS 设置最近访问过的文件多少秒内不淘汰"""
+    global _pdf_cache
+    with _pdf_cache_lock:
+        if _pdf_cache is None:
+            _pdf_cache = PdfCache(PDF_CACHE_DIR)
+        return _pdf_cache
+
+
+def get_pdf_downloader():
+    """获取进程内共享的 PDF 下载器，PDF_DOWNLOAD_RETRIES 设置重试次数，PDF_DOWNLOAD_TIMEOUT 设置超时秒数"""
+    global _pdf_downloader
+    cache = get_pdf_cache()
+    with _pdf_cache_lock:
+        if _pdf_downloader is None or _pdf_downloader.cache is not cache:
+            _pdf_downloader = PdfDownloader(cache)
+        return _pdf_downloader
+
+
+def close_pdf_cache():
+    """关闭 PDF 缓存索引"""
+    global _pdf_cache, _pdf_downloader
+    with _pdf_cache_lock:
+        if _pdf_cache is not None:
+            _pdf_cache.close()
+            _pdf_cache = None
+            _pdf_downloader = None
 
 def _get_xvid_from_pdf_url( pdf_url):
         """从 PDF URL 中提取 xvid"""
@@ -39,6 +74,11 @@ def _get_cached_pdf_path( arxiv_id):
 
 def _download_pdf( pdf_url):
     """下载 PDF 文件，支持本地缓存"""
+    pdf_path = _download_pdf_path(pdf_url)
+    return open(pdf_path, "rb") if pdf_path else None
+
+def _download_pdf_path( pdf_url):
+    """下载 PDF 到本地缓存，返回文件路径，失败返回 None"""
     try:
         # 从 URL 中提取 arxiv ID
         arxiv_id = _get_xvid_from_pdf_url(pdf_url)
@@ -47,42 +87,50 @@ def _download_pdf( pdf_url):
             api_logger.info(f"无法从 URL 提取 arxiv ID: {pdf_url}")
             return None
 
-        # 检查缓存
-        cached_path = _get_cached_pdf_path(arxiv_id)
-        if cached_path and os.path.exists(cached_path):
+        # 已缓存时直接返回，否则流式下载到缓存，中断后可以断点续传
+        cached_path = get_pdf_cache().get(arxiv_id)
+        if cached_path:
             api_logger.debug(f"使用缓存的 PDF: {cached_path}")
-            return open(cached_path, "rb")
+            return cached_path
 
-        # 下载 PDF
         api_logger.info(f"下载 PDF: {pdf_url}")
-        response = requests.get(pdf_url, timeout=30)
-        response.raise_for_status()
-
-        # 保存到缓存
+        cached_path = get_pdf_downloader().download(pdf_url, arxiv_id)
         if cached_path:
-            with open(cached_path, "wb") as f:
-                f.write(response.content)
             api_logger.info(f"PDF 已缓存: {cached_path}")
-            return open(cached_path, "rb")
-        else:
-            return io.BytesIO(response.content)
+        return cached_path
 
     except Exception as e:
         api_logger.info(f"下载 PDF 失败: {e}")
         return None
 
-def _extract_text_from_pdf( pdf_file):
-    """从 PDF 文件中提取文本"""
+def _select_page_indexes( page_count, head_pages=2, tail_pages=0):
+    """选择前 head_pages 页和最后 tail_pages 页的页码，head_pages 为 None 时选择全部页"""
+    if head_pages is None:
+        return list(range(page_count))
+    indexes = list(range(min(head_pages, page_count)))
+    for i in range(max(page_count - tail_pages, len(indexes)), page_count):
+        indexes.append(i)
+    return indexes
+
+def _head_then_reverse_tail_indexes( page_count, head_pages=1, tail_pages=None):
+    """先选前 head_pages 页，再从最后一页往前选 tail_pages 页（None 表示其余全部页），用于逐页查找时的顺序"""
+    indexes = list(range(min(head_pages, page_count)))
+    stop = head_pages if tail_pages is None else max(page_count - tail_pages, head_pages)
+    indexes.extend(range(page_count - 1, stop - 1, -1))
+    return indexes
+
+def _extract_pages_from_pdf( pdf_file, head_pages=2, tail_pages=0):
+    """提取 PDF 前 head_pages 页和最后 tail_pages 页的文本，返回 [(页码, 文本)]；后端由 PDF_EXTRACT_BACKEND 配置"""
     try:
-        reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        # 只提取前 2 页，避免处理过多内容
-        max_pages = min(2, len(reader.pages))
-        for i in range(max_pages):
-            text += reader.pages[i].extract_text() + "\n"
-        return text
+        return extract_pages(pdf_file, lambda page_count: _select_page_indexes(page_count, head_pages, tail_pages))["pages"]
     except Exception as e:
         api_logger.info(f"提取 PDF 文本失败: {e}")
-        return ""
+        return []
+
+def _extract_text_from_pdf( pdf_file):
+    """从 PDF 文件中提取文本"""
+    # 只提取前 2 页，避免处理过多内容
+    pages = _extract_pages_from_pdf(pdf_file, head_pages=2)
+    return "".join(text + "\n" for _, text in pages)
 
 
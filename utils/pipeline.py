@@ -0,0 +1,154 @@
+import queue
+import threading
+import sys,os
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+
+# 阶段结束标记
+_STAGE_END = object()
+# 条目被某个阶段丢弃（返回 None 或出错）
+_DROPPED = object()
+
+
+class Stage:
+    """流水线中的一个阶段：名称、处理函数和并发线程数"""
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+
+
+class StagedPipeline:
+    """多阶段并发流水线
+
+    各阶段之间用有界队列连接，每个阶段有独立的工作线程。
+    阶段函数返回 None 表示丢弃该条目；最终结果按输入顺序输出。
+    如果提供 key_func，相同 key 的条目只会处理一次。
+    """
+
+    def __init__(self, stages, queue_size=16, key_func=None):
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+        self.key_func = key_func
+
+    def _put(self, q, item, stop_event):
+        """带停止检查的阻塞写入"""
+        while not stop_event.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q, stop_event):
+        """带停止检查的阻塞读取"""
+        while not stop_event.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _STAGE_END
+
+    def run(self, items):
+        """运行流水线，按输入顺序逐个返回最后一个阶段的结果"""
+        stop_event = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        out_queue = queue.Queue()
+        threads = []
+
+        def feeder():
+            seen = set()
+            seq = 0
+            try:
+                for item in items:
+                    if stop_event.is_set():
+                        break
+                    if self.key_func:
+                        key = self.key_func(item)
+                        if key in seen:
+                            api_logger.debug(f"流水线中已存在 {key}，跳过重复条目")
+                            continue
+                        seen.add(key)
+                    if not self._put(queues[0], (seq, item), stop_event):
+                        break
+                    seq += 1
+            except Exception as e:
+                api_logger.info(f"流水线输入出错: {e}")
+            finally:
+                for _ in range(self.stages[0].workers):
+                    self._put(queues[0], _STAGE_END, stop_event)
+
+        def make_worker(index, remaining, lock):
+            stage = self.stages[index]
+            in_queue = queues[index]
+            is_last = index == len(self.stages) - 1
+            next_queue = out_queue if is_last else queues[index + 1]
+
+            def worker():
+                while True:
+                    message = self._get(in_queue, stop_event)
+                    if message is _STAGE_END:
+                        break
+                    seq, item = message
+                    try:
+                        result = stage.func(item)
+                    except Exception as e:
+                        api_logger.info(f"流水线阶段 {stage.name} 出错: {e}")
+                        result = None
+
+                    if result is None:
+                        out_queue.put((seq, _DROPPED))
+                    elif not self._put(next_queue, (seq, result), stop_event):
+                        break
+
+                # 本阶段最后一个线程退出时通知下一阶段
+                with lock:
+                    remaining[0] -= 1
+                    last_one = remaining[0] == 0
+                if last_one:
+                    if is_last:
+                        out_queue.put(_STAGE_END)
+                    else:
+                        for _ in range(self.stages[index + 1].workers):
+                            self._put(queues[index + 1], _STAGE_END, stop_event)
+
+            return worker
+
+        threads.append(threading.Thread(target=feeder, name="pipeline-feeder", daemon=True))
+        for index, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=make_worker(index, remaining, lock),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        # 按输入顺序重排输出
+        pending = {}
+        next_seq = 0
+        try:
+            while True:
+                message = out_queue.get()
+                if message is _STAGE_END:
+                    break
+                seq, result = message
+                pending[seq] = result
+                while next_seq in pending:
+                    result = pending.pop(next_seq)
+                    next_seq += 1
+                    if result is not _DROPPED:
+                        yield result
+            for seq in sorted(pending):
+                if pending[seq] is not _DROPPED:
+                    yield pending[seq]
+        finally:
+            stop_event.set()
+            for thread in threads:
+                thread.join(timeout=1)
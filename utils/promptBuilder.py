@@ -0,0 +1,110 @@
+import re
+import hashlib
+
+# 第一页中作者信息块结束的位置（摘要或引言开始）
+ABSTRACT_PATTERN = re.compile(r"^\s*(?:abstract|摘\s*要)\b|\babstract\s*[—:.\-]|^\s*(?:1|I)\.?\s+introduction\b",
+                              re.IGNORECASE | re.MULTILINE)
+# 致谢或基金段落的标题
+ACKNOWLEDGEMENT_PATTERN = re.compile(r"^\s*(?:acknowledge?ments?|funding|致\s*谢)\b", re.IGNORECASE | re.MULTILINE)
+# 致谢段落结束的位置（参考文献或附录开始）
+SECTION_END_PATTERN = re.compile(r"^\s*(?:references|bibliography|appendix|参考文献)\b", re.IGNORECASE | re.MULTILINE)
+# 脚注中的单位和基金信息
+AFFILIATION_LINE_PATTERN = re.compile(
+    r"@|\bis with\b|\bare with\b|universit|institute|laborator|college|school of|department|academy|大学|研究院|研究所",
+    re.IGNORECASE,
+)
+FUNDING_SENTENCE_PATTERN = re.compile(
+    r"[^.\n]*(?:supported by|funded by|grant|foundation|nsfc|基金)[^.\n]*\.?", re.IGNORECASE
+)
+CJK_PATTERN = re.compile(r"[一-鿿]")
+
+
+def estimate_tokens(text):
+    """粗略估计 token 数：中文每字约 1 个 token，其他字符约 4 个一个 token"""
+    if not text:
+        return 0
+    cjk_count = len(CJK_PATTERN.findall(text))
+    return cjk_count + (len(text) - cjk_count + 3) // 4
+
+
+def truncate_to_tokens(text, max_tokens):
+    """按估计的 token 数截断文本"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # 二分查找最长的前缀
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low]
+
+
+def find_author_block(first_page_text):
+    """提取第一页的标题、作者和单位信息块，以及页脚中的单位脚注"""
+    if not first_page_text:
+        return ""
+
+    found = ABSTRACT_PATTERN.search(first_page_text)
+    header = first_page_text[:found.start()] if found and found.start() > 0 else first_page_text[:2000]
+
+    # 很多期刊把作者单位放在第一页脚注里，只看页面末尾的若干行
+    body_lines = first_page_text[len(header):].splitlines()[-20:]
+    footnotes = [line.strip() for line in body_lines if AFFILIATION_LINE_PATTERN.search(line)]
+    if footnotes:
+        header = header.rstrip() + "\n" + "\n".join(footnotes)
+    return header.strip()
+
+
+def author_block_hash(first_page_text):
+    """计算第一页作者信息块的哈希，忽略大小写和空白差异"""
+    block = re.sub(r"\s+", " ", find_author_block(first_page_text)).strip().lower()
+    return hashlib.sha256(block.encode("utf-8")).hexdigest()
+
+
+def find_acknowledgement(pages_text):
+    """提取致谢和基金资助段落"""
+    if not pages_text:
+        return ""
+
+    # 取最后一个致谢标题，避免匹配到正文中的同名词
+    matches = list(ACKNOWLEDGEMENT_PATTERN.finditer(pages_text))
+    if matches:
+        found = matches[-1]
+        rest = pages_text[found.start():]
+        end = SECTION_END_PATTERN.search(rest)
+        return (rest[:end.start()] if end else rest[:1500]).strip()
+
+    # 没有致谢标题时，退而收集含有基金信息的句子
+    sentences = [match.group(0).strip() for match in FUNDING_SENTENCE_PATTERN.finditer(pages_text)]
+    return "\n".join(dict.fromkeys(sentence for sentence in sentences if sentence))
+
+
+def is_acknowledgement_page(index, text, first_index=1):
+    """逐页提取时的停止条件：第 first_index 页及以后的页中出现致谢或基金段落标题"""
+    return index >= first_index and bool(ACKNOWLEDGEMENT_PATTERN.search(text or ""))
+
+
+def build_paper_context(pages, token_budget=1500):
+    """根据页面文本构建只含作者单位和致谢信息的提示词内容
+
+    pages 为 [(页码, 文本)]。作者信息块优先，占用大部分预算，剩余预算给致谢段落。
+    """
+    first_page = next((text for index, text in pages if index == 0), "")
+    other_pages = "\n".join(text for index, text in pages if index != 0)
+
+    author_block = find_author_block(first_page)
+    acknowledgement = find_acknowledgement(other_pages) or find_acknowledgement(first_page)
+
+    author_budget = token_budget if not acknowledgement else int(token_budget * 0.7)
+    author_block = truncate_to_tokens(author_block, author_budget)
+    acknowledgement = truncate_to_tokens(acknowledgement, token_budget - estimate_tokens(author_block))
+
+    sections = [f"标题、作者和单位:\n{author_block}"]
+    if acknowledgement:
+        sections.append(f"致谢和基金资助:\n{acknowledgement}")
+    return "\n\n".join(sections)
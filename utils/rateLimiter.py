@@ -0,0 +1,139 @@
+import os
+import time
+import threading
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+
+# 表示服务端限流或过载的状态码
+THROTTLE_STATUS_CODES = (429, 502, 503, 504)
+
+# 各远程服务的默认速率（每秒请求数）：(初始速率, 最低速率, 最高速率)
+DEFAULT_RATES = {
+    # arXiv API 要求每 3 秒不超过 1 次请求
+    "arxiv": (1 / 3, 1 / 60, 1 / 3),
+    "arxiv_oai": (1 / 3, 1 / 60, 1 / 3),
+    "pdf": (4.0, 0.2, 10.0),
+    "llm": (5.0, 0.2, 20.0),
+}
+
+
+class AdaptiveRateLimiter:
+    """自适应令牌桶限速器
+
+    遇到 429/503/超时时按比例降速（可按 Retry-After 暂停），
+    连续成功后逐步加速，直到最高速率。线程安全，多个线程共享同一个实例。
+    """
+
+    def __init__(self, name, rate, min_rate=None, max_rate=None, burst=1,
+                 backoff_factor=0.5, recovery_factor=1.1, recovery_after=10):
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate or rate / 20
+        self.max_rate = max_rate or rate
+        self.burst = max(1, burst)
+        self.backoff_factor = backoff_factor
+        self.recovery_factor = recovery_factor
+        self.recovery_after = recovery_after
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._success_streak = 0
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self):
+        """取得一个令牌，必要时阻塞等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    return
+                wait_seconds = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                self.waited_seconds += wait_seconds
+            time.sleep(wait_seconds)
+
+    def on_success(self):
+        """请求成功，连续成功一定次数后加速"""
+        with self._lock:
+            self._success_streak += 1
+            if self._success_streak >= self.recovery_after and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate * self.recovery_factor)
+                self._success_streak = 0
+
+    def on_throttle(self, retry_after=None):
+        """遇到限流、过载或超时，降速并按 Retry-After 暂停"""
+        with self._lock:
+            self.throttled += 1
+            self._success_streak = 0
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            api_logger.info(f"[{self.name}] 触发限速，速率降为 {self.rate:.3f} 次/秒"
+                            + (f"，暂停 {retry_after} 秒" if retry_after else ""))
+
+    def observe_response(self, response):
+        """根据 HTTP 响应调整速率"""
+        if response.status_code in THROTTLE_STATUS_CODES:
+            retry_after = response.headers.get("Retry-After", "")
+            self.on_throttle(int(retry_after) if retry_after.isdigit() else None)
+        else:
+            self.on_success()
+
+    def observe_exception(self, e):
+        """根据异常调整速率：超时和限流类异常降速，其他异常不影响速率"""
+        status_code = getattr(e, "status_code", None)
+        if status_code is None:
+            status_code = getattr(getattr(e, "response", None), "status_code", None)
+        if status_code in THROTTLE_STATUS_CODES or "timeout" in type(e).__name__.lower():
+            self.on_throttle()
+
+    def call(self, func, *args, **kwargs):
+        """限速调用 func，根据结果调整速率"""
+        self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.observe_exception(e)
+            raise
+        self.on_success()
+        return result
+
+    def stats(self):
+        """返回限速器统计信息"""
+        return {
+            "name": self.name,
+            "rate": round(self.rate, 4),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited_seconds, 2),
+        }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name):
+    """获取某个远程服务共享的限速器
+
+    速率可通过环境变量 RATE_LIMIT_<NAME>（初始）、RATE_LIMIT_<NAME>_MIN、RATE_LIMIT_<NAME>_MAX 配置，单位为次/秒。
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            rate, min_rate, max_rate = DEFAULT_RATES.get(name, (1.0, 0.05, 5.0))
+            prefix = f"RATE_LIMIT_{name.upper()}"
+            rate = float(os.getenv(prefix, rate))
+            min_rate = float(os.getenv(f"{prefix}_MIN", min(min_rate, rate)))
+            max_rate = float(os.getenv(f"{prefix}_MAX", max(max_rate, rate)))
+            _limiters[name] = AdaptiveRateLimiter(name, rate, min_rate=min_rate, max_rate=max_rate)
+        return _limiters[name]
@@ -0,0 +1,131 @@
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+from utils.pdfUtils import CACHE_DIR
+
+METRICS_DIR = os.path.join(CACHE_DIR, "metrics")
+
+
+def percentile(values, p):
+    """最近秩法计算百分位数，values 需已排序"""
+    if not values:
+        return 0
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class RunMetrics:
+    """一次运行的耗时和计数统计
+
+    按阶段记录每次耗时（可关联到论文），按名称累加计数（可按分组，如每个 arXiv 分类单独计数），
+    结束时输出每个阶段的 p50/p95/p99 汇总，并可导出 JSON 供对比不同运行。线程安全。
+    """
+
+    def __init__(self, name="arxiv"):
+        self.name = name
+        self.started_at = time.time()
+        self.stage_times = {}
+        self.counters = {}
+        self.groups = {}
+        self.papers = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, stage, paper_id=None):
+        """计时上下文，退出时记录到 stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, paper_id)
+
+    def record(self, stage, seconds, paper_id=None):
+        """记录一次阶段耗时"""
+        with self._lock:
+            self.stage_times.setdefault(stage, []).append(seconds)
+            if paper_id:
+                paper = self.papers.setdefault(paper_id, {"stages": {}, "status": None})
+                paper["stages"][stage] = paper["stages"].get(stage, 0) + seconds
+
+    def incr(self, counter, n=1, group=None):
+        """累加计数，指定 group 时计入该分组"""
+        with self._lock:
+            counters = self.groups.setdefault(group, {}) if group else self.counters
+            counters[counter] = counters.get(counter, 0) + n
+
+    def set_value(self, counter, value, group=None):
+        """设置计数的当前值，用于剩余数量、延迟等非累加的指标"""
+        with self._lock:
+            counters = self.groups.setdefault(group, {}) if group else self.counters
+            counters[counter] = value
+
+    def set_status(self, paper_id, status):
+        """记录论文的最终状态"""
+        with self._lock:
+            self.papers.setdefault(paper_id, {"stages": {}, "status": None})["status"] = status
+
+    def summary(self):
+        """返回运行汇总：总耗时、计数和每个阶段的耗时分布"""
+        with self._lock:
+            stage_times = {stage: sorted(values) for stage, values in self.stage_times.items()}
+            counters = dict(self.counters)
+            groups = {group: dict(values) for group, values in self.groups.items()}
+        elapsed = time.time() - self.started_at
+        stages = {}
+        for stage, values in stage_times.items():
+            total = sum(values)
+            stages[stage] = {
+                "count": len(values),
+                "total": round(total, 3),
+                "mean": round(total / len(values), 3),
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+                "p99": round(percentile(values, 99), 3),
+                "max": round(values[-1], 3),
+            }
+        return {
+            "name": self.name,
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            "elapsed": round(elapsed, 3),
+            "counters": counters,
+            "groups": groups,
+            "stages": stages,
+        }
+
+    def log_summary(self):
+        """把运行汇总写入日志"""
+        summary = self.summary()
+        api_logger.info(f"[{self.name}] 运行耗时 {summary['elapsed']:.1f} 秒，计数: {summary['counters']}")
+        for stage, stats in sorted(summary["stages"].items(), key=lambda item: -item[1]["total"]):
+            api_logger.info(f"[{self.name}] {stage:<14} 次数 {stats['count']:<6} 合计 {stats['total']:>9.2f}s "
+                            f"平均 {stats['mean']:.3f}s p50 {stats['p50']:.3f}s p95 {stats['p95']:.3f}s "
+                            f"p99 {stats['p99']:.3f}s 最大 {stats['max']:.3f}s")
+        for group, counters in sorted(summary["groups"].items()):
+            api_logger.info(f"[{self.name}] {group:<14} {counters}")
+        return summary
+
+    def dump(self, metrics_dir=None):
+        """导出汇总和每篇论文的分阶段耗时到 JSON 文件，返回文件路径"""
+        metrics_dir = metrics_dir or os.getenv("METRICS_DIR", METRICS_DIR)
+        os.makedirs(metrics_dir, exist_ok=True)
+        path = os.path.join(metrics_dir, f"{self.name}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(self.started_at))}.json")
+        data = self.summary()
+        with self._lock:
+            data["papers"] = {
+                paper_id: {"status": paper["status"],
+                           "total": round(sum(paper["stages"].values()), 3),
+                           "stages": {stage: round(seconds, 3) for stage, seconds in paper["stages"].items()}}
+                for paper_id, paper in self.papers.items()
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        api_logger.info(f"[{self.name}] 运行统计已保存到 {path}")
+        return path
@@ -0,0 +1,216 @@
+import re
+import os
+import json
+from collections import deque
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.logger_settings import api_logger
+
+# 常见的简称和别名，值为 chinese_universities.name_cn；可通过 UNIVERSITY_ALIASES_FILE（JSON {别名: 中文名}）补充
+UNIVERSITY_ALIASES = {
+    "Tsinghua": "清华大学",
+    "THU": "清华大学",
+    "Peking University": "北京大学",
+    "PKU": "北京大学",
+    "USTC": "中国科学技术大学",
+    "Univ. of Sci. and Tech. of China": "中国科学技术大学",
+    "SJTU": "上海交通大学",
+    "Shanghai Jiaotong University": "上海交通大学",
+    "ZJU": "浙江大学",
+    "Fudan": "复旦大学",
+    "HUST": "华中科技大学",
+    "BUAA": "北京航空航天大学",
+    "Beihang": "北京航空航天大学",
+    "NUDT": "国防科技大学",
+    "XJTU": "西安交通大学",
+    "Xi'an Jiaotong University": "西安交通大学",
+    "SYSU": "中山大学",
+    "Sun Yat-sen University": "中山大学",
+    "WHU": "武汉大学",
+    "NJU": "南京大学",
+    "SEU": "东南大学",
+    "UESTC": "电子科技大学",
+    "BUPT": "北京邮电大学",
+    "Renmin University": "中国人民大学",
+    "RUC": "中国人民大学",
+    "Tongji": "同济大学",
+    "Nankai": "南开大学",
+    "SCUT": "华南理工大学",
+    "Xidian": "西安电子科技大学",
+    "NWPU": "西北工业大学",
+    "ECNU": "华东师范大学",
+    "BNU": "北京师范大学",
+    "SDU": "山东大学",
+    "Jilin University": "吉林大学",
+    "JLU": "吉林大学",
+    "清华": "清华大学",
+    "中科大": "中国科学技术大学",
+    "上海交大": "上海交通大学",
+    "复旦": "复旦大学",
+    "哈工大": "哈尔滨工业大学",
+}
+
+# 英文缩写只在大小写完全一致时匹配，避免 "bit"、"hit" 这类普通单词误匹配
+_ACRONYM_PATTERN = re.compile(r"^[A-Z]{2,6}$")
+
+
+def normalize_affiliation(text, lower=True):
+    """归一化机构名：小写，& 换成 and，Univ. 展开为 university，标点和连续空白合并为单个空格"""
+    text = (text or "").replace("&", " and ")
+    text = re.sub(r"\buniv\b\.?", "university", text, flags=re.IGNORECASE)
+    if lower:
+        text = text.lower()
+    text = re.sub(r"[\s,;:()\[\]{}\"'./\\\-–—]+", " ", text)
+    return f" {text.strip()} "
+
+
+class AhoCorasick:
+    """多模式字符串匹配自动机
+
+    构建时把所有模式放进一棵字典树并计算失败指针，匹配时对文本只扫描一遍，
+    耗时与模式数量无关。每个模式带一个值，search 返回 (开始位置, 结束位置, 值)。
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._built = False
+
+    def add(self, pattern, value):
+        """添加一个模式，必须在 build 之前调用"""
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self):
+        """按广度优先计算失败指针，并合并失败链上的输出"""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+        self._built = True
+        return self
+
+    def search(self, text):
+        """返回文本中所有匹配 [(开始位置, 结束位置, 值)]，结束位置不包含"""
+        if not self._built:
+            self.build()
+        matches = []
+        node = 0
+        goto = self._goto
+        fail = self._fail
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, value in self._output[node]:
+                matches.append((i + 1 - length, i + 1, value))
+        return matches
+
+
+class UniversityLinker:
+    """把作者的机构文本关联到 chinese_universities.id
+
+    所有大学的中英文名和别名编译成一个 Aho-Corasick 自动机，每条机构文本只扫描一遍。
+    英文名按单词边界匹配，英文缩写区分大小写；多个大学重叠时取最长的匹配，
+    同一文本出现多所大学时取最先出现的。
+    """
+
+    def __init__(self, universities, aliases=None):
+        name_to_id = {}
+        self.names = {}
+        patterns = {}
+        for university in universities or []:
+            university_id = university.get("id")
+            if not university_id:
+                continue
+            name_cn = (university.get("name_cn") or "").strip()
+            name_en = (university.get("name_en") or "").strip()
+            if name_cn:
+                name_to_id[name_cn] = university_id
+            self.names[university_id] = name_cn or name_en
+            for name in (name_cn, name_en):
+                if len(name) >= 2:
+                    patterns[name] = university_id
+
+        alias_map = dict(UNIVERSITY_ALIASES)
+        alias_map.update(aliases if aliases is not None else self._load_alias_file())
+        for alias, name_cn in alias_map.items():
+            # 别名指向的大学不在表中时忽略
+            if name_cn in name_to_id:
+                patterns.setdefault(alias, name_to_id[name_cn])
+
+        self._automaton = AhoCorasick()
+        self._acronyms = AhoCorasick()
+        for pattern, university_id in patterns.items():
+            if _ACRONYM_PATTERN.match(pattern):
+                self._acronyms.add(pattern, university_id)
+            else:
+                normalized = normalize_affiliation(pattern).strip()
+                if normalized:
+                    self._automaton.add(normalized, university_id)
+        self._automaton.build()
+        self._acronyms.build()
+        api_logger.info(f"大学关联器已加载 {len(self.names)} 所大学，{len(patterns)} 个名称和别名")
+
+    @staticmethod
+    def _load_alias_file():
+        """读取 UNIVERSITY_ALIASES_FILE 中的补充别名"""
+        path = os.getenv("UNIVERSITY_ALIASES_FILE")
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            api_logger.info(f"读取大学别名文件 {path} 失败: {e}")
+            return {}
+
+    @staticmethod
+    def _is_boundary(text, start, end):
+        """拉丁字母和数字的匹配两侧不能是字母或数字，中文不限制"""
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        if text[start].isascii() and text[start].isalnum() and before.isascii() and before.isalnum():
+            return False
+        if text[end - 1].isascii() and text[end - 1].isalnum() and after.isascii() and after.isalnum():
+            return False
+        return True
+
+    def _matches(self, affiliation):
+        """返回所有满足边界条件的匹配 [(开始位置, 结束位置, 大学ID)]"""
+        normalized = normalize_affiliation(affiliation)
+        matches = [match for match in self._automaton.search(normalized) if self._is_boundary(normalized, match[0], match[1])]
+        # 缩写在保留大小写的归一化文本上匹配，位置与上面一致
+        cased = normalize_affiliation(affiliation, lower=False)
+        matches += [match for match in self._acronyms.search(cased) if self._is_boundary(cased, match[0], match[1])]
+        return matches
+
+    def link(self, affiliation):
+        """返回机构文本对应的大学ID，无法关联时返回 None"""
+        if not affiliation:
+            return None
+        matches = self._matches(affiliation)
+        if not matches:
+            return None
+        # 最先出现的优先，同一位置取最长的
+        start, end, university_id = min(matches, key=lambda match: (match[0], -(match[1] - match[0])))
+        return university_id